@@ -6,13 +6,26 @@ This creates a standalone Windows EXE with:
 - System tray icon support (windowed mode, no console)
 - Embedded icon file
 - All dependencies bundled
-- Single file executable
+- Single file executable (or a one-folder bundle with --onedir)
 - Machine King Labs branding
+
+Pass spec options after "--", e.g.:
+    pyinstaller LogNogIn.spec -- --onedir
 """
 
+import argparse
 import sys
 from pathlib import Path
 
+# Spec options
+parser = argparse.ArgumentParser()
+parser.add_argument(
+    "--onedir",
+    action="store_true",
+    help="Build a one-folder bundle with loose .pyc files (no per-launch extraction)",
+)
+options = parser.parse_args()
+
 # Paths
 agent_root = Path(SPECPATH)
 src_dir = agent_root / 'src'
@@ -35,6 +48,9 @@ a = Analysis(
     datas=[
         # Include the icon in the assets directory
         (str(assets_dir / 'lognog.ico'), 'assets'),
+    ] + [
+        # Pre-rendered logo images written by build.py, if present
+        (str(png), 'assets') for png in sorted(assets_dir.glob('lognog_*.png'))
     ],
     hiddenimports=[
         # Ensure all modules are included
@@ -102,25 +118,20 @@ a = Analysis(
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
-    noarchive=False,
+    noarchive=options.onedir,
 )
 
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
 
-exe = EXE(
-    pyz,
-    a.scripts,
-    a.binaries,
-    a.zipfiles,
-    a.datas,
-    [],
+exe_options = dict(
     name='LogNogIn',
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    # UPX-packed DLLs/.pyd files must be decompressed every time they load,
+    # which adds to each cold start (and trips some AV scanners); keep them raw.
+    upx=False,
     upx_exclude=[],
-    runtime_tmpdir=None,
     console=False,  # No console window (windowed app for system tray)
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -130,3 +141,33 @@ exe = EXE(
     icon=icon_file,  # Application icon
     version='version_info.txt',  # Windows version info
 )
+
+if options.onedir:
+    # One-folder bundle: nothing is unpacked to a temp dir on launch
+    exe = EXE(
+        pyz,
+        a.scripts,
+        [],
+        exclude_binaries=True,
+        **exe_options,
+    )
+    coll = COLLECT(
+        exe,
+        a.binaries,
+        a.datas,
+        strip=False,
+        upx=False,
+        upx_exclude=[],
+        name='LogNogIn',
+    )
+else:
+    exe = EXE(
+        pyz,
+        a.scripts,
+        a.binaries,
+        a.zipfiles,
+        a.datas,
+        [],
+        runtime_tmpdir=None,
+        **exe_options,
+    )
@@ -4,16 +4,53 @@ Build script for LogNog In agent.
 
 This script builds a standalone executable using PyInstaller.
 On Windows, it creates a windowed application with system tray support.
+
+Use --fast-start to build a one-folder bundle instead of a single file. It
+starts noticeably faster because nothing is extracted to a temp directory on
+every launch, at the cost of shipping a folder rather than one EXE.
 """
 
+import argparse
 import shutil
 import subprocess
 import sys
 from pathlib import Path
 
 
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Build the LogNog In executable")
+    parser.add_argument(
+        "--fast-start",
+        action="store_true",
+        help="Build a one-folder bundle (faster startup, no per-launch extraction)",
+    )
+    return parser.parse_args()
+
+
+# Square logo sizes pre-rendered to assets/lognog_<N>.png for the GUI, which
+# loads them with Tk directly instead of resizing the .ico at runtime
+LOGO_PNG_SIZES = (32, 48)
+
+
+def render_logo_pngs(assets_dir: Path) -> None:
+    """Render the .ico logo to the PNG sizes the GUI uses."""
+    from PIL import Image
+
+    icon_file = assets_dir / "lognog.ico"
+    if not icon_file.exists():
+        return
+    with Image.open(icon_file) as icon:
+        for size in LOGO_PNG_SIZES:
+            png_file = assets_dir / f"lognog_{size}.png"
+            icon.resize((size, size), Image.Resampling.LANCZOS).save(png_file)
+            print(f"  Wrote {png_file}")
+
+
 def main():
     """Main build function."""
+    args = parse_args()
+
     # Ensure we're in the agent directory
     script_dir = Path(__file__).parent
     if not (script_dir / "pyproject.toml").exists():
@@ -48,13 +85,18 @@ def main():
         return 1
     print()
 
+    # Pre-render the GUI logo images
+    print("Rendering logo images...")
+    render_logo_pngs(script_dir / "assets")
+    print()
+
     # Build with PyInstaller
     print("Building executable...")
     spec_file = script_dir / "LogNogIn.spec"
-    result = subprocess.run(
-        [sys.executable, "-m", "PyInstaller", str(spec_file), "--clean", "--noconfirm"],
-        cwd=script_dir,
-    )
+    command = [sys.executable, "-m", "PyInstaller", str(spec_file), "--clean", "--noconfirm"]
+    if args.fast_start:
+        command += ["--", "--onedir"]
+    result = subprocess.run(command, cwd=script_dir)
     if result.returncode != 0:
         print("Error: PyInstaller build failed")
         return 1
@@ -62,7 +104,10 @@ def main():
 
     # Check if executable was created
     exe_name = "LogNogIn.exe" if sys.platform == "win32" else "LogNogIn"
-    exe_path = script_dir / "dist" / exe_name
+    if args.fast_start:
+        exe_path = script_dir / "dist" / "LogNogIn" / exe_name
+    else:
+        exe_path = script_dir / "dist" / exe_name
 
     if exe_path.exists():
         print("=" * 50)
@@ -84,7 +129,7 @@ def main():
         print()
         return 0
     else:
-        print(f"Error: Build completed but {exe_name} not found in dist/")
+        print(f"Error: Build completed but {exe_path} not found")
         return 1
 
 
@@ -36,6 +36,14 @@ if %errorlevel% neq 0 (
 )
 echo.
 
+REM Pre-render the GUI logo images (bundled by LogNogIn.spec)
+echo Rendering logo images...
+python -c "from pathlib import Path; import build; build.render_logo_pngs(Path('assets'))"
+if %errorlevel% neq 0 (
+    echo Warning: Could not render logo images; the GUI will resize the icon at runtime
+)
+echo.
+
 REM Build with PyInstaller
 echo Building executable...
 pyinstaller LogNogIn.spec --clean --noconfirm
@@ -1,38 +1,40 @@
 """Main agent module that orchestrates all components."""
 
+import importlib.util
 import logging
 import os
-import signal
-import subprocess
+import queue
 import sys
 import threading
+from collections import deque
+from functools import cached_property
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
-if sys.platform == "win32":
-    import msvcrt
-else:
-    import fcntl
-
-from .config import Config
+from .config import Config, ensure_dir
 from .buffer import EventBuffer, LogEvent, FIMEvent
-from .watcher import FileWatcher
-from .fim import FileIntegrityMonitor
 from .shipper import HTTPShipper, ConnectionStatus
-from .tray import SystemTray
-from .gui import ConfigWindow, AlertHistoryWindow
-from .wizard import SetupWizard
 from .sound_alerts import SoundAlertManager
 
-# Import Windows Event collector only on Windows
+# GUI, watcher and FIM modules (and their tkinter/PIL/pystray/watchdog imports)
+# are imported where they are first used so CLI subcommands don't pay for them.
+if TYPE_CHECKING:
+    from .watcher import FileWatcher
+    from .fim import FileIntegrityMonitor
+    from .tray import SystemTray
+    from .gui import ConfigWindow
+    from .wizard import SetupWizard
+    from .collectors.windows_events import WindowsEventCollector
+
+# Windows Event collection needs pywin32 on Windows. Only check that it is
+# installed here; the collector (and pywin32) is imported when it is created.
 if sys.platform == "win32":
-    try:
-        from .collectors.windows_events import WindowsEventCollector
-        HAS_WINDOWS_EVENTS = True
-    except ImportError:
-        HAS_WINDOWS_EVENTS = False
-        logger = logging.getLogger(__name__)
-        logger.warning("pywin32 not available - Windows Event collection disabled")
+    HAS_WINDOWS_EVENTS = importlib.util.find_spec("win32evtlog") is not None
+    if not HAS_WINDOWS_EVENTS:
+        logging.getLogger(__name__).warning(
+            "pywin32 not available - Windows Event collection disabled"
+        )
 else:
     HAS_WINDOWS_EVENTS = False
 
@@ -40,25 +42,54 @@ logger = logging.getLogger(__name__)
 
 
 class SingleInstanceLock:
-    """Ensures only one instance of the agent runs at a time."""
+    """Ensures only one instance of the agent runs at a time.
+
+    On Windows this is a named mutex in the session's Local\\ namespace, which
+    needs no file on disk and is released by the OS if the process dies. On
+    Unix it is a POSIX record lock (fcntl.lockf) on a file in the data dir,
+    which unlike flock() is honoured over NFS.
+    """
+
+    ERROR_ALREADY_EXISTS = 183
 
     def __init__(self, name: str = "lognog-in"):
         self.name = name
         self.lock_file = Config.get_data_dir() / f"{name}.lock"
         self._file_handle = None
+        self._mutex_handle = None
 
     def acquire(self) -> bool:
         """Try to acquire the lock. Returns True if successful."""
+        if sys.platform == "win32":
+            return self._acquire_mutex()
+        return self._acquire_file_lock()
+
+    def _acquire_mutex(self) -> bool:
+        """Windows: create the named mutex; fail if another process owns it."""
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        kernel32.CreateMutexW.argtypes = [wintypes.LPVOID, wintypes.BOOL, wintypes.LPCWSTR]
+        kernel32.CreateMutexW.restype = wintypes.HANDLE
+
+        handle = kernel32.CreateMutexW(None, False, f"Local\\{self.name}")
+        if not handle:
+            return False
+        if ctypes.get_last_error() == self.ERROR_ALREADY_EXISTS:
+            kernel32.CloseHandle(handle)
+            return False
+        self._mutex_handle = handle
+        return True
+
+    def _acquire_file_lock(self) -> bool:
+        """Unix: take an exclusive, non-blocking POSIX lock on the lock file."""
+        import fcntl
+
         try:
-            self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+            ensure_dir(self.lock_file.parent)
             self._file_handle = open(self.lock_file, "w")
-
-            if sys.platform == "win32":
-                # Windows: use msvcrt.locking
-                msvcrt.locking(self._file_handle.fileno(), msvcrt.LK_NBLCK, 1)
-            else:
-                # Unix: use fcntl.flock
-                fcntl.flock(self._file_handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            fcntl.lockf(self._file_handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
 
             # Write PID to lock file
             self._file_handle.write(str(os.getpid()))
@@ -73,12 +104,17 @@ class SingleInstanceLock:
 
     def release(self) -> None:
         """Release the lock."""
+        if self._mutex_handle:
+            import ctypes
+
+            ctypes.WinDLL("kernel32").CloseHandle(self._mutex_handle)
+            self._mutex_handle = None
+
         if self._file_handle:
+            import fcntl
+
             try:
-                if sys.platform == "win32":
-                    msvcrt.locking(self._file_handle.fileno(), msvcrt.LK_UNLCK, 1)
-                else:
-                    fcntl.flock(self._file_handle.fileno(), fcntl.LOCK_UN)
+                fcntl.lockf(self._file_handle, fcntl.LOCK_UN)
             except (IOError, OSError):
                 pass
             finally:
@@ -108,18 +144,63 @@ class Agent:
         """
         Initialize the agent.
 
+        Only cheap state is set up here; the buffer, shipper, collectors,
+        sound manager and file logging are created by ``start()``.
+
         Args:
-            config: Agent configuration. If None, loads from default location.
+            config: Agent configuration. If None, loads from default location
+                on first access.
             headless: If True, run without system tray.
         """
-        self.config = config or Config.load()
+        if config is not None:
+            self.config = config
         self.headless = headless
 
         # Single instance lock
         self._instance_lock = SingleInstanceLock()
 
-        # Components
-        self.buffer = EventBuffer()
+        # Components (created by _ensure_components)
+        self.buffer: Optional[EventBuffer] = None
+        self.shipper: Optional[HTTPShipper] = None
+        self.watcher: Optional["FileWatcher"] = None
+        self.fim: Optional["FileIntegrityMonitor"] = None
+        self.windows_events: Optional['WindowsEventCollector'] = None
+        self.sound_manager: Optional[SoundAlertManager] = None
+
+        self.tray: Optional["SystemTray"] = None
+        self.config_window: Optional["ConfigWindow"] = None
+        self._log_listener: Optional[QueueListener] = None
+        self._log_queue_handler: Optional[QueueHandler] = None
+        # File and stdout handlers created by _setup_logging
+        self._log_handlers: tuple[logging.Handler, ...] = ()
+
+        # State
+        self._running = False
+        self._paused = False
+        self._stop_event = threading.Event()
+
+        # Alert notification history (in-memory, last 100)
+        self._max_alert_history = 100
+        self._alert_history: deque[dict] = deque(maxlen=self._max_alert_history)
+
+        # Wizard instance
+        self._wizard: Optional["SetupWizard"] = None
+        self._wizard_shown = False
+
+    @cached_property
+    def config(self) -> Config:
+        """Agent configuration, loaded from the default location when not given."""
+        return Config.load()
+
+    def _ensure_components(self) -> None:
+        """Create the agent components on first use."""
+        if self.buffer is not None:
+            return
+
+        from .watcher import FileWatcher
+        from .fim import FileIntegrityMonitor
+
+        self.buffer = EventBuffer(max_events=self.config.max_buffered_events)
         self.shipper = HTTPShipper(
             config=self.config,
             buffer=self.buffer,
@@ -136,7 +217,6 @@ class Agent:
         )
 
         # Windows Event collector (only on Windows with pywin32)
-        self.windows_events: Optional['WindowsEventCollector'] = None
         if HAS_WINDOWS_EVENTS and self.config.windows_events.enabled:
             from .collectors.windows_events import WindowsEventCollector
             self.windows_events = WindowsEventCollector(
@@ -147,46 +227,72 @@ class Agent:
                 on_event=self._on_log_event,
             )
 
-        self.tray: Optional[SystemTray] = None
-        self.config_window: Optional[ConfigWindow] = None
-
         # Sound alerts
         self.sound_manager = SoundAlertManager(config=self.config)
 
-        # State
-        self._running = False
-        self._paused = False
-        self._stop_event = threading.Event()
-
-        # Alert notification history (in-memory, last 100)
-        self._alert_history: list[dict] = []
-        self._max_alert_history = 100
-
-        # Wizard instance
-        self._wizard: Optional[SetupWizard] = None
-        self._wizard_shown = False
+    def _setup_logging(self) -> None:
+        """Setup logging configuration.
 
-        # Setup logging
-        self._setup_logging()
+        Records are handed to a queue on the calling thread and written to the
+        log file and stdout by a single QueueListener thread, so the shipper,
+        watcher and FIM threads never block on log I/O. After a stop() the
+        handlers are attached directly; a restart moves them back behind the
+        queue.
+        """
+        root = logging.getLogger()
+        if self._log_handlers:
+            if self._log_listener is None:
+                for handler in self._log_handlers:
+                    root.removeHandler(handler)
+                self._start_log_listener()
+            return
+        if root.handlers:
+            # Already configured (same rule as logging.basicConfig)
+            return
 
-    def _setup_logging(self) -> None:
-        """Setup logging configuration."""
         log_level = logging.DEBUG if self.config.debug_logging else logging.INFO
 
         # Create log directory
         log_dir = Config.get_log_dir()
-        log_dir.mkdir(parents=True, exist_ok=True)
+        ensure_dir(log_dir)
         log_file = log_dir / "agent.log"
 
-        # Configure logging
-        logging.basicConfig(
-            level=log_level,
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-            handlers=[
-                logging.FileHandler(str(log_file)),
-                logging.StreamHandler(sys.stdout),
-            ],
+        formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+        file_handler = logging.FileHandler(str(log_file))
+        stream_handler = logging.StreamHandler(sys.stdout)
+        for handler in (file_handler, stream_handler):
+            handler.setFormatter(formatter)
+
+        root.setLevel(log_level)
+        self._log_handlers = (file_handler, stream_handler)
+        self._start_log_listener()
+
+    def _start_log_listener(self) -> None:
+        """Route root logging through a queue to ``_log_handlers``."""
+        # The QueueHandler keeps its default formatter: it only merges the
+        # message args, leaving the full format to the listener's handlers.
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._log_queue_handler = QueueHandler(log_queue)
+        logging.getLogger().addHandler(self._log_queue_handler)
+        self._log_listener = QueueListener(
+            log_queue, *self._log_handlers, respect_handler_level=True
         )
+        self._log_listener.start()
+
+    def _stop_log_listener(self) -> None:
+        """Drain the log queue and write to the handlers directly again.
+
+        Nothing reads the queue once the listener stops, so the QueueHandler
+        is taken off the root logger first and the handlers put back in its
+        place; records logged after stop() still reach the file and stdout.
+        """
+        root = logging.getLogger()
+        root.removeHandler(self._log_queue_handler)
+        self._log_listener.stop()
+        self._log_listener = None
+        self._log_queue_handler = None
+        for handler in self._log_handlers:
+            root.addHandler(handler)
 
     def _on_status_change(self, status: ConnectionStatus) -> None:
         """Handle connection status changes."""
@@ -201,15 +307,13 @@ class Agent:
 
         # Store in history
         from datetime import datetime
-        self._alert_history.insert(0, {
+        # Newest first; the deque's maxlen drops the oldest entry
+        self._alert_history.appendleft({
             "title": title,
             "message": message,
             "severity": severity,
             "timestamp": datetime.now().isoformat(),
         })
-        # Trim to max size
-        if len(self._alert_history) > self._max_alert_history:
-            self._alert_history = self._alert_history[:self._max_alert_history]
 
         # Play sound alert
         self.sound_manager.play_alert(severity)
@@ -219,7 +323,7 @@ class Agent:
 
     def get_alert_history(self) -> list[dict]:
         """Get the alert notification history."""
-        return self._alert_history.copy()
+        return list(self._alert_history)
 
     def _on_log_event(self, event: LogEvent) -> None:
         """Handle log events from the file watcher."""
@@ -235,13 +339,18 @@ class Agent:
 
     def _on_configure(self) -> None:
         """Handle configure menu action - opens GUI config window."""
+        from .gui import ConfigWindow
+
         logger.info("Opening configuration window")
 
-        # Create and show config window
-        self.config_window = ConfigWindow(
-            config=self.config,
-            on_save=self._on_config_saved,
-        )
+        # Create the config window once; later opens re-show the same one
+        if self.config_window is None:
+            self.config_window = ConfigWindow(
+                config=self.config,
+                on_save=self._on_config_saved,
+            )
+        else:
+            self.config_window.config = self.config
         self.config_window.show()
 
     def _on_config_saved(self, new_config: Config) -> None:
@@ -269,14 +378,18 @@ class Agent:
 
     def _on_view_alerts(self) -> None:
         """Handle view alerts action - opens alert history window."""
+        from .gui import AlertHistoryWindow
+
         logger.info("Opening alert history window")
-        self.alert_history_window = AlertHistoryWindow(alerts=self._alert_history)
+        self.alert_history_window = AlertHistoryWindow(alerts=self.get_alert_history())
         self.alert_history_window.show()
 
     def _show_setup_wizard(self) -> None:
         """Show the setup wizard for first-run configuration."""
         if self._wizard_shown:
             return
+        from .wizard import SetupWizard
+
         self._wizard_shown = True
         logger.info("Showing setup wizard")
         self._wizard = SetupWizard(
@@ -320,6 +433,8 @@ class Agent:
 
     def _open_file(self, path: Path) -> None:
         """Open a file with the system default application."""
+        import subprocess
+
         try:
             if sys.platform == "win32":
                 os.startfile(str(path))
@@ -336,7 +451,11 @@ class Agent:
             logger.warning("Agent already running")
             return
 
-        # Check for single instance
+        # Logging first, so a refused second instance can still report it
+        self._setup_logging()
+
+        # Check for single instance before opening any of the agent's
+        # databases, which the running instance owns
         if not self._instance_lock.acquire():
             logger.error("Another instance of LogNog In is already running")
             if sys.platform == "win32":
@@ -349,6 +468,12 @@ class Agent:
                 )
             raise RuntimeError("Another instance is already running")
 
+        try:
+            self._ensure_components()
+        except Exception:
+            self._instance_lock.release()
+            raise
+
         logger.info("Starting LogNog In agent...")
 
         # Check if wizard is needed (first run, unconfigured)
@@ -362,6 +487,8 @@ class Agent:
 
         # Start system tray (unless headless)
         if not self.headless:
+            from .tray import SystemTray
+
             self.tray = SystemTray(
                 on_configure=self._on_configure,
                 on_pause=self._on_pause,
@@ -391,9 +518,11 @@ class Agent:
         self._running = True
         self._stop_event.clear()
 
-        # Setup signal handlers
-        signal.signal(signal.SIGINT, self._signal_handler)
-        signal.signal(signal.SIGTERM, self._signal_handler)
+        # Setup signal handlers (only possible from the main thread)
+        if threading.current_thread() is threading.main_thread():
+            import signal
+            signal.signal(signal.SIGINT, self._signal_handler)
+            signal.signal(signal.SIGTERM, self._signal_handler)
 
         logger.info("LogNog In agent started")
         logger.info(f"  Server: {self.config.server_url}")
@@ -417,6 +546,11 @@ class Agent:
         self.fim.stop()
         self.watcher.stop()
         self.shipper.stop()
+        self.buffer.close()
+
+        # The buffer is closed for good; the next start() builds fresh components
+        self.buffer = None
+        self.windows_events = None
 
         if self.tray:
             self.tray.stop()
@@ -430,9 +564,15 @@ class Agent:
 
         logger.info("LogNog In agent stopped")
 
+        # Drain queued log records to disk last, after the final message
+        if self._log_listener:
+            self._stop_log_listener()
+
     def wait(self) -> None:
         """Wait until the agent is stopped."""
-        self._stop_event.wait()
+        # Poll so Ctrl-C is delivered promptly (an untimed wait blocks it on Windows)
+        while not self._stop_event.wait(0.5):
+            pass
 
     def is_running(self) -> bool:
         """Check if the agent is running."""
@@ -444,18 +584,23 @@ class Agent:
         self.stop()
 
     def get_status(self) -> dict:
-        """Get the current agent status."""
+        """Get the current agent status.
+
+        Components are only reported once ``start()`` has created them;
+        before that the shipper is None and nothing is running.
+        """
+        started = self.shipper is not None
         status = {
             "running": self._running,
             "paused": self._paused,
             "configured": self.config.is_configured(),
-            "shipper": self.shipper.get_stats(),
+            "shipper": self.shipper.get_stats() if started else None,
             "watcher": {
-                "running": self.watcher.is_running(),
-                "paths": self.watcher.get_watched_paths(),
+                "running": started and self.watcher.is_running(),
+                "paths": self.watcher.get_watched_paths() if started else [],
             },
             "fim": {
-                "running": self.fim.is_running(),
+                "running": started and self.fim.is_running(),
                 "enabled": self.config.fim_enabled,
             },
         }
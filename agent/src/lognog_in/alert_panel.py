@@ -11,6 +11,8 @@ from pathlib import Path
 from typing import Callable, Dict, List, Optional
 import webbrowser
 
+from .gui import get_ui_root, run_on_ui_thread
+
 logger = logging.getLogger(__name__)
 
 
@@ -179,7 +181,6 @@ class AlertPanel:
         self.alerts: List[Alert] = []
         self.window: Optional[tk.Toplevel] = None
         self._root: Optional[tk.Tk] = None
-        self._thread: Optional[threading.Thread] = None
         self._lock = threading.Lock()
         self._running = False
         self._widgets: Dict[str, tk.Frame] = {}
@@ -328,8 +329,7 @@ class AlertPanel:
     def show(self) -> None:
         """Show the alert panel."""
         if not self._running:
-            self._thread = threading.Thread(target=self._run_ui, daemon=True)
-            self._thread.start()
+            run_on_ui_thread(self._start_ui)
         elif self.window:
             try:
                 self.window.deiconify()
@@ -345,22 +345,18 @@ class AlertPanel:
             except tk.TclError:
                 pass
 
-    def _run_ui(self) -> None:
-        """Run the UI event loop."""
+    def _start_ui(self) -> None:
+        """Build the panel on the shared GUI root (UI thread)."""
+        if self._running:
+            return
         self._running = True
-        self._root = tk.Tk()
-        self._root.withdraw()  # Hidden root window
+        self._root = get_ui_root()
 
         self._create_panel()
 
         # Check for un-snoozed alerts periodically
         self._check_snooze_expiry()
 
-        try:
-            self._root.mainloop()
-        finally:
-            self._running = False
-
     def _create_panel(self) -> None:
         """Create the panel window."""
         if not self._root:
@@ -723,11 +719,16 @@ class AlertPanel:
     def stop(self) -> None:
         """Stop the alert panel."""
         self._running = False
-        if self._root:
-            try:
-                self._root.quit()
-                self._root.destroy()
-            except tk.TclError:
-                pass
+        window = self.window
+        if window:
+            # The root is shared with the other windows; only drop the panel
+            run_on_ui_thread(self._destroy_window, window)
         self._root = None
         self.window = None
+
+    @staticmethod
+    def _destroy_window(window: tk.Toplevel) -> None:
+        try:
+            window.destroy()
+        except tk.TclError:
+            pass
@@ -1,18 +1,120 @@
 """Event buffer with SQLite persistence for offline operation."""
 
 import json
+import logging
+import queue
 import sqlite3
 import threading
-from datetime import datetime
+import time
 from pathlib import Path
 from typing import Optional
-from dataclasses import dataclass, asdict
-from contextlib import contextmanager
+from collections import deque
+from dataclasses import dataclass, field
 
-from .config import Config
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
+from .config import Config, ensure_dir
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# Maximum number of queued events the writer thread folds into one transaction.
+WRITE_BATCH_SIZE = 500
+
+def _json_dumps(obj: dict) -> bytes:
+    """Serialize an event payload, using orjson when it is installed."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(data: bytes | str) -> dict:
+    """Deserialize an event payload stored by _json_dumps."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Per-type '{"type":"...",' prefixes spliced onto stored payloads when framing a batch.
+_TYPE_PREFIXES: dict[str, bytes] = {}
+
+
+def _frame_event(event_type: str, data: bytes | str) -> bytes:
+    """Return a stored payload as a JSON object with its "type" key added."""
+    if isinstance(data, str):
+        # Rows written before payloads were stored as bytes
+        data = data.encode("utf-8")
+    prefix = _TYPE_PREFIXES.get(event_type)
+    if prefix is None:
+        prefix = _TYPE_PREFIXES[event_type] = f'{{"type":{json.dumps(event_type)},'.encode()
+    if data[1:2] == b"}":
+        return prefix[:-1] + b"}"
+    return prefix + data[1:]
+
+
+# (epoch second, formatted "YYYY-MM-DDTHH:MM:SS") for the current second. Kept as
+# one tuple so concurrent readers never see a second paired with another's text.
+_ts_cache: tuple[int, str] = (-1, "")
+
+
+def utc_now_iso() -> str:
+    """Return the current UTC time like ``datetime.utcnow().isoformat()``.
+
+    The date/time prefix is formatted once per second and only the
+    microsecond suffix is rebuilt per call.
+    """
+    global _ts_cache
+    ns = time.time_ns()
+    sec, frac = divmod(ns, 1_000_000_000)
+    cached = _ts_cache
+    if cached[0] != sec:
+        cached = (sec, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec)))
+        _ts_cache = cached
+    return f"{cached[1]}.{frac // 1000:06d}"
+
+
+# Connection tuning, applied once to the buffer's long-lived connection. WAL
+# (set in _init_db, persisted in the file) lets readers proceed while the writer
+# commits; NORMAL sync is durable in WAL mode and only fsyncs at checkpoints.
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+)
+# Statements are kept as fixed module-level text so the shared connection's
+# statement cache (keyed on SQL text) parses each one only once. Per-id
+# statements run through executemany instead of building a variable-length
+# IN (...) list, which would be a distinct statement for every batch size.
+INSERT_EVENT_SQL = "INSERT INTO events (id, event_type, data, created_at) VALUES (?, ?, ?, ?)"
+SELECT_BATCH_SQL = "SELECT id, event_type, data FROM events ORDER BY id ASC LIMIT ?"
+DELETE_EVENT_SQL = "DELETE FROM events WHERE id = ?"
+INCREMENT_ATTEMPTS_SQL = "UPDATE events SET attempts = attempts + 1 WHERE id = ?"
+DELETE_STALE_SQL = "DELETE FROM events WHERE attempts >= ?"
+COUNT_SQL = "SELECT COUNT(*) as count FROM events"
+EVICT_OLDEST_SQL = (
+    "DELETE FROM events WHERE id IN (SELECT id FROM events ORDER BY id ASC LIMIT ?)"
+)
+CLAIM_BATCH_SQL = (
+    "SELECT id, event_type, data, created_at, attempts FROM events ORDER BY id ASC LIMIT ?"
+)
+DELETE_CLAIMED_SQL = "DELETE FROM events WHERE id <= ?"
+REINSERT_EVENT_SQL = (
+    "INSERT INTO events (id, event_type, data, created_at, attempts) VALUES (?, ?, ?, ?, ?)"
+)
+
+# Free lists of spent events. The buffer releases an event back here once it has
+# been serialized, and the watcher/FIM emit points acquire from here instead of
+# allocating a fresh instance per line.
+EVENT_POOL_SIZE = 1024
+_LOG_EVENT_POOL: "deque[LogEvent]" = deque(maxlen=EVENT_POOL_SIZE)
+_FIM_EVENT_POOL: "deque[FIMEvent]" = deque(maxlen=EVENT_POOL_SIZE)
+
+
+@dataclass(slots=True)
 class LogEvent:
     """A log event to be shipped."""
     timestamp: str
@@ -22,16 +124,61 @@ class LogEvent:
     file_path: str
     message: str
     metadata: dict
+    _pooled: bool = field(default=False, init=False, repr=False, compare=False)
+
+    @classmethod
+    def acquire(
+        cls,
+        timestamp: str,
+        hostname: str,
+        source: str,
+        source_type: str,
+        file_path: str,
+        message: str,
+        metadata: dict,
+    ) -> "LogEvent":
+        """Return a pooled instance re-initialized with these fields, or a new one."""
+        try:
+            event = _LOG_EVENT_POOL.pop()
+        except IndexError:
+            return cls(timestamp, hostname, source, source_type, file_path, message, metadata)
+        event.timestamp = timestamp
+        event.hostname = hostname
+        event.source = source
+        event.source_type = source_type
+        event.file_path = file_path
+        event.message = message
+        event.metadata = metadata
+        event._pooled = False
+        return event
+
+    def release(self) -> None:
+        """Return this instance to the pool. It must not be used afterwards."""
+        if not self._pooled:
+            self._pooled = True
+            self.metadata = {}
+            _LOG_EVENT_POOL.append(self)
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "timestamp": self.timestamp,
+            "hostname": self.hostname,
+            "source": self.source,
+            "source_type": self.source_type,
+            "file_path": self.file_path,
+            "message": self.message,
+            "metadata": self.metadata,
+        }
+
+    def to_json(self) -> bytes:
+        return _json_dumps(self.to_dict())
 
     @classmethod
     def from_dict(cls, data: dict) -> "LogEvent":
         return cls(**data)
 
 
-@dataclass
+@dataclass(slots=True)
 class FIMEvent:
     """A file integrity monitoring event."""
     timestamp: str
@@ -45,9 +192,69 @@ class FIMEvent:
     file_owner: Optional[str]
     file_permissions: Optional[str]
     metadata: dict
+    _pooled: bool = field(default=False, init=False, repr=False, compare=False)
+
+    @classmethod
+    def acquire(
+        cls,
+        timestamp: str,
+        hostname: str,
+        source: str,
+        source_type: str,
+        event_type: str,
+        file_path: str,
+        previous_hash: Optional[str],
+        current_hash: Optional[str],
+        file_owner: Optional[str],
+        file_permissions: Optional[str],
+        metadata: dict,
+    ) -> "FIMEvent":
+        """Return a pooled instance re-initialized with these fields, or a new one."""
+        try:
+            event = _FIM_EVENT_POOL.pop()
+        except IndexError:
+            return cls(
+                timestamp, hostname, source, source_type, event_type, file_path,
+                previous_hash, current_hash, file_owner, file_permissions, metadata,
+            )
+        event.timestamp = timestamp
+        event.hostname = hostname
+        event.source = source
+        event.source_type = source_type
+        event.event_type = event_type
+        event.file_path = file_path
+        event.previous_hash = previous_hash
+        event.current_hash = current_hash
+        event.file_owner = file_owner
+        event.file_permissions = file_permissions
+        event.metadata = metadata
+        event._pooled = False
+        return event
+
+    def release(self) -> None:
+        """Return this instance to the pool. It must not be used afterwards."""
+        if not self._pooled:
+            self._pooled = True
+            self.metadata = {}
+            _FIM_EVENT_POOL.append(self)
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "timestamp": self.timestamp,
+            "hostname": self.hostname,
+            "source": self.source,
+            "source_type": self.source_type,
+            "event_type": self.event_type,
+            "file_path": self.file_path,
+            "previous_hash": self.previous_hash,
+            "current_hash": self.current_hash,
+            "file_owner": self.file_owner,
+            "file_permissions": self.file_permissions,
+            "metadata": self.metadata,
+        }
+
+    def to_json(self) -> bytes:
+        return _json_dumps(self.to_dict())
 
     @classmethod
     def from_dict(cls, data: dict) -> "FIMEvent":
@@ -63,18 +270,64 @@ class EventBuffer:
     - The batch hasn't been sent yet
 
     This ensures no events are lost during network issues or restarts.
+
+    Inserts are write-behind: ``add_log_event``/``add_fim_event`` only enqueue
+    the serialized event and a background writer thread commits queued events
+    in batches, so one fsync covers hundreds of events instead of one each.
+    Event ids are allocated up front so callers still get them synchronously,
+    and every read flushes the queue first so callers always see their writes.
+
+    A single SQLite connection is held for the lifetime of the buffer and
+    shared across threads under ``_lock``; call ``close()`` to release it.
+
+    The shipper uses ``claim_batch``, which selects and deletes the head of the
+    queue in one transaction and keeps the claimed rows in memory until they
+    are either acknowledged or put back with ``reinsert``. Claims still
+    outstanding when the buffer is closed are written back to the database.
+
+    The buffer holds at most ``max_events`` rows; when a write pushes it over,
+    the oldest events are dropped and counted in ``dropped_events``.
     """
 
-    def __init__(self, db_path: Optional[Path] = None):
+    def __init__(self, db_path: Optional[Path] = None, max_events: Optional[int] = None):
         self.db_path = db_path or (Config.get_data_dir() / "buffer.db")
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        ensure_dir(self.db_path.parent)
+        self.max_events = max_events
+        self.dropped_events = 0
         self._lock = threading.Lock()
+        self._conn = self._connect()
         self._init_db()
 
+        # Running row count, kept in step with every insert and delete so
+        # count() and the size cap never need a COUNT(*) scan
+        self._stored = self._conn.execute(COUNT_SQL).fetchone()["count"]
+
+        # Write-behind queue state
+        self._id_lock = threading.Lock()
+        self._next_id = self._load_last_id()
+        self._write_queue: queue.Queue = queue.Queue()
+        self._closed = False
+
+        # Rows removed by claim_batch and not yet acknowledged, keyed by id
+        self._claimed: dict[int, tuple[int, str, bytes, str, int]] = {}
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, name="lognog-buffer-writer", daemon=True
+        )
+        self._writer_thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the buffer's shared database connection."""
+        conn = sqlite3.connect(str(self.db_path), timeout=10.0, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
     def _init_db(self) -> None:
         """Initialize the SQLite database."""
-        with self._get_connection() as conn:
-            conn.execute("""
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
                 CREATE TABLE IF NOT EXISTS events (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     event_type TEXT NOT NULL,
@@ -83,49 +336,176 @@ class EventBuffer:
                     attempts INTEGER DEFAULT 0
                 )
             """)
-            conn.execute("""
+            self._conn.execute("""
                 CREATE INDEX IF NOT EXISTS idx_events_created
                 ON events(created_at)
             """)
-            conn.commit()
+            self._conn.commit()
 
-    @contextmanager
-    def _get_connection(self):
-        """Get a database connection."""
-        conn = sqlite3.connect(str(self.db_path), timeout=10.0)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
-            conn.close()
+    def _load_last_id(self) -> int:
+        """Return the highest id ever handed out, so ids are never reused."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT seq FROM sqlite_sequence WHERE name = 'events'"
+            ).fetchone()
+            seq = row[0] if row else 0
+            row = self._conn.execute("SELECT MAX(id) FROM events").fetchone()
+            return max(seq, row[0] or 0)
 
-    def add_log_event(self, event: LogEvent) -> int:
-        """Add a log event to the buffer."""
+    def _enqueue(self, event_type: str, data: bytes) -> int:
+        """Allocate an id for an event and hand it to the writer thread."""
+        created_at = utc_now_iso()
+        with self._id_lock:
+            if self._closed:
+                raise RuntimeError("EventBuffer is closed")
+            self._next_id += 1
+            event_id = self._next_id
+            self._write_queue.put((event_id, event_type, data, created_at))
+        return event_id
+
+    def _write_rows(self, rows: list[tuple[int, str, bytes, str]]) -> None:
+        """Insert a batch of queued events in a single transaction.
+
+        On failure the transaction is rolled back, so a partial batch is never
+        committed by a later one, and the counters are restored to match.
+        """
         with self._lock:
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    """
-                    INSERT INTO events (event_type, data, created_at)
-                    VALUES (?, ?, ?)
-                    """,
-                    ("log", json.dumps(event.to_dict()), datetime.utcnow().isoformat())
-                )
-                conn.commit()
-                return cursor.lastrowid or 0
+            stored, dropped = self._stored, self.dropped_events
+            try:
+                self._conn.executemany(INSERT_EVENT_SQL, rows)
+                self._stored += len(rows)
+                if self.max_events is not None and self._stored > self.max_events:
+                    self._evict_oldest(self._stored - self.max_events)
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                self._stored, self.dropped_events = stored, dropped
+                raise
 
-    def add_fim_event(self, event: FIMEvent) -> int:
-        """Add a FIM event to the buffer."""
+    def _retry_rows(self, rows: list[tuple[int, str, bytes, str]], error: Exception) -> None:
+        """Rewrite a failed batch one event at a time.
+
+        One bad row (or a transient error) no longer costs the whole batch;
+        events that still cannot be written are counted in ``dropped_events``
+        so the loss shows up in the shipper's stats.
+        """
+        logger.warning(
+            f"Failed to write {len(rows)} buffered event(s), retrying one at a time: {error}"
+        )
+        lost = 0
+        for row in rows:
+            try:
+                self._write_rows([row])
+            except Exception as e:
+                lost += 1
+                error = e
+        if lost:
+            with self._lock:
+                self.dropped_events += lost
+            logger.error(f"Dropped {lost} buffered event(s) that could not be written: {error}")
+
+    def _evict_oldest(self, excess: int) -> None:
+        """Drop the oldest events to bring the buffer back under max_events.
+
+        Caller must hold ``_lock`` and commit.
+        """
+        cursor = self._conn.execute(EVICT_OLDEST_SQL, (excess,))
+        self._stored -= cursor.rowcount
+        self.dropped_events += cursor.rowcount
+        logger.warning(
+            f"Event buffer full ({self.max_events} events) - dropped {cursor.rowcount} oldest"
+        )
+
+    def _writer_loop(self) -> None:
+        """Drain the write queue, committing up to WRITE_BATCH_SIZE events at a time.
+
+        Besides event rows the queue carries ``None`` (stop) and flush markers
+        (``threading.Event``), which are set once every row queued ahead of
+        them has been written.
+        """
+        while True:
+            item = self._write_queue.get()
+            rows = []
+            marker = None
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                    break
+                if isinstance(item, threading.Event):
+                    marker = item
+                    break
+                rows.append(item)
+                if len(rows) >= WRITE_BATCH_SIZE:
+                    break
+                try:
+                    item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            try:
+                if rows:
+                    self._write_rows(rows)
+            except Exception as e:
+                self._retry_rows(rows, e)
+            finally:
+                if marker is not None:
+                    marker.set()
+
+            if stop:
+                return
+
+    def flush(self) -> None:
+        """Block until every event queued before this call has been committed.
+
+        Events queued by other threads after the call are not waited for, so
+        steady producers cannot hold a flush up.
+        """
+        marker = threading.Event()
+        with self._id_lock:
+            closed = self._closed
+            if not closed:
+                self._write_queue.put(marker)
+        if closed:
+            # close() already queued the stop; wait for the writer to drain
+            self._writer_thread.join()
+            return
+        marker.wait()
+
+    def close(self) -> None:
+        """Flush pending events, stop the writer thread and close the database."""
+        with self._id_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._write_queue.put(None)
+        self._writer_thread.join()
         with self._lock:
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    """
-                    INSERT INTO events (event_type, data, created_at)
-                    VALUES (?, ?, ?)
-                    """,
-                    ("fim", json.dumps(event.to_dict()), datetime.utcnow().isoformat())
-                )
-                conn.commit()
-                return cursor.lastrowid or 0
+            if self._claimed:
+                self._conn.executemany(REINSERT_EVENT_SQL, list(self._claimed.values()))
+                self._conn.commit()
+                self._claimed.clear()
+            self._conn.close()
+
+    def add_log_event(self, event: LogEvent) -> int:
+        """Add a log event to the buffer.
+
+        The buffer takes ownership of the event and returns it to the pool once
+        serialized, so callers must not reuse it afterwards.
+        """
+        data = event.to_json()
+        event.release()
+        return self._enqueue("log", data)
+
+    def add_fim_event(self, event: FIMEvent) -> int:
+        """Add a FIM event to the buffer.
+
+        The buffer takes ownership of the event and returns it to the pool once
+        serialized, so callers must not reuse it afterwards.
+        """
+        data = event.to_json()
+        event.release()
+        return self._enqueue("fim", data)
 
     def get_batch(self, batch_size: int = 100) -> list[tuple[int, str, dict]]:
         """
@@ -133,64 +513,137 @@ class EventBuffer:
 
         Returns list of (id, event_type, event_data) tuples.
         """
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute(SELECT_BATCH_SQL, (batch_size,)).fetchall()
+            return [(row["id"], row["event_type"], _json_loads(row["data"])) for row in rows]
+
+    def claim_batch(self, batch_size: int = 100) -> list[tuple[int, str, dict]]:
+        """
+        Take a batch of events off the head of the buffer for sending.
+
+        The rows are selected and deleted in a single transaction. Follow up
+        with ``acknowledge`` once the batch is delivered or dropped, or with
+        ``reinsert`` to put it back for a retry.
+
+        Returns list of (id, event_type, event_data) tuples.
+        """
+        rows = self._claim_rows(batch_size)
+        return [(row["id"], row["event_type"], _json_loads(row["data"])) for row in rows]
+
+    def claim_batch_raw(self, batch_size: int = 100) -> tuple[list[int], bytes]:
+        """
+        Like ``claim_batch``, but return the events as a ready-to-send JSON array.
+
+        The stored payloads are spliced into the array as-is with their
+        ``"type"`` key prepended, so nothing is decoded and re-encoded.
+
+        Returns (event_ids, events_json).
+        """
+        rows = self._claim_rows(batch_size)
+        event_ids = []
+        parts = []
+        for row in rows:
+            event_ids.append(row["id"])
+            parts.append(_frame_event(row["event_type"], row["data"]))
+        return event_ids, b"[" + b",".join(parts) + b"]"
+
+    def _claim_rows(self, batch_size: int) -> list[sqlite3.Row]:
+        """Select and delete the head rows, recording them as claimed."""
+        self.flush()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(CLAIM_BATCH_SQL, (batch_size,)).fetchall()
+                if rows:
+                    self._conn.execute(DELETE_CLAIMED_SQL, (rows[-1]["id"],))
+                self._conn.commit()
+                self._stored -= len(rows)
+            except Exception:
+                self._conn.rollback()
+                raise
+            for row in rows:
+                self._claimed[row["id"]] = (
+                    row["id"], row["event_type"], row["data"], row["created_at"], row["attempts"]
+                )
+            return rows
+
+    def acknowledge(self, event_ids: list[int]) -> None:
+        """Forget claimed events that were delivered or permanently rejected."""
         with self._lock:
-            with self._get_connection() as conn:
-                rows = conn.execute(
-                    """
-                    SELECT id, event_type, data FROM events
-                    ORDER BY id ASC
-                    LIMIT ?
-                    """,
-                    (batch_size,)
-                ).fetchall()
-                return [(row["id"], row["event_type"], json.loads(row["data"])) for row in rows]
+            for event_id in event_ids:
+                self._claimed.pop(event_id, None)
+
+    def reinsert(self, event_ids: list[int], max_attempts: Optional[int] = None) -> int:
+        """
+        Put claimed events back into the buffer after a failed send.
+
+        Each event's attempt counter is incremented; events reaching
+        ``max_attempts`` are dropped instead of being reinserted.
+
+        Returns the number of events dropped.
+        """
+        with self._lock:
+            rows = []
+            dropped = 0
+            for event_id in event_ids:
+                claimed = self._claimed.pop(event_id, None)
+                if claimed is None:
+                    continue
+                attempts = claimed[4] + 1
+                if max_attempts is not None and attempts >= max_attempts:
+                    dropped += 1
+                    continue
+                rows.append(claimed[:4] + (attempts,))
+            if rows:
+                self._conn.executemany(REINSERT_EVENT_SQL, rows)
+                self._stored += len(rows)
+                self._conn.commit()
+            return dropped
 
     def remove_events(self, event_ids: list[int]) -> None:
         """Remove successfully sent events from the buffer."""
         if not event_ids:
             return
+        self.flush()
         with self._lock:
-            with self._get_connection() as conn:
-                placeholders = ",".join("?" * len(event_ids))
-                conn.execute(
-                    f"DELETE FROM events WHERE id IN ({placeholders})",
-                    event_ids
-                )
-                conn.commit()
+            cursor = self._conn.executemany(DELETE_EVENT_SQL, [(i,) for i in event_ids])
+            self._stored -= cursor.rowcount
+            self._conn.commit()
 
     def increment_attempts(self, event_ids: list[int]) -> None:
         """Increment the attempt counter for failed events."""
         if not event_ids:
             return
+        self.flush()
         with self._lock:
-            with self._get_connection() as conn:
-                placeholders = ",".join("?" * len(event_ids))
-                conn.execute(
-                    f"UPDATE events SET attempts = attempts + 1 WHERE id IN ({placeholders})",
-                    event_ids
-                )
-                conn.commit()
+            self._conn.executemany(INCREMENT_ATTEMPTS_SQL, [(i,) for i in event_ids])
+            self._conn.commit()
 
     def remove_stale_events(self, max_attempts: int = 10) -> int:
         """Remove events that have failed too many times."""
+        self.flush()
         with self._lock:
-            with self._get_connection() as conn:
-                cursor = conn.execute(
-                    "DELETE FROM events WHERE attempts >= ?",
-                    (max_attempts,)
-                )
-                conn.commit()
-                return cursor.rowcount
+            cursor = self._conn.execute(DELETE_STALE_SQL, (max_attempts,))
+            self._stored -= cursor.rowcount
+            self._conn.commit()
+            return cursor.rowcount
 
     def count(self) -> int:
-        """Get the number of buffered events."""
-        with self._get_connection() as conn:
-            row = conn.execute("SELECT COUNT(*) as count FROM events").fetchone()
-            return row["count"] if row else 0
+        """Get the number of buffered events, including claimed in-flight ones.
+
+        Served from the running row counter, which is reconciled with a single
+        COUNT(*) when the buffer is opened.
+        """
+        self.flush()
+        with self._lock:
+            return self._stored + len(self._claimed)
 
     def clear(self) -> None:
         """Clear all buffered events."""
+        self.flush()
         with self._lock:
-            with self._get_connection() as conn:
-                conn.execute("DELETE FROM events")
-                conn.commit()
+            self._conn.execute("DELETE FROM events")
+            self._conn.commit()
+            self._stored = 0
+            self._claimed.clear()
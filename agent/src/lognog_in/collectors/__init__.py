@@ -2,13 +2,13 @@
 
 import sys
 
-__all__ = []
+# Only export WindowsEventCollector on Windows. It is imported on first
+# attribute access (PEP 562) so pywin32 stays out of the startup path.
+__all__ = ["WindowsEventCollector"] if sys.platform == "win32" else []
 
-# Only export WindowsEventCollector on Windows
-if sys.platform == "win32":
-    try:
+
+def __getattr__(name: str):
+    if name == "WindowsEventCollector" and sys.platform == "win32":
         from .windows_events import WindowsEventCollector
-        __all__.append("WindowsEventCollector")
-    except ImportError:
-        # pywin32 not installed
-        pass
+        return WindowsEventCollector
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,40 +3,90 @@
 import logging
 import os
 import sqlite3
+import sys
 import threading
 import time
-from contextlib import contextmanager
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Callable, Optional
+from xml.sax.saxutils import quoteattr
 
 try:
     import win32evtlog
     import win32evtlogutil
     import win32con
+    import win32security
     import pywintypes
     HAS_PYWIN32 = True
 except ImportError:
     HAS_PYWIN32 = False
 
-from ..buffer import LogEvent
+from ..buffer import LogEvent, utc_now_iso
 from ..config import Config
 
+# The Vista+ Evt* API resumes from a bookmark instead of re-reading the log;
+# older pywin32 builds only expose the legacy EventLog functions.
+HAS_EVT_API = HAS_PYWIN32 and hasattr(win32evtlog, "EvtSubscribe")
+
 logger = logging.getLogger(__name__)
 
 
 # Windows Event severity mapping
-EVENT_TYPE_MAP = {
+EVENT_TYPE_MAP = MappingProxyType({
     win32evtlog.EVENTLOG_ERROR_TYPE: "error",
     win32evtlog.EVENTLOG_WARNING_TYPE: "warning",
     win32evtlog.EVENTLOG_INFORMATION_TYPE: "info",
     win32evtlog.EVENTLOG_AUDIT_SUCCESS: "info",
     win32evtlog.EVENTLOG_AUDIT_FAILURE: "warning",
-} if HAS_PYWIN32 else {}
+} if HAS_PYWIN32 else {})
+
+
+# Severity by Evt* event level (1 critical, 2 error, 3 warning, 4 info, 5 verbose)
+EVT_LEVEL_MAP = MappingProxyType({
+    1: "error",
+    2: "error",
+    3: "warning",
+})
+
+# Legacy EventType by Evt* event level, so both paths report the same event_type
+EVT_LEVEL_EVENT_TYPE = MappingProxyType({
+    1: win32evtlog.EVENTLOG_ERROR_TYPE,
+    2: win32evtlog.EVENTLOG_ERROR_TYPE,
+    3: win32evtlog.EVENTLOG_WARNING_TYPE,
+} if HAS_PYWIN32 else {})
+
+# Keyword bits set on security audits (level 0 like all audit events)
+EVT_KEYWORD_AUDIT_FAILURE = 0x10000000000000
+EVT_KEYWORD_AUDIT_SUCCESS = 0x20000000000000
+
+# Indexes into the values rendered with an EvtRenderContextSystem context
+# (EVT_SYSTEM_PROPERTY_ID)
+EVT_SYSTEM_PROVIDER_NAME = 0
+EVT_SYSTEM_EVENT_ID = 2
+EVT_SYSTEM_LEVEL = 4
+EVT_SYSTEM_KEYWORDS = 7
+EVT_SYSTEM_TIME_CREATED = 8
+EVT_SYSTEM_RECORD_ID = 9
+EVT_SYSTEM_COMPUTER = 15
+EVT_SYSTEM_USER_ID = 16
+
+
+# Formatted messages kept for reuse; identical events repeat constantly
+MESSAGE_CACHE_SIZE = 1024
+
+# Open publisher metadata handles kept per provider
+PROVIDER_CACHE_SIZE = 256
+
+# Consecutive legacy format failures after which a source is treated as
+# having no loadable message DLL
+LEGACY_FORMAT_FAILURE_LIMIT = 3
 
 
 # High-value security events
-HIGH_VALUE_EVENTS = {
+HIGH_VALUE_EVENTS = MappingProxyType({
     4624: "Successful logon",
     4625: "Failed logon",
     4648: "Explicit credential logon",
@@ -61,7 +111,7 @@ HIGH_VALUE_EVENTS = {
     4757: "Member removed from security-enabled universal group",
     7045: "Service installed",
     7040: "Service start type changed",
-}
+})
 
 
 def detect_record_reset(bookmark: Optional[int], oldest: int, total: int) -> Optional[int]:
@@ -86,6 +136,86 @@ def detect_record_reset(bookmark: Optional[int], oldest: int, total: int) -> Opt
     return bookmark
 
 
+# Tuning for the bookmark database connection. WAL (set in _init_db and
+# persisted in the file) keeps bookmark commits from blocking readers, and NORMAL
+# sync only fsyncs at checkpoints; wal_autocheckpoint bounds the WAL's growth,
+# and a 2MB page cache keeps the small bookmarks table resident.
+BOOKMARK_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA cache_size=-2000",
+)
+
+
+# Bookmark statements are fixed text so the connection's statement cache reuses them.
+SELECT_BOOKMARKS_SQL = "SELECT channel, record_number FROM bookmarks"
+UPSERT_BOOKMARK_SQL = """
+    INSERT OR REPLACE INTO bookmarks (channel, record_number, timestamp)
+    VALUES (?, ?, ?)
+"""
+
+
+@lru_cache(maxsize=1024)
+def sid_to_string(sid) -> Optional[str]:
+    """Convert a SID to its S-1-... form, memoized since a few SIDs dominate."""
+    try:
+        return win32security.ConvertSidToStringSid(sid)
+    except Exception:
+        return None
+
+
+def event_timestamp(value) -> str:
+    """Format an event's creation time as a UTC ISO-8601 string ending in "Z".
+
+    pywin32 returns timezone-aware datetimes on current builds and naive UTC
+    ones on older builds; anything else falls back to the current time.
+    """
+    if not isinstance(value, datetime):
+        return utc_now_iso() + "Z"
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat(timespec="microseconds") + "Z"
+
+
+def build_event_id_query(event_ids: Optional[frozenset[int]]) -> str:
+    """Build an XPath event query that only matches the given event IDs.
+
+    Consecutive IDs are folded into ranges to keep the expression short, since
+    the event log service caps the size of a query. None matches everything.
+    """
+    if not event_ids:
+        return "*"
+
+    clauses = []
+    ids = sorted(event_ids)
+    start = prev = ids[0]
+    for event_id in ids[1:] + [None]:
+        if event_id is not None and event_id == prev + 1:
+            prev = event_id
+            continue
+        if start == prev:
+            clauses.append(f"EventID={start}")
+        else:
+            clauses.append(f"(EventID>={start} and EventID<={prev})")
+        if event_id is not None:
+            start = prev = event_id
+    return f"*[System[{' or '.join(clauses)}]]"
+
+
+def bookmark_xml(channel: str, record_number: int) -> str:
+    """Build Evt bookmark XML pointing at a channel's record number.
+
+    Only the record number is persisted, so the bookmark handed to
+    EvtSubscribe is rebuilt from it on startup.
+    """
+    return (
+        f"<BookmarkList><Bookmark Channel={quoteattr(channel)} "
+        f"RecordId='{int(record_number)}' IsCurrent='true'/></BookmarkList>"
+    )
+
+
 class EventBookmark:
     """Manages bookmarks for Windows Event Log reading."""
 
@@ -94,51 +224,76 @@ class EventBookmark:
         self.db_path = db_path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
         self._lock = threading.Lock()
+        self._conn = self._connect()
+        # Only this process writes bookmarks, so reads are served from memory
+        # and SQLite is kept purely for durability.
+        self._cache: dict[str, int] = {}
         self._init_db()
 
+    def _connect(self) -> sqlite3.Connection:
+        """Open the long-lived bookmark connection (autocommit)."""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=10.0,
+            check_same_thread=False,
+            isolation_level=None,
+        )
+        for pragma in BOOKMARK_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
     def _init_db(self) -> None:
         """Initialize the SQLite database."""
-        with self._get_connection() as conn:
-            conn.execute("""
+        with self._lock:
+            # WAL needs a real file; an in-memory database keeps its default journal
+            if str(self.db_path) != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
                 CREATE TABLE IF NOT EXISTS bookmarks (
                     channel TEXT PRIMARY KEY,
                     record_number INTEGER NOT NULL,
                     timestamp TEXT NOT NULL
                 )
             """)
-            conn.commit()
+            self._cache = dict(self._conn.execute(SELECT_BOOKMARKS_SQL).fetchall())
 
-    @contextmanager
-    def _get_connection(self):
-        """Get a database connection."""
-        conn = sqlite3.connect(str(self.db_path), timeout=10.0)
-        try:
-            yield conn
-        finally:
-            conn.close()
+    def close(self) -> None:
+        """Refresh query statistics, fold the WAL back and close the connection."""
+        with self._lock:
+            self._conn.execute("PRAGMA optimize")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._conn.close()
 
     def get_bookmark(self, channel: str) -> Optional[int]:
         """Get the last read record number for a channel."""
-        with self._lock:
-            with self._get_connection() as conn:
-                row = conn.execute(
-                    "SELECT record_number FROM bookmarks WHERE channel = ?",
-                    (channel,)
-                ).fetchone()
-                return row[0] if row else None
+        return self._cache.get(channel)
 
     def set_bookmark(self, channel: str, record_number: int) -> None:
         """Set the bookmark for a channel."""
         with self._lock:
-            with self._get_connection() as conn:
-                conn.execute(
-                    """
-                    INSERT OR REPLACE INTO bookmarks (channel, record_number, timestamp)
-                    VALUES (?, ?, ?)
-                    """,
-                    (channel, record_number, datetime.utcnow().isoformat())
+            self._conn.execute(
+                UPSERT_BOOKMARK_SQL,
+                (channel, record_number, utc_now_iso())
+            )
+            self._cache[channel] = record_number
+
+    def batch_set(self, bookmarks: dict[str, int]) -> None:
+        """Set bookmarks for several channels in one transaction."""
+        if not bookmarks:
+            return
+        timestamp = utc_now_iso()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    UPSERT_BOOKMARK_SQL,
+                    [(channel, record, timestamp) for channel, record in bookmarks.items()],
                 )
-                conn.commit()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._cache.update(bookmarks)
 
 
 class WindowsEventCollector:
@@ -149,6 +304,8 @@ class WindowsEventCollector:
     - Collects from multiple channels (Security, System, Application, etc.)
     - Event ID filtering
     - Bookmark persistence to avoid re-reading
+    - Push Evt* subscriptions that resume after the bookmark, with a legacy
+      EventLog polling fallback
     - Efficient batch reading
     - Graceful fallback if pywin32 not available
     """
@@ -179,20 +336,53 @@ class WindowsEventCollector:
                 "Install it with: pip install pywin32"
             )
 
-        self.channels = channels
+        # Interned so every event from a channel shares one string
+        self.channels = [sys.intern(channel) for channel in channels]
         self.hostname = hostname
-        self.event_ids = set(event_ids) if event_ids else None
+        self.event_ids = frozenset(event_ids) if event_ids else None
         self.poll_interval = poll_interval
         self.batch_size = batch_size
         self.on_event = on_event
 
+        # Per-channel (source_type, file_path), formatted once instead of per event
+        self._channel_meta = {
+            channel: (f"windows_{channel.lower()}", f"EventLog://{channel}")
+            for channel in self.channels
+        }
+
+        # Evt* subscriptions filter on event ID in the event log service, so
+        # unwanted events are never marshaled into Python
+        self._query = build_event_id_query(self.event_ids)
+
         # Bookmark database
         bookmark_path = Config.get_data_dir() / "windows_events_bookmarks.db"
         self.bookmarks = EventBookmark(bookmark_path)
 
+        # Evt* push subscriptions by channel, opened in start(); channels
+        # without one are polled with the legacy reader
+        self._subscriptions: dict[str, object] = {}
+        self._pending_bookmarks: dict[str, int] = {}
+        self._pending_lock = threading.Lock()
+        self._system_context = None
+        self._user_context = None
+
+        # (provider, event id, inserts) -> formatted message
+        self._message_cache: dict[tuple, str] = {}
+        # provider name -> EvtOpenPublisherMetadata handle
+        self._provider_cache: dict[str, object] = {}
+        # Providers whose publisher metadata could not be opened, or whose
+        # legacy messages failed to format LEGACY_FORMAT_FAILURE_LIMIT times running
+        self._bad_providers: set[str] = set()
+        # provider name -> consecutive legacy format failures
+        self._format_failures: dict[str, int] = {}
+        # Guards the caches above: EvtSubscribe callbacks and the conversion
+        # pool fill and evict them concurrently
+        self._cache_lock = threading.Lock()
+
         # State
         self._running = False
         self._thread: Optional[threading.Thread] = None
+        self._pool: Optional[ThreadPoolExecutor] = None
         self._stop_event = threading.Event()
 
         # Stats
@@ -211,6 +401,18 @@ class WindowsEventCollector:
 
         self._stop_event.clear()
         self._running = True
+        if HAS_EVT_API:
+            for channel in self.channels:
+                self._subscribe(channel)
+
+        # Legacy reads block in Win32 calls that release the GIL, so polling
+        # several channels in parallel bounds a cycle by its slowest channel
+        legacy_count = len(self.channels) - len(self._subscriptions)
+        if legacy_count > 1:
+            self._pool = ThreadPoolExecutor(
+                max_workers=min(8, legacy_count),
+                thread_name_prefix="winevents",
+            )
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
         logger.info(f"Windows Event collector started for channels: {', '.join(self.channels)}")
@@ -222,11 +424,22 @@ class WindowsEventCollector:
         if not self._running:
             return
 
+        # Dropping the handles closes the subscriptions
+        self._subscriptions.clear()
+
         self._stop_event.set()
         if self._thread:
             self._thread.join(timeout=10.0)
             self._thread = None
-
+        if self._pool:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+        # Keep the position reached by the last callbacks
+        with self._pending_lock:
+            bookmarks, self._pending_bookmarks = self._pending_bookmarks, {}
+        self.bookmarks.batch_set(bookmarks)
+        self.bookmarks.close()
         self._running = False
         logger.info("Windows Event collector stopped")
         logger.info(f"  Collected: {self._events_collected}, Filtered: {self._events_filtered}")
@@ -236,32 +449,123 @@ class WindowsEventCollector:
         return self._running
 
     def _run_loop(self) -> None:
-        """Main collection loop."""
+        """Main collection loop.
+
+        Subscribed channels deliver through ``_on_evt_event`` as events occur;
+        each cycle polls the legacy channels and commits every channel's
+        bookmark together.
+        """
         while not self._stop_event.is_set():
             try:
-                for channel in self.channels:
-                    events = self._collect_channel(channel)
-                    for event in events:
-                        if self.on_event:
-                            self.on_event(event)
-                        self._events_collected += 1
-
+                self.bookmarks.batch_set(self._poll_legacy_channels())
             except Exception as e:
                 logger.error(f"Error in Windows Event collection loop: {e}", exc_info=True)
 
             # Wait for next poll
             self._stop_event.wait(timeout=self.poll_interval)
 
-    def _collect_channel(self, channel: str) -> list[LogEvent]:
-        """Collect events from a specific channel."""
+    def _poll_legacy_channels(self) -> dict[str, int]:
+        """Read the channels without a subscription and dispatch their events.
+
+        Returns the bookmarks to persist, including those advanced by
+        subscription callbacks since the last cycle.
+        """
+        with self._pending_lock:
+            bookmarks, self._pending_bookmarks = self._pending_bookmarks, {}
+
+        channels = [c for c in self.channels if c not in self._subscriptions]
+        if self._pool:
+            results = self._pool.map(self._collect_channel, channels)
+        else:
+            results = map(self._collect_channel, channels)
+
+        for channel, (events, last_record) in zip(channels, results):
+            if last_record is not None:
+                bookmarks[channel] = last_record
+            for event in events:
+                if self.on_event:
+                    self.on_event(event)
+                self._events_collected += 1
+        return bookmarks
+
+    def _subscribe(self, channel: str) -> bool:
+        """Open a push subscription delivering the channel's events to a callback.
+
+        The subscription resumes after the stored bookmark, or delivers only
+        new events when the channel has none. Returns False when the channel
+        cannot be subscribed to, leaving it to the legacy EventLog reader.
+        """
+        try:
+            if self._system_context is None:
+                self._system_context = win32evtlog.EvtCreateRenderContext(
+                    win32evtlog.EvtRenderContextSystem
+                )
+                self._user_context = win32evtlog.EvtCreateRenderContext(
+                    win32evtlog.EvtRenderContextUser
+                )
+
+            record_number = self.bookmarks.get_bookmark(channel)
+            if record_number is None:
+                flags = win32evtlog.EvtSubscribeToFutureEvents
+                bookmark = None
+                logger.info(f"No bookmark for {channel}, collecting new events only")
+            else:
+                flags = win32evtlog.EvtSubscribeStartAfterBookmark
+                bookmark = win32evtlog.EvtCreateBookmark(bookmark_xml(channel, record_number))
+
+            self._subscriptions[channel] = win32evtlog.EvtSubscribe(
+                channel,
+                flags,
+                Callback=self._on_evt_event,
+                Context=channel,
+                Query=self._query,
+                Bookmark=bookmark,
+            )
+            return True
+        except pywintypes.error as e:
+            logger.warning(f"Cannot subscribe to {channel} ({e}); using legacy reader")
+            return False
+
+    def _on_evt_event(self, action: int, channel: str, handle) -> int:
+        """Subscription callback, run on a system thread pool thread per event."""
+        if action != win32evtlog.EvtSubscribeActionDeliver:
+            logger.error(f"Subscription error on {channel}: {handle}")
+            return 0
+
+        try:
+            values = win32evtlog.EvtRender(
+                handle,
+                win32evtlog.EvtRenderEventValues,
+                Context=self._system_context,
+            )
+            log_event = self._convert_evt_event(handle, values, channel)
+            if log_event:
+                if self.on_event:
+                    self.on_event(log_event)
+                self._events_collected += 1
+
+            # Persisted with the next cycle's bookmark commit
+            with self._pending_lock:
+                self._pending_bookmarks[channel] = values[EVT_SYSTEM_RECORD_ID][0]
+        except Exception as e:
+            logger.error(f"Unexpected error reading {channel}: {e}", exc_info=True)
+        return 0
+
+    def _collect_channel(self, channel: str) -> tuple[list[LogEvent], Optional[int]]:
+        """Collect events from a channel with the legacy EventLog API.
+
+        Returns the events and the channel's new bookmark, or None when the
+        bookmark did not move. Persisting it is left to the caller.
+        """
         events = []
+        new_bookmark = None
 
         try:
             # Open the event log
             hand = win32evtlog.OpenEventLog(None, channel)
             if not hand:
                 logger.error(f"Failed to open event log: {channel}")
-                return events
+                return events, None
 
             try:
                 # Get total number of records
@@ -299,6 +603,8 @@ class WindowsEventCollector:
 
                 events_read = 0
                 last_record = bookmark
+                # Bound membership test, looked up once rather than per event
+                wanted = self.event_ids.__contains__ if self.event_ids else None
 
                 while events_read < self.batch_size and not self._stop_event.is_set():
                     # Read next batch of events
@@ -316,9 +622,8 @@ class WindowsEventCollector:
 
                         # Filter by event ID if specified
                         event_id = raw_event.EventID & 0xFFFF  # Mask off top bits
-                        if self.event_ids and event_id not in self.event_ids:
+                        if wanted is not None and not wanted(event_id):
                             self._events_filtered += 1
-                            last_record = max(last_record, record_number)
                             continue
 
                         # Convert to LogEvent
@@ -327,14 +632,17 @@ class WindowsEventCollector:
                             events.append(log_event)
                             events_read += 1
 
-                        last_record = max(last_record, record_number)
-
                         if events_read >= self.batch_size:
                             break
 
-                # Update bookmark
+                    # Sequential forward reads return records in ascending
+                    # order, so the last event handled (whether the batch ran
+                    # out or we stopped early) is the furthest one
+                    last_record = max(last_record, raw_event.RecordNumber)
+
+                # Report the advanced bookmark
                 if last_record > bookmark:
-                    self.bookmarks.set_bookmark(channel, last_record)
+                    new_bookmark = last_record
 
             finally:
                 win32evtlog.CloseEventLog(hand)
@@ -344,7 +652,7 @@ class WindowsEventCollector:
         except Exception as e:
             logger.error(f"Unexpected error reading {channel}: {e}", exc_info=True)
 
-        return events
+        return events, new_bookmark
 
     def _convert_event(self, raw_event, channel: str) -> Optional[LogEvent]:
         """Convert a Windows event to a LogEvent."""
@@ -356,27 +664,24 @@ class WindowsEventCollector:
             source_name = raw_event.SourceName
             computer = raw_event.ComputerName
 
-            # Get event message
-            try:
-                message = win32evtlogutil.SafeFormatMessage(raw_event, channel)
-            except Exception:
-                # Fallback if message formatting fails
-                message = f"Event ID {event_id} from {source_name}"
+            # Get event message. FormatMessage raises where SafeFormatMessage
+            # would hide the failure in its own placeholder text, so sources
+            # whose message DLL cannot be loaded are noticed and skipped.
+            message = self._cached_message(
+                (source_name, raw_event.EventID, raw_event.StringInserts),
+                lambda: win32evtlogutil.FormatMessage(raw_event, channel),
+                failure_limit=LEGACY_FORMAT_FAILURE_LIMIT,
+            )
 
             # Map event type to severity
             severity = EVENT_TYPE_MAP.get(event_type, "info")
 
             # Extract user SID if available
-            user_sid = None
-            if raw_event.Sid:
-                try:
-                    import win32security
-                    user_sid = win32security.ConvertSidToStringSid(raw_event.Sid)
-                except Exception:
-                    pass
-
-            # Build structured data
-            structured_data = {
+            user_sid = sid_to_string(raw_event.Sid) if raw_event.Sid else None
+
+            # Build structured data straight into the event's metadata
+            metadata = {
+                "severity": severity,
                 "event_id": event_id,
                 "provider": source_name,
                 "channel": channel,
@@ -386,45 +691,203 @@ class WindowsEventCollector:
             }
 
             if user_sid:
-                structured_data["user_sid"] = user_sid
+                metadata["user_sid"] = user_sid
 
             # Add event category description for high-value events
-            if event_id in HIGH_VALUE_EVENTS:
-                structured_data["event_category"] = HIGH_VALUE_EVENTS[event_id]
+            category = HIGH_VALUE_EVENTS.get(event_id)
+            if category:
+                metadata["event_category"] = category
 
             # Add string inserts (event-specific data)
             if raw_event.StringInserts:
-                structured_data["event_data"] = list(raw_event.StringInserts)
+                metadata["event_data"] = list(raw_event.StringInserts)
 
             # Create LogEvent
-            timestamp = time_generated.isoformat() if hasattr(time_generated, 'isoformat') else datetime.utcnow().isoformat()
+            source_type, file_path = self._channel_meta[channel]
+            return LogEvent.acquire(
+                timestamp=event_timestamp(time_generated),
+                hostname=self.hostname,
+                source="lognog-in-winevents",
+                source_type=source_type,
+                file_path=file_path,
+                message=message,
+                metadata=metadata,
+            )
+
+        except Exception as e:
+            logger.error(f"Error converting event: {e}", exc_info=True)
+            return None
+
+    def _convert_evt_event(self, handle, values: list, channel: str) -> Optional[LogEvent]:
+        """Convert an Evt* event to a LogEvent."""
+        try:
+            event_id = values[EVT_SYSTEM_EVENT_ID][0]
+            source_name = values[EVT_SYSTEM_PROVIDER_NAME][0]
+            level = values[EVT_SYSTEM_LEVEL][0] or 0
+            keywords = values[EVT_SYSTEM_KEYWORDS][0] or 0
+            time_created = values[EVT_SYSTEM_TIME_CREATED][0]
+
+            # Event-specific data, which also keys the message cache
+            event_data = win32evtlog.EvtRender(
+                handle, win32evtlog.EvtRenderEventValues, Context=self._user_context
+            )
+            inserts = tuple(str(value) for value, _ in event_data if value is not None)
 
-            return LogEvent(
-                timestamp=timestamp + "Z" if not timestamp.endswith("Z") else timestamp,
+            # Get event message
+            message = self._cached_message(
+                (source_name, event_id, inserts),
+                lambda: win32evtlog.EvtFormatMessage(
+                    self._publisher_metadata(source_name),
+                    handle,
+                    win32evtlog.EvtFormatMessageEvent,
+                ),
+            )
+
+            # Map level to severity; audits are all level 0, so check the keyword
+            if keywords & EVT_KEYWORD_AUDIT_FAILURE:
+                severity = "warning"
+                event_type = win32evtlog.EVENTLOG_AUDIT_FAILURE
+            elif keywords & EVT_KEYWORD_AUDIT_SUCCESS:
+                severity = "info"
+                event_type = win32evtlog.EVENTLOG_AUDIT_SUCCESS
+            else:
+                severity = EVT_LEVEL_MAP.get(level, "info")
+                event_type = EVT_LEVEL_EVENT_TYPE.get(
+                    level, win32evtlog.EVENTLOG_INFORMATION_TYPE
+                )
+
+            # Extract user SID if available
+            sid = values[EVT_SYSTEM_USER_ID][0]
+            user_sid = sid_to_string(sid) if sid else None
+
+            # Build structured data straight into the event's metadata
+            metadata = {
+                "severity": severity,
+                "event_id": event_id,
+                "provider": source_name,
+                "channel": channel,
+                "record_number": values[EVT_SYSTEM_RECORD_ID][0],
+                "event_type": event_type,
+                "level": level,
+                "computer": values[EVT_SYSTEM_COMPUTER][0],
+            }
+
+            if user_sid:
+                metadata["user_sid"] = user_sid
+
+            # Add event category description for high-value events
+            category = HIGH_VALUE_EVENTS.get(event_id)
+            if category:
+                metadata["event_category"] = category
+
+            # Add event-specific data
+            if inserts:
+                metadata["event_data"] = list(inserts)
+
+            # Create LogEvent
+            source_type, file_path = self._channel_meta[channel]
+            return LogEvent.acquire(
+                timestamp=event_timestamp(time_created),
                 hostname=self.hostname,
                 source="lognog-in-winevents",
-                source_type=f"windows_{channel.lower()}",
-                file_path=f"EventLog://{channel}",
-                message=message.strip() if message else f"Event {event_id}",
-                metadata={
-                    "severity": severity,
-                    **structured_data,
-                },
+                source_type=source_type,
+                file_path=file_path,
+                message=message,
+                metadata=metadata,
             )
 
         except Exception as e:
             logger.error(f"Error converting event: {e}", exc_info=True)
             return None
 
+    def _publisher_metadata(self, source_name: str):
+        """Return the provider's publisher metadata, opening it once per provider."""
+        metadata = self._provider_cache.get(source_name)
+        if metadata is None:
+            try:
+                metadata = win32evtlog.EvtOpenPublisherMetadata(source_name)
+            except Exception:
+                # No message resources; don't retry for this provider
+                with self._cache_lock:
+                    self._bad_providers.add(source_name)
+                raise
+            with self._cache_lock:
+                # Another thread may have opened the same provider meanwhile
+                cached = self._provider_cache.get(source_name)
+                if cached is not None:
+                    return cached
+                if len(self._provider_cache) >= PROVIDER_CACHE_SIZE:
+                    # Evict the oldest entry; dropping the handle closes it
+                    self._provider_cache.pop(next(iter(self._provider_cache)), None)
+                self._provider_cache[source_name] = metadata
+        return metadata
+
+    def _cached_message(
+        self,
+        key: tuple,
+        format_message: Callable[[], str],
+        failure_limit: Optional[int] = None,
+    ) -> str:
+        """Return the formatted message for ``key``, formatting it on a miss.
+
+        ``key`` is (provider, event id, inserts). Loading message DLLs and
+        substituting inserts is the costliest part of converting an event, and
+        the same provider/ID/inserts recur constantly. With ``failure_limit``,
+        a provider whose messages fail that many times in a row without a
+        success is skipped from then on.
+        """
+        message = self._message_cache.get(key)
+        if message is not None:
+            return message
+
+        source_name, event_id = key[0], key[1] & 0xFFFF
+        if source_name in self._bad_providers:
+            # Provider has no usable metadata; skip the attempt and its exception
+            return f"Event ID {event_id} from {source_name}"
+
+        try:
+            message = format_message()
+            message = message.strip() if message else f"Event {event_id}"
+        except Exception:
+            # Fallback if message formatting fails. Failures can be specific to
+            # one event (missing message, unresolved insert), so one failure
+            # only affects this event; a run of them means the provider's
+            # message DLL is unusable.
+            if failure_limit is not None:
+                with self._cache_lock:
+                    failures = self._format_failures.get(source_name, 0) + 1
+                    self._format_failures[source_name] = failures
+                    if failures >= failure_limit:
+                        self._bad_providers.add(source_name)
+            return f"Event ID {event_id} from {source_name}"
+
+        with self._cache_lock:
+            if failure_limit is not None:
+                self._format_failures.pop(source_name, None)
+            if len(self._message_cache) >= MESSAGE_CACHE_SIZE:
+                # Evict the oldest entry
+                self._message_cache.pop(next(iter(self._message_cache)), None)
+            self._message_cache[key] = message
+        return message
+
     def collect(self) -> list[LogEvent]:
         """
         Collect new events since last check (synchronous version).
 
         This is useful for one-off collection rather than continuous monitoring.
+        Channels with a running subscription deliver through ``on_event``
+        instead and are skipped here.
         """
         events = []
+        bookmarks = {}
         for channel in self.channels:
-            events.extend(self._collect_channel(channel))
+            if channel in self._subscriptions:
+                continue
+            channel_events, last_record = self._collect_channel(channel)
+            events.extend(channel_events)
+            if last_record is not None:
+                bookmarks[channel] = last_record
+        self.bookmarks.batch_set(bookmarks)
         return events
 
     def get_stats(self) -> dict:
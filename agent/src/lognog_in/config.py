@@ -1,16 +1,90 @@
 """Configuration management for LogNog In agent."""
 
+import hashlib
+import json
+import locale
 import os
 import yaml
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from functools import cache
 from typing import Optional
 import appdirs
 
+# LibYAML's C parser/emitter is several times faster than the pure-Python one;
+# PyYAML builds without it fall back to the safe pure-Python classes.
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 
 APP_NAME = "lognog-in"
 APP_AUTHOR = "MachineKingLabs"
 
+# Directories already created this process, so repeat calls skip the syscalls
+_DIRS_ENSURED: set[Path] = set()
+
+
+def ensure_dir(path: Path) -> None:
+    """Create a directory (and parents) once per process."""
+    if path in _DIRS_ENSURED:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    _DIRS_ENSURED.add(path)
+
+
+@cache
+def _app_dir(resolve) -> Path:
+    """Resolve an appdirs user directory once per process (env/registry lookups)."""
+    return Path(resolve(APP_NAME, APP_AUTHOR))
+
+
+def _cache_path(config_path: Path) -> Path:
+    """Path of the parsed-config cache kept next to a YAML config file."""
+    return config_path.with_suffix(".cache.json")
+
+
+def _config_digest(yaml_bytes: bytes) -> str:
+    """Digest of the YAML file's bytes that keys its parsed-config cache."""
+    return hashlib.blake2b(yaml_bytes, digest_size=16).hexdigest()
+
+
+def _read_config_cache(config_path: Path, yaml_bytes: bytes) -> Optional[dict]:
+    """Return the cached parse of ``config_path`` if it is still current.
+
+    The cache records a digest of the YAML bytes rather than its mtime and
+    size, which a same-size edit within one timestamp tick would leave
+    unchanged. Hashing a small file is still far cheaper than parsing it.
+    """
+    try:
+        raw = _cache_path(config_path).read_bytes()
+        cached = orjson.loads(raw) if HAS_ORJSON else json.loads(raw)
+    except (OSError, ValueError):
+        return None
+    if cached.get("digest") != _config_digest(yaml_bytes):
+        return None
+    return cached.get("data")
+
+
+def _write_config_cache(config_path: Path, yaml_bytes: bytes, data: dict) -> None:
+    """Store the parsed config as JSON so the next load can skip YAML parsing."""
+    try:
+        cached = {"digest": _config_digest(yaml_bytes), "data": data}
+        raw = orjson.dumps(cached) if HAS_ORJSON else json.dumps(cached).encode("utf-8")
+        tmp_path = _cache_path(config_path).with_suffix(".tmp")
+        tmp_path.write_bytes(raw)
+        os.replace(tmp_path, _cache_path(config_path))
+    except (OSError, TypeError) as e:
+        # The cache is only an optimization; YAML stays the source of truth
+        print(f"[lognog-in] Warning: could not write config cache: {e}")
+
 
 def _filter_fields(raw: dict, cls, section: str) -> dict:
     """Drop unknown keys from a config dict so a typo doesn't crash agent startup."""
@@ -61,6 +135,7 @@ class Config:
     # FIM paths
     fim_paths: list[FIMPath] = field(default_factory=list)
     fim_enabled: bool = False
+    fim_hash_algorithm: str = "sha256"  # or "blake3" (needs the speedups extra)
 
     # Windows Event Log collection
     windows_events: WindowsEventsConfig = field(default_factory=WindowsEventsConfig)
@@ -71,6 +146,7 @@ class Config:
     batch_interval_seconds: float = 5.0
     retry_max_attempts: int = 5
     retry_backoff_seconds: float = 2.0
+    max_buffered_events: int = 500_000  # oldest events are dropped beyond this
 
     # Behavior
     start_on_boot: bool = False
@@ -95,17 +171,22 @@ class Config:
     @classmethod
     def get_config_dir(cls) -> Path:
         """Get the configuration directory."""
-        return Path(appdirs.user_config_dir(APP_NAME, APP_AUTHOR))
+        return _app_dir(appdirs.user_config_dir)
 
     @classmethod
     def get_data_dir(cls) -> Path:
         """Get the data directory (for databases)."""
-        return Path(appdirs.user_data_dir(APP_NAME, APP_AUTHOR))
+        return _app_dir(appdirs.user_data_dir)
 
     @classmethod
     def get_log_dir(cls) -> Path:
         """Get the log directory."""
-        return Path(appdirs.user_log_dir(APP_NAME, APP_AUTHOR))
+        return _app_dir(appdirs.user_log_dir)
+
+    @classmethod
+    def get_cache_dir(cls) -> Path:
+        """Get the cache directory (for derived files that can be rebuilt)."""
+        return _app_dir(appdirs.user_cache_dir)
 
     @classmethod
     def get_config_path(cls) -> Path:
@@ -120,8 +201,20 @@ class Config:
         if not config_path.exists():
             return cls()
 
-        with open(config_path, "r") as f:
-            data = yaml.safe_load(f) or {}
+        # Read once: the bytes both key the cache and, on a miss, are parsed
+        yaml_bytes = config_path.read_bytes()
+        data = _read_config_cache(config_path, yaml_bytes)
+        if data is None:
+            # Decode as open() in text mode would
+            text = yaml_bytes.decode(locale.getpreferredencoding(False))
+            data = yaml.load(text, Loader=YamlLoader) or {}
+            _write_config_cache(config_path, yaml_bytes, data)
+
+        # Start from the defaults and overwrite only what the file sets
+        config = cls(_config_path=config_path)
+        for key, value in data.items():
+            if key in _LOADABLE_FIELDS:
+                setattr(config, key, value)
 
         # Parse watch paths
         watch_paths = []
@@ -130,6 +223,7 @@ class Config:
                 watch_paths.append(WatchPath(path=wp))
             elif isinstance(wp, dict):
                 watch_paths.append(WatchPath(**_filter_fields(wp, WatchPath, "watch_paths")))
+        config.watch_paths = watch_paths
 
         # Parse FIM paths
         fim_paths = []
@@ -138,50 +232,21 @@ class Config:
                 fim_paths.append(FIMPath(path=fp))
             elif isinstance(fp, dict):
                 fim_paths.append(FIMPath(**_filter_fields(fp, FIMPath, "fim_paths")))
+        config.fim_paths = fim_paths
 
         # Parse Windows Events config
         windows_events_data = data.get("windows_events", {})
         if isinstance(windows_events_data, dict):
-            windows_events = WindowsEventsConfig(
-                enabled=windows_events_data.get("enabled", False),
-                channels=windows_events_data.get("channels", ["Security", "System", "Application"]),
-                event_ids=windows_events_data.get("event_ids"),
-                poll_interval=windows_events_data.get("poll_interval", 10),
+            config.windows_events = WindowsEventsConfig(
+                **_filter_fields(windows_events_data, WindowsEventsConfig, "windows_events")
             )
-        else:
-            windows_events = WindowsEventsConfig()
-
-        config = cls(
-            server_url=data.get("server_url", "http://localhost:4000"),
-            api_key=data.get("api_key", ""),
-            watch_paths=watch_paths,
-            fim_paths=fim_paths,
-            fim_enabled=data.get("fim_enabled", False),
-            windows_events=windows_events,
-            hostname=data.get("hostname", cls().hostname),
-            batch_size=data.get("batch_size", 100),
-            batch_interval_seconds=data.get("batch_interval_seconds", 5.0),
-            retry_max_attempts=data.get("retry_max_attempts", 5),
-            retry_backoff_seconds=data.get("retry_backoff_seconds", 2.0),
-            start_on_boot=data.get("start_on_boot", False),
-            send_hostname=data.get("send_hostname", True),
-            debug_logging=data.get("debug_logging", False),
-            sound_alerts_enabled=data.get("sound_alerts_enabled", False),
-            sound_critical=data.get("sound_critical", "default"),
-            sound_error=data.get("sound_error", "default"),
-            sound_warning=data.get("sound_warning", "default"),
-            sound_info=data.get("sound_info", "default"),
-            sound_volume=data.get("sound_volume", 100),
-            _config_path=config_path,
-            _wizard_completed=data.get("_wizard_completed", False),
-            _wizard_skipped=data.get("_wizard_skipped", False),
-        )
+
         return config
 
     def save(self, path: Optional[Path] = None) -> None:
         """Save configuration to file."""
         config_path = path or self.get_config_path()
-        config_path.parent.mkdir(parents=True, exist_ok=True)
+        ensure_dir(config_path.parent)
 
         data = {
             "server_url": self.server_url,
@@ -205,6 +270,7 @@ class Config:
                 for fp in self.fim_paths
             ],
             "fim_enabled": self.fim_enabled,
+            "fim_hash_algorithm": self.fim_hash_algorithm,
             "windows_events": {
                 "enabled": self.windows_events.enabled,
                 "channels": self.windows_events.channels,
@@ -216,6 +282,7 @@ class Config:
             "batch_interval_seconds": self.batch_interval_seconds,
             "retry_max_attempts": self.retry_max_attempts,
             "retry_backoff_seconds": self.retry_backoff_seconds,
+            "max_buffered_events": self.max_buffered_events,
             "start_on_boot": self.start_on_boot,
             "send_hostname": self.send_hostname,
             "debug_logging": self.debug_logging,
@@ -230,7 +297,8 @@ class Config:
         }
 
         with open(config_path, "w") as f:
-            yaml.dump(data, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(data, f, Dumper=YamlDumper, default_flow_style=False, sort_keys=False)
+        _write_config_cache(config_path, config_path.read_bytes(), data)
 
     def is_configured(self) -> bool:
         """Check if the agent is properly configured."""
@@ -255,3 +323,11 @@ class Config:
         self._wizard_completed = False
         self._wizard_skipped = False
         self.save()
+
+
+# Plain top-level keys Config.load copies straight from the file. Nested
+# sections are converted separately and _config_path is never read from disk.
+_LOADABLE_FIELDS = frozenset(
+    f.name for f in fields(Config)
+    if f.name not in ("watch_paths", "fim_paths", "windows_events", "_config_path")
+)
@@ -2,15 +2,22 @@
 
 import fnmatch
 import hashlib
-import json
+import itertools
 import logging
+import mmap
 import os
+import queue
+import re
 import sqlite3
 import stat
 import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import cache, lru_cache
 from pathlib import Path
-from typing import Callable, Optional
+from typing import Callable, Iterator, Optional
 from contextlib import contextmanager
 
 from watchdog.observers import Observer
@@ -22,37 +29,267 @@ from watchdog.events import (
     FileMovedEvent,
 )
 
-from .config import Config, FIMPath
-from .buffer import FIMEvent
+try:
+    import blake3
+    HAS_BLAKE3 = True
+except ImportError:
+    HAS_BLAKE3 = False
+
+from .config import Config, FIMPath, ensure_dir
+from .buffer import FIMEvent, _json_dumps, _json_loads, utc_now_iso
 
 logger = logging.getLogger(__name__)
 
+# Page-cache hints are POSIX-only
+HAS_FADVISE = hasattr(os, "posix_fadvise")
 
-def compute_file_hash(file_path: str, algorithm: str = "sha256") -> Optional[str]:
-    """Compute the hash of a file."""
+# Rows per transaction when baselining in bulk
+BASELINE_BATCH_SIZE = 5000
+
+# Maximum number of queued single-file writes folded into one transaction
+WRITE_BATCH_SIZE = 500
+
+# Files modified this recently are never trusted by the mtime/size fast path;
+# 2s covers the coarsest common timestamp granularity (FAT)
+RACY_WINDOW_NS = 2_000_000_000
+
+# Quiet period that coalesces a burst of modify events into one check
+MODIFY_DEBOUNCE_SECONDS = 0.25
+
+# Files at least this large are hashed through a memory map
+MMAP_THRESHOLD = 1024 * 1024
+
+# Threads hashing files while building a baseline
+HASH_WORKERS = min(32, os.cpu_count() or 4)
+
+# Applied to every connection; WAL itself is persistent and set once in _init_db
+BASELINE_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA busy_timeout=10000",
+)
+
+# WITHOUT ROWID keeps each row inside the file_path primary-key b-tree, so an
+# upsert touches one b-tree instead of a rowid table plus its path index
+CREATE_BASELINES_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        file_path TEXT PRIMARY KEY,
+        hash TEXT NOT NULL,
+        metadata TEXT,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        fim_path TEXT
+    ) WITHOUT ROWID
+"""
+
+# Columns every schema version has, for copying rows between tables
+BASELINE_COLUMNS = "file_path, hash, metadata, created_at, updated_at"
+
+UPSERT_BASELINE_SQL = """
+    INSERT INTO baselines (file_path, hash, metadata, created_at, updated_at, fim_path)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(file_path) DO UPDATE SET
+        hash = excluded.hash,
+        metadata = excluded.metadata,
+        updated_at = excluded.updated_at,
+        fim_path = COALESCE(excluded.fim_path, baselines.fim_path)
+"""
+
+
+def hash_backend(algorithm: str = "sha256") -> str:
+    """Describe which implementation hashlib uses for ``algorithm``.
+
+    hashlib.new prefers OpenSSL's EVP digests, which use SHA-NI and similar CPU
+    extensions when present; the builtin fallbacks are plain software.
+    """
+    if algorithm == "blake3":
+        return "blake3" if HAS_BLAKE3 else "unavailable"
     try:
         hasher = hashlib.new(algorithm)
+    except ValueError:
+        return "unavailable"
+    if type(hasher).__module__ == "_hashlib":
+        import ssl
+        return ssl.OPENSSL_VERSION
+    return "builtin"
+
+
+@cache
+def _warn_algorithm_unavailable(algorithm: str) -> None:
+    """Log, once per algorithm, that hashes of this kind cannot be computed."""
+    logger.warning(
+        f"FIM hash algorithm {algorithm!r} is unavailable "
+        f"(for blake3: pip install lognog-in[speedups]); "
+        f"baselines taken with it are re-baselined instead of verified"
+    )
+
+
+def hash_file_with_stat(
+    file_path: str, algorithm: str = "sha256"
+) -> tuple[Optional[str], Optional[os.stat_result]]:
+    """Hash a file and stat it through the same open, so callers need no second stat."""
+    try:
+        if algorithm == "blake3":
+            if not HAS_BLAKE3:
+                _warn_algorithm_unavailable(algorithm)
+                return None, None
+            # Multithreaded, memory-mapped BLAKE3 (optional dependency)
+            stat_info = os.stat(file_path)
+            hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+            hasher.update_mmap(file_path)
+            return f"blake3:{hasher.hexdigest()}", stat_info
+
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(65536), b""):
-                hasher.update(chunk)
-        return f"{algorithm}:{hasher.hexdigest()}"
+            stat_info = os.fstat(f.fileno())
+            if HAS_FADVISE:
+                # Files are read front to back: ask for a larger readahead window
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            if stat_info.st_size >= MMAP_THRESHOLD:
+                # Hash straight from the page cache, without copying into Python bytes
+                hasher = hashlib.new(algorithm)
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    hasher.update(mapped)
+            elif hasattr(hashlib, "file_digest") and algorithm in hashlib.algorithms_guaranteed:
+                # Python 3.11+: the read/update loop runs in C over one reused buffer
+                hasher = hashlib.file_digest(f, algorithm)
+            else:
+                hasher = hashlib.new(algorithm)
+                for chunk in iter(lambda: f.read(65536), b""):
+                    hasher.update(chunk)
+        return f"{algorithm}:{hasher.hexdigest()}", stat_info
     except Exception as e:
         logger.error(f"Error hashing file {file_path}: {e}")
-        return None
+        return None, None
+
+
+def compute_file_hash(file_path: str, algorithm: str = "sha256") -> Optional[str]:
+    """Compute the hash of a file."""
+    return hash_file_with_stat(file_path, algorithm)[0]
+
+
+def hash_algorithm_of(file_hash: Optional[str]) -> Optional[str]:
+    """Return the algorithm prefix of an "algorithm:hex" hash string."""
+    return file_hash.split(":", 1)[0] if file_hash else None
+
+
+def baseline_still_matches(file_path: str, baseline_hash: str, current_hash: str) -> bool:
+    """Check whether a file whose hash differs from its baseline is unchanged.
+
+    This happens when the baseline was taken with another algorithm (e.g.
+    before fim_hash_algorithm was switched); the file is re-hashed with the
+    baseline's algorithm to compare like with like. If that algorithm cannot
+    be computed here (blake3 baselines after the package was removed), the
+    file is trusted and re-baselined rather than reported as modified.
+    """
+    algorithm = hash_algorithm_of(baseline_hash)
+    if algorithm == hash_algorithm_of(current_hash):
+        return False
+    if hash_backend(algorithm) == "unavailable":
+        _warn_algorithm_unavailable(algorithm)
+        return True
+    return compute_file_hash(file_path, algorithm) == baseline_hash
+
+
+def compile_pattern(pattern: str) -> re.Pattern:
+    """Compile a filename glob once, with the same case rules as fnmatch.fnmatch."""
+    return re.compile(fnmatch.translate(os.path.normcase(pattern)))
+
+
+def _iter_matching_files(root: str, pattern_re: re.Pattern, recursive: bool) -> Iterator[str]:
+    """Yield paths of regular files under ``root`` whose name matches ``pattern_re``.
+
+    Walks with os.scandir, whose entries answer is_file()/is_dir() from the
+    directory listing itself on most platforms. Like Path.rglob, symlinked
+    directories are not descended into and unreadable directories are skipped.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file():
+                            if pattern_re.match(os.path.normcase(entry.name)):
+                                yield entry.path
+                        elif recursive and entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                    except OSError:
+                        continue
+        except OSError as e:
+            logger.debug(f"FIM: cannot scan {directory}: {e}")
+
+
+@lru_cache(maxsize=1024)
+def _local_isoformat(timestamp: float) -> str:
+    """Format a stat timestamp; a file's mtime/ctime repeat across events."""
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+def metadata_from_stat(stat_info: os.stat_result) -> dict:
+    """Build file metadata from an existing stat result.
+
+    ``mtime_ns`` and ``ctime_ns`` are only recorded once the mtime is older
+    than RACY_WINDOW_NS: a write landing in the same timestamp tick as the
+    stat would leave size and mtime unchanged, so such "racy" files are
+    always re-hashed (the same rule git applies to its index).
+    """
+    metadata = {
+        "size": stat_info.st_size,
+        "mode": oct(stat_info.st_mode),
+        "uid": stat_info.st_uid,
+        "gid": stat_info.st_gid,
+        "mtime": _local_isoformat(stat_info.st_mtime),
+        "ctime": _local_isoformat(stat_info.st_ctime),
+    }
+    if time.time_ns() - stat_info.st_mtime_ns >= RACY_WINDOW_NS:
+        metadata["mtime_ns"] = stat_info.st_mtime_ns
+        metadata["ctime_ns"] = stat_info.st_ctime_ns
+    return metadata
+
+
+def stat_matches_baseline(stat_info: os.stat_result, baseline_metadata: dict) -> bool:
+    """Check whether size, mtime and ctime prove a file unchanged since its baseline.
+
+    The mtime can be set back with utime() after a write; the ctime cannot,
+    so a same-size edit that restores the mtime is still caught.
+    """
+    mtime_ns = baseline_metadata.get("mtime_ns")
+    ctime_ns = baseline_metadata.get("ctime_ns")
+    return (
+        mtime_ns is not None
+        and ctime_ns is not None
+        and stat_info.st_mtime_ns == mtime_ns
+        and stat_info.st_ctime_ns == ctime_ns
+        and stat_info.st_size == baseline_metadata.get("size")
+    )
+
+
+class _ThreadConnection:
+    """A thread's cached connection; its finalizer runs when the thread exits."""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _release_connection(
+    connections: dict[int, sqlite3.Connection], lock: threading.Lock, key: int
+) -> None:
+    """Close a cached connection whose thread has exited, unless close() already did."""
+    with lock:
+        conn = connections.pop(key, None)
+    if conn is not None:
+        conn.close()
 
 
 def get_file_metadata(file_path: str) -> dict:
     """Get file metadata (owner, permissions, etc.)."""
     try:
-        stat_info = os.stat(file_path)
-        return {
-            "size": stat_info.st_size,
-            "mode": oct(stat_info.st_mode),
-            "uid": stat_info.st_uid,
-            "gid": stat_info.st_gid,
-            "mtime": datetime.fromtimestamp(stat_info.st_mtime).isoformat(),
-            "ctime": datetime.fromtimestamp(stat_info.st_ctime).isoformat(),
-        }
+        return metadata_from_stat(os.stat(file_path))
     except Exception as e:
         logger.error(f"Error getting metadata for {file_path}: {e}")
         return {}
@@ -63,85 +300,303 @@ class BaselineDatabase:
 
     def __init__(self, db_path: Optional[Path] = None):
         self.db_path = db_path or (Config.get_data_dir() / "baseline.db")
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        ensure_dir(self.db_path.parent)
         self._lock = threading.Lock()
+        # One cached connection per thread, held in thread-local storage so
+        # it is closed when its thread exits; _connections tracks the open
+        # ones for close()
+        self._local = threading.local()
+        self._connections: dict[int, sqlite3.Connection] = {}
+        self._connections_lock = threading.Lock()
+        self._connection_keys = itertools.count()
         self._init_db()
 
+        # Write-behind state: single-file writes are queued for a writer thread
+        # and stay visible to readers in _pending until committed. A pending
+        # entry is (hash, metadata), or None for a removal.
+        self._write_queue: queue.Queue = queue.Queue()
+        self._pending: dict[str, Optional[tuple[str, dict]]] = {}
+        self._pending_lock = threading.Lock()
+        self._writer_thread: Optional[threading.Thread] = None
+
     def _init_db(self) -> None:
         """Initialize the database."""
         with self._get_connection() as conn:
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS baselines (
-                    file_path TEXT PRIMARY KEY,
-                    hash TEXT NOT NULL,
-                    metadata TEXT,
-                    created_at TEXT NOT NULL,
-                    updated_at TEXT NOT NULL
-                )
-            """)
-            conn.commit()
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(CREATE_BASELINES_SQL.format(table="baselines"))
+
+            # Rebuild tables created by older versions as rowid tables
+            row = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'baselines'"
+            ).fetchone()
+            if "WITHOUT ROWID" not in row["sql"].upper():
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.execute(CREATE_BASELINES_SQL.format(table="baselines_new"))
+                    conn.execute(
+                        f"INSERT INTO baselines_new ({BASELINE_COLUMNS}) "
+                        f"SELECT {BASELINE_COLUMNS} FROM baselines"
+                    )
+                    conn.execute("DROP TABLE baselines")
+                    conn.execute("ALTER TABLE baselines_new RENAME TO baselines")
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+
+            # Rows record the FIM path that owns them, so one tree can be verified alone
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(baselines)")}
+            if "fim_path" not in columns:
+                conn.execute("ALTER TABLE baselines ADD COLUMN fim_path TEXT")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS ix_baselines_fim_path ON baselines(fim_path)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a tuned database connection."""
+        conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=10.0,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        for pragma in BASELINE_PRAGMAS:
+            conn.execute(pragma)
+        return conn
 
     @contextmanager
     def _get_connection(self):
-        """Get a database connection."""
-        conn = sqlite3.connect(str(self.db_path), timeout=10.0)
-        conn.row_factory = sqlite3.Row
-        try:
-            yield conn
-        finally:
+        """Get the calling thread's database connection.
+
+        Connections are opened lazily, reused until close(), and run in
+        autocommit mode; multi-row writes wrap themselves in an explicit
+        BEGIN IMMEDIATE/COMMIT. A short-lived thread (such as a debounce
+        timer) does not leak its connection: it is closed when the thread
+        exits and its thread-local holder is released.
+        """
+        local = self._local
+        holder = getattr(local, "holder", None)
+        if holder is None:
+            holder = _ThreadConnection(self._connect())
+            key = next(self._connection_keys)
+            with self._connections_lock:
+                self._connections[key] = holder.conn
+            # The finalizer must not reference self, or it would keep the database alive
+            weakref.finalize(
+                holder, _release_connection, self._connections, self._connections_lock, key
+            )
+            local.holder = holder
+        yield holder.conn
+
+    def _enqueue(
+        self,
+        file_path: str,
+        entry: Optional[tuple[str, dict]],
+        fim_path: Optional[str] = None,
+    ) -> None:
+        """Queue a single-file write for the writer thread."""
+        # Encode here so the writer holds the SQLite write lock only for SQL
+        data = _json_dumps(entry[1]) if entry is not None else None
+        with self._pending_lock:
+            self._pending[file_path] = entry
+            if self._writer_thread is None or not self._writer_thread.is_alive():
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop, name="lognog-fim-writer", daemon=True
+                )
+                self._writer_thread.start()
+            self._write_queue.put((file_path, entry, fim_path, data))
+
+    def _write_pending(
+        self,
+        items: list[tuple[str, Optional[tuple[str, dict]], Optional[str], Optional[bytes]]],
+    ) -> None:
+        """Commit a batch of queued writes in one transaction."""
+        # Only the last write per path matters, so upserts and deletes never overlap
+        latest = {item[0]: item[1:] for item in items}
+        now = utc_now_iso()
+        upserts = [
+            (file_path, entry[0], data, now, now, fim_path)
+            for file_path, (entry, fim_path, data) in latest.items()
+            if entry is not None
+        ]
+        deletes = [(file_path,) for file_path, (entry, _, _) in latest.items() if entry is None]
+        with self._lock:
+            with self._get_connection() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany(UPSERT_BASELINE_SQL, upserts)
+                    conn.executemany("DELETE FROM baselines WHERE file_path = ?", deletes)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+
+        with self._pending_lock:
+            for file_path, (entry, _, _) in latest.items():
+                # Keep entries that were superseded while this batch was written
+                if self._pending.get(file_path, False) is entry:
+                    del self._pending[file_path]
+
+    def _writer_loop(self) -> None:
+        """Drain the write queue, committing up to WRITE_BATCH_SIZE writes at a time."""
+        while True:
+            item = self._write_queue.get()
+            items = []
+            stop = item is None
+            if not stop:
+                items.append(item)
+                while len(items) < WRITE_BATCH_SIZE:
+                    try:
+                        item = self._write_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    items.append(item)
+
+            try:
+                if items:
+                    self._write_pending(items)
+            except Exception as e:
+                logger.error(f"Failed to write {len(items)} FIM baseline update(s): {e}")
+            finally:
+                for _ in range(len(items) + stop):
+                    self._write_queue.task_done()
+
+            if stop:
+                return
+
+    def flush(self) -> None:
+        """Block until every queued baseline write has been committed."""
+        writer = self._writer_thread
+        if writer is not None and writer.is_alive():
+            self._write_queue.join()
+
+    def close(self) -> None:
+        """Flush queued writes and close every cached connection.
+
+        The writer thread and connections are recreated lazily if the
+        database is used again.
+        """
+        with self._pending_lock:
+            writer = self._writer_thread
+            self._writer_thread = None
+            if writer is not None and writer.is_alive():
+                self._write_queue.put(None)
+        if writer is not None:
+            writer.join()
+
+        # Drop every thread's holder so each reconnects on next use; this may
+        # run finalizers, which take _connections_lock themselves
+        self._local = threading.local()
+        with self._connections_lock:
+            connections = list(self._connections.values())
+            self._connections.clear()
+        for conn in connections:
             conn.close()
 
     def get_baseline(self, file_path: str) -> Optional[tuple[str, dict]]:
-        """Get the baseline hash and metadata for a file."""
+        """Get the baseline hash and metadata for a file.
+
+        Reads take no lock: WAL lets them run alongside the writer.
+        """
+        with self._pending_lock:
+            if file_path in self._pending:
+                return self._pending[file_path]
         with self._get_connection() as conn:
             row = conn.execute(
                 "SELECT hash, metadata FROM baselines WHERE file_path = ?",
                 (file_path,)
             ).fetchone()
             if row:
-                return row["hash"], json.loads(row["metadata"] or "{}")
+                return row["hash"], _json_loads(row["metadata"] or b"{}")
             return None
 
-    def set_baseline(self, file_path: str, file_hash: str, metadata: dict) -> None:
-        """Set or update the baseline for a file."""
-        now = datetime.utcnow().isoformat()
+    def set_baseline(
+        self,
+        file_path: str,
+        file_hash: str,
+        metadata: dict,
+        fim_path: Optional[str] = None,
+    ) -> None:
+        """Set or update the baseline for a file.
+
+        The write is queued and committed in the background; get_baseline
+        sees it immediately. ``fim_path`` records the watched path the file
+        belongs to; when omitted an existing row keeps its owner.
+        """
+        self._enqueue(file_path, (file_hash, metadata), fim_path)
+
+    def set_baselines_bulk(
+        self,
+        baselines: list[tuple[str, str, dict]],
+        fim_path: Optional[str] = None,
+    ) -> None:
+        """Set or update many (file_path, hash, metadata) baselines in one transaction."""
+        if not baselines:
+            return
+        self.flush()
+        now = utc_now_iso()
+        rows = [
+            (file_path, file_hash, _json_dumps(metadata), now, now, fim_path)
+            for file_path, file_hash, metadata in baselines
+        ]
         with self._lock:
             with self._get_connection() as conn:
-                conn.execute(
-                    """
-                    INSERT INTO baselines (file_path, hash, metadata, created_at, updated_at)
-                    VALUES (?, ?, ?, ?, ?)
-                    ON CONFLICT(file_path) DO UPDATE SET
-                        hash = excluded.hash,
-                        metadata = excluded.metadata,
-                        updated_at = excluded.updated_at
-                    """,
-                    (file_path, file_hash, json.dumps(metadata), now, now)
-                )
-                conn.commit()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany(UPSERT_BASELINE_SQL, rows)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
 
     def remove_baseline(self, file_path: str) -> None:
-        """Remove the baseline for a file."""
+        """Remove the baseline for a file (queued like set_baseline)."""
+        self._enqueue(file_path, None)
+
+    def remove_baselines_bulk(self, file_paths: list[str]) -> None:
+        """Remove the baselines for many files in one transaction."""
+        if not file_paths:
+            return
+        self.flush()
         with self._lock:
             with self._get_connection() as conn:
-                conn.execute("DELETE FROM baselines WHERE file_path = ?", (file_path,))
-                conn.commit()
-
-    def get_all_baselines(self) -> list[tuple[str, str, dict]]:
-        """Get all baselines."""
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    conn.executemany(
+                        "DELETE FROM baselines WHERE file_path = ?",
+                        [(file_path,) for file_path in file_paths],
+                    )
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+
+    def get_all_baselines(self, fim_path: Optional[str] = None) -> list[tuple[str, str, dict]]:
+        """Get all baselines, or only those belonging to one FIM path."""
+        self.flush()
         with self._get_connection() as conn:
-            rows = conn.execute("SELECT file_path, hash, metadata FROM baselines").fetchall()
+            if fim_path is None:
+                rows = conn.execute("SELECT file_path, hash, metadata FROM baselines").fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT file_path, hash, metadata FROM baselines WHERE fim_path = ?",
+                    (fim_path,)
+                ).fetchall()
             return [
-                (row["file_path"], row["hash"], json.loads(row["metadata"] or "{}"))
+                (row["file_path"], row["hash"], _json_loads(row["metadata"] or b"{}"))
                 for row in rows
             ]
 
     def clear(self) -> None:
         """Clear all baselines."""
+        self.flush()
         with self._lock:
             with self._get_connection() as conn:
                 conn.execute("DELETE FROM baselines")
-                conn.commit()
 
 
 class FIMHandler(FileSystemEventHandler):
@@ -153,17 +608,27 @@ class FIMHandler(FileSystemEventHandler):
         hostname: str,
         baseline_db: BaselineDatabase,
         on_event: Callable[[FIMEvent], None],
+        hash_algorithm: str = "sha256",
     ):
         self.fim_path = fim_path
         self.hostname = hostname
         self.baseline_db = baseline_db
         self.on_event = on_event
-        self._lock = threading.Lock()
+        self.hash_algorithm = hash_algorithm
+        self._pattern_re = compile_pattern(fim_path.pattern)
+        # Event fields that are the same for every event from this handler
+        self._base_meta = {"fim_path": fim_path.path, "pattern": fim_path.pattern}
+        self._source_kwargs = {"hostname": hostname, "source": "lognog-in", "source_type": "fim"}
+        # Modify-check deadlines (time.monotonic()) by path, in deadline order,
+        # served by one long-lived scheduler thread that reuses its connection
+        self._deadlines: dict[str, float] = {}
+        self._deadlines_cond = threading.Condition()
+        self._scheduler: Optional[threading.Thread] = None
 
     def _matches_pattern(self, file_path: str) -> bool:
         """Check if the file matches the FIM pattern."""
-        filename = os.path.basename(file_path)
-        return fnmatch.fnmatch(filename, self.fim_path.pattern)
+        filename = os.path.normcase(os.path.basename(file_path))
+        return self._pattern_re.match(filename) is not None
 
     def _create_event(
         self,
@@ -171,26 +636,26 @@ class FIMHandler(FileSystemEventHandler):
         file_path: str,
         previous_hash: Optional[str] = None,
         current_hash: Optional[str] = None,
+        metadata: Optional[dict] = None,
     ) -> FIMEvent:
-        """Create a FIM event."""
-        metadata = get_file_metadata(file_path) if os.path.exists(file_path) else {}
-
-        return FIMEvent(
-            timestamp=datetime.utcnow().isoformat() + "Z",
-            hostname=self.hostname,
-            source="lognog-in",
-            source_type="fim",
+        """Create a FIM event.
+
+        Handlers pass the metadata they already collected; it is only looked
+        up here when omitted.
+        """
+        if metadata is None:
+            metadata = get_file_metadata(file_path) if os.path.exists(file_path) else {}
+
+        return FIMEvent.acquire(
+            timestamp=utc_now_iso() + "Z",
+            **self._source_kwargs,
             event_type=event_type,
             file_path=file_path,
             previous_hash=previous_hash,
             current_hash=current_hash,
             file_owner=str(metadata.get("uid", "")),
             file_permissions=metadata.get("mode", ""),
-            metadata={
-                "fim_path": self.fim_path.path,
-                "pattern": self.fim_path.pattern,
-                **metadata,
-            },
+            metadata={**self._base_meta, **metadata},
         )
 
     def on_created(self, event: FileCreatedEvent) -> None:
@@ -202,46 +667,125 @@ class FIMHandler(FileSystemEventHandler):
 
         logger.info(f"FIM: File created: {event.src_path}")
 
-        current_hash = compute_file_hash(event.src_path)
+        current_hash, stat_info = hash_file_with_stat(event.src_path, self.hash_algorithm)
         if current_hash:
-            metadata = get_file_metadata(event.src_path)
-            self.baseline_db.set_baseline(event.src_path, current_hash, metadata)
+            metadata = metadata_from_stat(stat_info)
+            self.baseline_db.set_baseline(
+                event.src_path, current_hash, metadata, self.fim_path.path
+            )
 
             fim_event = self._create_event(
                 event_type="created",
                 file_path=event.src_path,
                 current_hash=current_hash,
+                metadata=metadata,
             )
             self.on_event(fim_event)
 
     def on_modified(self, event: FileModifiedEvent) -> None:
-        """Handle file modification."""
+        """Handle file modification.
+
+        Editors and log writers emit bursts of modify events; each one pushes
+        the path's check back to MODIFY_DEBOUNCE_SECONDS after it, so a file
+        is hashed once, after the last write of the burst.
+        """
         if event.is_directory:
             return
         if not self._matches_pattern(event.src_path):
             return
 
-        baseline = self.baseline_db.get_baseline(event.src_path)
+        with self._deadlines_cond:
+            # Re-insert so the dict stays ordered by deadline
+            self._deadlines.pop(event.src_path, None)
+            self._deadlines[event.src_path] = time.monotonic() + MODIFY_DEBOUNCE_SECONDS
+            if self._scheduler is None or not self._scheduler.is_alive():
+                self._scheduler = threading.Thread(
+                    target=self._scheduler_loop, name="lognog-fim-modify", daemon=True
+                )
+                self._scheduler.start()
+            self._deadlines_cond.notify()
+
+    def _scheduler_loop(self) -> None:
+        """Run each path's modify check once its deadline passes."""
+        while True:
+            with self._deadlines_cond:
+                while True:
+                    # cancel_pending() retires this thread by replacing it
+                    if self._scheduler is not threading.current_thread():
+                        return
+                    if self._deadlines:
+                        file_path, deadline = next(iter(self._deadlines.items()))
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            del self._deadlines[file_path]
+                            break
+                        self._deadlines_cond.wait(remaining)
+                    else:
+                        self._deadlines_cond.wait()
+
+            try:
+                self._handle_modified(file_path)
+            except Exception as e:
+                logger.error(f"FIM: error checking {file_path}: {e}", exc_info=True)
+
+    def _cancel_pending(self, file_path: str) -> None:
+        """Drop a scheduled modify check for a path that went away."""
+        with self._deadlines_cond:
+            self._deadlines.pop(file_path, None)
+
+    def cancel_pending(self) -> None:
+        """Cancel all scheduled modify checks and stop the scheduler thread.
+
+        The scheduler is restarted by the next modify event.
+        """
+        with self._deadlines_cond:
+            self._deadlines.clear()
+            scheduler = self._scheduler
+            self._scheduler = None
+            self._deadlines_cond.notify()
+        if scheduler is not None:
+            scheduler.join(timeout=5.0)
+
+    def _handle_modified(self, file_path: str) -> None:
+        """Check a modified file once its burst of events has settled."""
+        baseline = self.baseline_db.get_baseline(file_path)
         previous_hash = baseline[0] if baseline else None
 
-        current_hash = compute_file_hash(event.src_path)
+        # Watchdog fires spuriously; skip hashing when size and times are unchanged
+        if baseline:
+            try:
+                if stat_matches_baseline(os.stat(file_path), baseline[1]):
+                    return
+            except OSError:
+                return
+
+        current_hash, stat_info = hash_file_with_stat(file_path, self.hash_algorithm)
         if not current_hash:
             return
+        metadata = metadata_from_stat(stat_info)
 
         # Only report if hash actually changed
         if previous_hash and previous_hash == current_hash:
+            if "ctime_ns" in metadata and "ctime_ns" not in baseline[1]:
+                # Record the times so later checks can take the fast path
+                self.baseline_db.set_baseline(file_path, current_hash, metadata, self.fim_path.path)
             return
 
-        logger.info(f"FIM: File modified: {event.src_path}")
+        if previous_hash and baseline_still_matches(file_path, previous_hash, current_hash):
+            # Unchanged, but baselined with another algorithm: migrate it
+            self.baseline_db.set_baseline(file_path, current_hash, metadata, self.fim_path.path)
+            return
 
-        metadata = get_file_metadata(event.src_path)
-        self.baseline_db.set_baseline(event.src_path, current_hash, metadata)
+        logger.info(f"FIM: File modified: {file_path}")
+
+        self.baseline_db.set_baseline(file_path, current_hash, metadata, self.fim_path.path)
 
         fim_event = self._create_event(
             event_type="modified",
-            file_path=event.src_path,
+            file_path=file_path,
             previous_hash=previous_hash,
             current_hash=current_hash,
+            metadata=metadata,
         )
         self.on_event(fim_event)
 
@@ -253,6 +797,7 @@ class FIMHandler(FileSystemEventHandler):
             return
 
         logger.info(f"FIM: File deleted: {event.src_path}")
+        self._cancel_pending(event.src_path)
 
         baseline = self.baseline_db.get_baseline(event.src_path)
         previous_hash = baseline[0] if baseline else None
@@ -263,6 +808,7 @@ class FIMHandler(FileSystemEventHandler):
             event_type="deleted",
             file_path=event.src_path,
             previous_hash=previous_hash,
+            metadata={},
         )
         self.on_event(fim_event)
 
@@ -273,6 +819,7 @@ class FIMHandler(FileSystemEventHandler):
 
         # Handle as delete + create
         if self._matches_pattern(event.src_path):
+            self._cancel_pending(event.src_path)
             baseline = self.baseline_db.get_baseline(event.src_path)
             if baseline:
                 self.baseline_db.remove_baseline(event.src_path)
@@ -280,18 +827,22 @@ class FIMHandler(FileSystemEventHandler):
                     event_type="deleted",
                     file_path=event.src_path,
                     previous_hash=baseline[0],
+                    metadata={},
                 )
                 self.on_event(fim_event)
 
         if self._matches_pattern(event.dest_path):
-            current_hash = compute_file_hash(event.dest_path)
+            current_hash, stat_info = hash_file_with_stat(event.dest_path, self.hash_algorithm)
             if current_hash:
-                metadata = get_file_metadata(event.dest_path)
-                self.baseline_db.set_baseline(event.dest_path, current_hash, metadata)
+                metadata = metadata_from_stat(stat_info)
+                self.baseline_db.set_baseline(
+                    event.dest_path, current_hash, metadata, self.fim_path.path
+                )
                 fim_event = self._create_event(
                     event_type="created",
                     file_path=event.dest_path,
                     current_hash=current_hash,
+                    metadata=metadata,
                 )
                 self.on_event(fim_event)
 
@@ -311,6 +862,22 @@ class FileIntegrityMonitor:
         self._handlers: list[FIMHandler] = []
         self._running = False
 
+        self.hash_algorithm = config.fim_hash_algorithm
+        if hash_backend(self.hash_algorithm) == "unavailable":
+            logger.warning(
+                f"FIM hash algorithm {self.hash_algorithm!r} is unavailable "
+                f"(for blake3: pip install lognog-in[speedups]); using sha256"
+            )
+            self.hash_algorithm = "sha256"
+        logger.info(f"FIM hashing {self.hash_algorithm} via {hash_backend(self.hash_algorithm)}")
+
+    def _baseline_entry(self, file_path: str) -> Optional[tuple[str, str, dict]]:
+        """Hash one file for the baseline; None if it cannot be read."""
+        file_hash, stat_info = hash_file_with_stat(file_path, self.hash_algorithm)
+        if not file_hash:
+            return None
+        return file_path, file_hash, metadata_from_stat(stat_info)
+
     def build_baseline(self) -> int:
         """
         Build initial baseline for all monitored paths.
@@ -319,35 +886,39 @@ class FileIntegrityMonitor:
         """
         count = 0
 
-        for fim_path in self.config.fim_paths:
-            if not fim_path.enabled:
-                continue
-
-            path = Path(fim_path.path)
-
-            if not path.exists():
-                logger.warning(f"FIM path does not exist: {path}")
-                continue
+        # Hash in parallel: file reads and hashlib/blake3 digests release the GIL
+        with ThreadPoolExecutor(
+            max_workers=HASH_WORKERS, thread_name_prefix="fim-hash"
+        ) as pool:
+            for fim_path in self.config.fim_paths:
+                if not fim_path.enabled:
+                    continue
 
-            # Find all matching files
-            if path.is_file():
-                files = [path]
-            else:
-                pattern = fim_path.pattern
-                if fim_path.recursive:
-                    files = list(path.rglob(pattern))
-                else:
-                    files = list(path.glob(pattern))
+                path = Path(fim_path.path)
 
-            for file_path in files:
-                if not file_path.is_file():
+                if not path.exists():
+                    logger.warning(f"FIM path does not exist: {path}")
                     continue
 
-                file_hash = compute_file_hash(str(file_path))
-                if file_hash:
-                    metadata = get_file_metadata(str(file_path))
-                    self.baseline_db.set_baseline(str(file_path), file_hash, metadata)
-                    count += 1
+                # Find all matching files
+                if path.is_file():
+                    files = iter([str(path)])
+                else:
+                    files = _iter_matching_files(
+                        str(path), compile_pattern(fim_path.pattern), fim_path.recursive
+                    )
+
+                # pool.map submits its whole input up front, so feed it one
+                # window at a time; a huge tree never has every path queued
+                while window := list(itertools.islice(files, BASELINE_BATCH_SIZE)):
+                    pending = [
+                        entry
+                        for entry in pool.map(self._baseline_entry, window)
+                        if entry is not None
+                    ]
+                    count += len(pending)
+                    # One commit per window instead of one per file
+                    self.baseline_db.set_baselines_bulk(pending, fim_path.path)
 
         logger.info(f"FIM baseline built: {count} files")
         return count
@@ -383,6 +954,7 @@ class FileIntegrityMonitor:
                 hostname=self.config.hostname,
                 baseline_db=self.baseline_db,
                 on_event=self.on_event,
+                hash_algorithm=self.hash_algorithm,
             )
             self._handlers.append(handler)
 
@@ -407,7 +979,10 @@ class FileIntegrityMonitor:
             self._observer.join(timeout=5.0)
             self._observer = None
 
+        for handler in self._handlers:
+            handler.cancel_pending()
         self._handlers.clear()
+        self.baseline_db.close()
         self._running = False
         logger.info("File Integrity Monitor stopped")
 
@@ -415,19 +990,28 @@ class FileIntegrityMonitor:
         """Check if monitoring is running."""
         return self._running
 
-    def verify_baseline(self) -> list[FIMEvent]:
+    def verify_baseline(self, fim_path: Optional[str] = None) -> list[FIMEvent]:
         """
         Verify all baselined files against current state.
 
-        Returns list of FIM events for any changes detected.
+        With ``fim_path``, only files baselined under that watched path are
+        checked. Returns list of FIM events for any changes detected.
         """
         events = []
+        timestamp = utc_now_iso() + "Z"
+        deleted_paths: list[str] = []
+        updated: list[tuple[str, str, dict]] = []
 
-        for file_path, baseline_hash, baseline_metadata in self.baseline_db.get_all_baselines():
-            if not os.path.exists(file_path):
+        for file_path, baseline_hash, baseline_metadata in self.baseline_db.get_all_baselines(fim_path):
+            try:
+                file_stat = os.stat(file_path)
+            except OSError:
+                file_stat = None
+
+            if file_stat is None:
                 # File was deleted
-                event = FIMEvent(
-                    timestamp=datetime.utcnow().isoformat() + "Z",
+                event = FIMEvent.acquire(
+                    timestamp=timestamp,
                     hostname=self.config.hostname,
                     source="lognog-in",
                     source_type="fim",
@@ -440,15 +1024,29 @@ class FileIntegrityMonitor:
                     metadata={"verification": True},
                 )
                 events.append(event)
-                self.baseline_db.remove_baseline(file_path)
+                deleted_paths.append(file_path)
                 continue
 
-            current_hash = compute_file_hash(file_path)
-            if current_hash and current_hash != baseline_hash:
+            # Unchanged size and times: no need to read the file
+            if stat_matches_baseline(file_stat, baseline_metadata):
+                continue
+
+            current_hash, stat_info = hash_file_with_stat(file_path, self.hash_algorithm)
+            if current_hash == baseline_hash:
+                metadata = metadata_from_stat(stat_info)
+                if "ctime_ns" in metadata and "ctime_ns" not in baseline_metadata:
+                    # Record the times so later checks can take the fast path
+                    updated.append((file_path, current_hash, metadata))
+            elif current_hash:
+                metadata = metadata_from_stat(stat_info)
+                if baseline_still_matches(file_path, baseline_hash, current_hash):
+                    # Unchanged, but baselined with another algorithm: migrate it
+                    updated.append((file_path, current_hash, metadata))
+                    continue
+
                 # File was modified
-                metadata = get_file_metadata(file_path)
-                event = FIMEvent(
-                    timestamp=datetime.utcnow().isoformat() + "Z",
+                event = FIMEvent.acquire(
+                    timestamp=timestamp,
                     hostname=self.config.hostname,
                     source="lognog-in",
                     source_type="fim",
@@ -461,6 +1059,9 @@ class FileIntegrityMonitor:
                     metadata={"verification": True, **metadata},
                 )
                 events.append(event)
-                self.baseline_db.set_baseline(file_path, current_hash, metadata)
+                updated.append((file_path, current_hash, metadata))
 
+        # Apply all baseline changes in two transactions rather than one per file
+        self.baseline_db.remove_baselines_bulk(deleted_paths)
+        self.baseline_db.set_baselines_bulk(updated)
         return events
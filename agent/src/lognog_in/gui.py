@@ -4,61 +4,336 @@ import logging
 import sys
 import threading
 import tkinter as tk
+import weakref
+from datetime import datetime
+from functools import cache, lru_cache, partial
 from tkinter import ttk, messagebox, filedialog
+from tkinter import font as tkfont
 from pathlib import Path
-from typing import Optional, Callable
+from typing import TYPE_CHECKING, Optional, Callable
 
-from .config import Config, WatchPath, FIMPath
+from .config import Config, WatchPath, FIMPath, ensure_dir
+
+# Pillow is optional and imported lazily by _get_pil
+if TYPE_CHECKING:
+    from PIL import ImageTk
 
 logger = logging.getLogger(__name__)
 
+# One hidden Tk root, owned by a dedicated UI thread, hosts every window in
+# this module and the alert panel as a Toplevel; creating a Tk() per window
+# re-initialized Tcl/Tk each time and ran several interpreters from different
+# threads.
+_root: Optional[tk.Tk] = None
+_root_ready = threading.Event()
+_root_lock = threading.Lock()
+_root_thread: Optional[threading.Thread] = None
+
+
+def _run_root() -> None:
+    """Create the shared root and run its event loop (UI thread)."""
+    global _root
+    root = tk.Tk()
+    root.withdraw()
+    _root = root
+    _root_ready.set()
+    # Before mainloop, so no window can be built ahead of its styles
+    _configure_styles()
+    root.mainloop()
+
+
+def get_ui_root() -> tk.Tk:
+    """Return the shared hidden root, starting the UI thread on first use."""
+    global _root_thread
+    with _root_lock:
+        if _root_thread is None:
+            _root_thread = threading.Thread(target=_run_root, name="lognog-ui", daemon=True)
+            _root_thread.start()
+    _root_ready.wait()
+    return _root
+
+
+def run_on_ui_thread(func: Callable[..., object], *args) -> None:
+    """Schedule ``func(*args)`` on the UI thread."""
+    get_ui_root().after(0, func, *args)
+
 
+@lru_cache(maxsize=1)
+def _screen_size() -> tuple[int, int]:
+    """Return the screen size, queried from Tk once per process."""
+    root = get_ui_root()
+    return root.winfo_screenwidth(), root.winfo_screenheight()
+
+
+def _centered_geometry(size: str) -> str:
+    """Return a ``WxH+X+Y`` geometry that centers a ``WxH`` window on screen.
+
+    Working from the requested size avoids realizing the window first just
+    to measure it.
+    """
+    width, height = (int(n) for n in size.split("x"))
+    screen_width, screen_height = _screen_size()
+    return f"{size}+{(screen_width - width) // 2}+{(screen_height - height) // 2}"
+
+
+# Assets directory (handles PyInstaller bundling); fixed for the process
+if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
+    ASSETS_DIR = Path(sys._MEIPASS) / "assets"
+else:
+    ASSETS_DIR = Path(__file__).parent.parent.parent / "assets"
+
+
+@lru_cache(maxsize=32)
 def get_asset_path(filename: str) -> Optional[Path]:
-    """Get path to an asset file (handles PyInstaller bundling)."""
-    if getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS'):
-        base_path = Path(sys._MEIPASS)
-    else:
-        base_path = Path(__file__).parent.parent.parent
+    """Get path to an asset file, or None if it doesn't exist.
 
-    asset_path = base_path / "assets" / filename
+    Cached: the bundle location and its contents don't change while running.
+    """
+    asset_path = ASSETS_DIR / filename
     if asset_path.exists():
         return asset_path
     return None
 
 
-class ToolTip:
-    """Simple tooltip implementation."""
+@cache
+def _font(family: str, size: int, weight: str = "normal") -> tkfont.Font:
+    """Return a shared named font on the shared root.
 
-    def __init__(self, widget, text):
-        self.widget = widget
-        self.text = text
-        self.tooltip = None
-        widget.bind("<Enter>", self.show)
-        widget.bind("<Leave>", self.hide)
+    Widgets given the same Font object reuse one resolved Tk font, so its
+    metrics are computed once per process instead of once per widget spec.
+    """
+    return tkfont.Font(root=get_ui_root(), family=family, size=size, weight=weight)
 
-    def show(self, event=None):
-        x, y, _, _ = self.widget.bbox("insert") if hasattr(self.widget, 'bbox') else (0, 0, 0, 0)
-        x += self.widget.winfo_rootx() + 25
-        y += self.widget.winfo_rooty() + 25
 
-        self.tooltip = tk.Toplevel(self.widget)
-        self.tooltip.wm_overrideredirect(True)
-        self.tooltip.wm_geometry(f"+{x}+{y}")
+def _configure_styles() -> None:
+    """Register the named ttk label styles used by the windows (UI thread).
+
+    Done once per root, so labels pick a style by name instead of each one
+    carrying its own font and colour options.
+    """
+    style = ttk.Style(_root)
+    style.configure("Title.TLabel", font=_font("Segoe UI", 18, "bold"))
+    style.configure("Heading.TLabel", font=_font("Segoe UI", 14, "bold"))
+    style.configure("Section.TLabel", font=_font("Segoe UI", 11, "bold"))
+    style.configure("Subtitle.TLabel", font=_font("Segoe UI", 9), foreground="#666666")
+    style.configure("Count.TLabel", font=_font("Segoe UI", 10), foreground="#666666")
+    style.configure("Severity.TLabel", font=_font("Segoe UI", 10))
+    style.configure("Help.TLabel", font=_font("Segoe UI", 8), foreground="#666666")
+    style.configure("Link.TLabel", font=_font("Segoe UI", 8), foreground="#0066cc")
+    style.configure("Brand.TLabel", font=_font("Segoe UI", 8), foreground="#999999")
+
+
+# Heavy or platform-specific modules, imported the first time a window needs
+# them rather than when this module is imported
+_pil = None
+_httpx = None
+_winreg = None
+
+
+def _get_pil():
+    """Return ``(Image, ImageTk)`` from Pillow, or None if it is not installed."""
+    global _pil
+    if _pil is None:
+        try:
+            from PIL import Image, ImageTk
+            _pil = (Image, ImageTk)
+        except ImportError:
+            _pil = ()
+    return _pil or None
+
+
+def _get_httpx():
+    """Return the httpx module."""
+    global _httpx
+    if _httpx is None:
+        import httpx
+        _httpx = httpx
+    return _httpx
+
+
+def _get_winreg():
+    """Return the winreg module (Windows only)."""
+    global _winreg
+    if _winreg is None:
+        import winreg
+        _winreg = winreg
+    return _winreg
+
+
+@lru_cache(maxsize=4)
+def _get_logo_photoimage(
+    size: tuple[int, int] = (48, 48),
+) -> Optional["tk.PhotoImage | ImageTk.PhotoImage"]:
+    """Load the logo at ``size``; cached, as the result never changes.
+
+    Prefers the pre-rendered ``lognog_<N>.png`` that build.py writes, then a
+    copy resized on an earlier run and kept in the cache directory, both of
+    which Tk loads natively; otherwise decodes and resizes the .ico with
+    Pillow. The image belongs to the shared root, so it stays valid across
+    windows.
+    """
+    if _root is None:
+        return None
+
+    width, height = size
+    png_path = get_asset_path(f"lognog_{width}.png") if width == height else None
+    if png_path:
+        return tk.PhotoImage(file=str(png_path), master=_root)
+
+    logo_path = get_asset_path("lognog.ico")
+    if not logo_path:
+        return None
+
+    # Keep the resampled logo on disk so later runs skip the LANCZOS resize
+    cache_path = Config.get_cache_dir() / f"lognog_logo_{width}x{height}.png"
+    try:
+        if cache_path.stat().st_mtime >= logo_path.stat().st_mtime:
+            return tk.PhotoImage(file=str(cache_path), master=_root)
+    except (OSError, tk.TclError):
+        pass
+
+    pil = _get_pil()
+    if pil is None:
+        return None
+    pil_image, pil_image_tk = pil
+
+    img = pil_image.open(str(logo_path)).resize(size, pil_image.Resampling.LANCZOS)
+    try:
+        ensure_dir(cache_path.parent)
+        img.save(cache_path, "PNG")
+    except OSError as e:
+        logger.debug(f"Could not cache logo image: {e}")
+    return pil_image_tk.PhotoImage(img, master=_root)
+
+
+@lru_cache(maxsize=1)
+def _startup_command() -> str:
+    """Return the quoted command line registered to start the agent on boot."""
+    if getattr(sys, 'frozen', False):
+        exe_path = sys.executable
+    else:
+        exe_path = sys.argv[0]
+    return f'"{exe_path}"'
 
-        label = ttk.Label(
+
+def _format_path_entry(p: "WatchPath | FIMPath") -> str:
+    """Return the listbox text for a watch or FIM path."""
+    return f"{'✓' if p.enabled else '✗'} {p.path} ({p.pattern})"
+
+
+def _sound_display_name(sound_path: str) -> str:
+    """Return the label text for a configured alert sound."""
+    if sound_path == "default":
+        return "Default Beep"
+    return Path(sound_path).name if sound_path else "None"
+
+
+class TooltipManager:
+    """Tooltips for any number of widgets, drawn in one shared popup.
+
+    The popup Toplevel and its label are created once and then repositioned
+    and re-labelled on hover, instead of building a new Toplevel each time.
+    Registered widgets share one bind tag, so the hover handlers are bound
+    once for all of them rather than as two Tcl commands per widget.
+    """
+
+    BIND_TAG = "LogNogTooltip"
+
+    def __init__(self, master: tk.Misc):
+        self._texts: "weakref.WeakKeyDictionary[tk.Misc, str]" = weakref.WeakKeyDictionary()
+        master.bind_class(self.BIND_TAG, "<Enter>", lambda event: self.show(event.widget))
+        master.bind_class(self.BIND_TAG, "<Leave>", self.hide)
+        self.tooltip = tk.Toplevel(master)
+        self.tooltip.wm_overrideredirect(True)
+        self.tooltip.withdraw()
+        self.label = ttk.Label(
             self.tooltip,
-            text=self.text,
             background="#ffffe0",
             relief="solid",
             borderwidth=1,
             padding=(5, 2),
         )
-        label.pack()
+        self.label.pack()
+
+    def register(self, widget, text: str) -> None:
+        """Show ``text`` while the pointer is over ``widget``."""
+        self._texts[widget] = text
+        tags = widget.bindtags()
+        if self.BIND_TAG not in tags:
+            widget.bindtags(tags + (self.BIND_TAG,))
+
+    def show(self, widget) -> None:
+        text = self._texts.get(widget)
+        if text is None:
+            return
+        x, y, _, _ = widget.bbox("insert") if hasattr(widget, 'bbox') else (0, 0, 0, 0)
+        x += widget.winfo_rootx() + 25
+        y += widget.winfo_rooty() + 25
+
+        self.label.configure(text=text)
+        self.tooltip.wm_geometry(f"+{x}+{y}")
+        self.tooltip.deiconify()
+        self.tooltip.lift()
+
+    def hide(self, event=None) -> None:
+        self.tooltip.withdraw()
+
+
+_tooltips: Optional[TooltipManager] = None
+
 
-    def hide(self, event=None):
-        if self.tooltip:
-            self.tooltip.destroy()
-            self.tooltip = None
+def _get_tooltips() -> TooltipManager:
+    """Return the tooltip manager on the shared root (UI thread)."""
+    global _tooltips
+    if _tooltips is None:
+        _tooltips = TooltipManager(get_ui_root())
+    return _tooltips
+
+
+def _build_header(parent: tk.Misc) -> ttk.Frame:
+    """Build the logo/title/branding header, returned ungridded.
+
+    Its content never varies, and the logo and fonts it uses are shared
+    cached objects, so building it is just widget creation.
+    """
+    header_frame = ttk.Frame(parent)
+
+    # Try to load and display logo
+    try:
+        logo_image = _get_logo_photoimage((48, 48))
+        if logo_image:
+            logo_label = ttk.Label(header_frame, image=logo_image)
+            logo_label.pack(side="left", padx=(0, 10))
+    except Exception as e:
+        logger.debug(f"Could not load logo: {e}")
+
+    # Title and subtitle
+    title_frame = ttk.Frame(header_frame)
+    title_frame.pack(side="left", fill="x")
+
+    title_label = ttk.Label(
+        title_frame,
+        text="LogNog In",
+        style="Title.TLabel",
+    )
+    title_label.pack(anchor="w")
+
+    subtitle_label = ttk.Label(
+        title_frame,
+        text="Lightweight Log Shipping Agent",
+        style="Subtitle.TLabel",
+    )
+    subtitle_label.pack(anchor="w")
+
+    # Machine King Labs
+    brand_label = ttk.Label(
+        header_frame,
+        text="Machine King Labs",
+        style="Brand.TLabel",
+    )
+    brand_label.pack(side="right", anchor="e")
+
+    return header_frame
 
 
 class ConfigWindow:
@@ -73,28 +348,67 @@ class ConfigWindow:
         self.config = config
         self.on_save = on_save
         self.on_close = on_close
-        self.window: Optional[tk.Tk] = None
-        self._thread: Optional[threading.Thread] = None
+        self.window: Optional[tk.Toplevel] = None
+        # (listbox, method name, args) edits applied together at idle time
+        self._pending_list_ops: list[tuple[tk.Listbox, str, tuple]] = []
+        # Connection-test client, kept so repeat tests can reuse its pool
+        self._http = None
 
     def show(self) -> None:
-        """Show the configuration window."""
+        """Show the configuration window (callable from any thread)."""
+        run_on_ui_thread(self._show)
+
+    def _show(self) -> None:
+        """Raise the window, creating it if needed (UI thread).
+
+        Closing only withdraws the window, so later opens reuse its widgets
+        after reloading their values from ``self.config``.
+        """
         if self.window is not None:
             try:
+                if self.window.state() == "withdrawn":
+                    self._sync_from_config()
+                    self.window.deiconify()
                 self.window.lift()
                 self.window.focus_force()
                 return
             except tk.TclError:
-                pass
-
-        # Run in thread to not block
-        self._thread = threading.Thread(target=self._create_window, daemon=True)
-        self._thread.start()
+                self.window = None
+
+        self._create_window()
+
+    def _sync_from_config(self) -> None:
+        """Reload every field from ``self.config`` (UI thread)."""
+        self.server_url.set(self.config.server_url)
+        self.api_key.set(self.config.api_key)
+        self.show_key.set(False)
+        self.api_entry.configure(show="*")
+        self.fim_enabled.set(self.config.fim_enabled)
+        self.debug_logging.set(self.config.debug_logging)
+        self.start_on_boot.set(self.config.start_on_boot)
+
+        self._pending_list_ops.clear()
+        for listbox, paths in (
+            (self.watch_listbox, self.config.watch_paths),
+            (self.fim_listbox, self.config.fim_paths),
+        ):
+            listbox.delete(0, tk.END)
+            if paths:
+                listbox.insert(tk.END, *[_format_path_entry(p) for p in paths])
+
+        self.sound_alerts_enabled.set(self.config.sound_alerts_enabled)
+        self.sound_volume.set(self.config.sound_volume)
+        for severity, var in self.sound_paths.items():
+            sound_path = getattr(self.config, f"sound_{severity}", "default")
+            var.set(sound_path)
+            self.sound_labels[severity].configure(text=_sound_display_name(sound_path))
 
     def _create_window(self) -> None:
-        """Create and run the configuration window."""
-        self.window = tk.Tk()
+        """Create the configuration window."""
+        tips = _get_tooltips()
+        self.window = tk.Toplevel(get_ui_root())
         self.window.title("LogNog In - Configuration")
-        self.window.geometry("580x750")
+        self.window.geometry(_centered_geometry("580x750"))
         self.window.resizable(True, True)
         self.window.configure(bg="#f0f0f0")
 
@@ -127,50 +441,7 @@ class ConfigWindow:
         row = 0
 
         # === HEADER / BRANDING ===
-        header_frame = ttk.Frame(main_frame)
-        header_frame.grid(row=row, column=0, columnspan=2, sticky="ew", pady=(0, 15))
-
-        # Try to load and display logo
-        try:
-            from PIL import Image, ImageTk
-            logo_path = get_asset_path("lognog.ico")
-            if logo_path:
-                img = Image.open(str(logo_path))
-                img = img.resize((48, 48), Image.Resampling.LANCZOS)
-                self._logo_image = ImageTk.PhotoImage(img)
-                logo_label = ttk.Label(header_frame, image=self._logo_image)
-                logo_label.pack(side="left", padx=(0, 10))
-        except Exception as e:
-            logger.debug(f"Could not load logo: {e}")
-
-        # Title and subtitle
-        title_frame = ttk.Frame(header_frame)
-        title_frame.pack(side="left", fill="x")
-
-        title_label = ttk.Label(
-            title_frame,
-            text="LogNog In",
-            font=("Segoe UI", 18, "bold"),
-        )
-        title_label.pack(anchor="w")
-
-        subtitle_label = ttk.Label(
-            title_frame,
-            text="Lightweight Log Shipping Agent",
-            font=("Segoe UI", 9),
-            foreground="#666666",
-        )
-        subtitle_label.pack(anchor="w")
-
-        # Machine King Labs
-        brand_label = ttk.Label(
-            header_frame,
-            text="Machine King Labs",
-            font=("Segoe UI", 8),
-            foreground="#999999",
-        )
-        brand_label.pack(side="right", anchor="e")
-
+        _build_header(main_frame).grid(row=row, column=0, columnspan=2, sticky="ew", pady=(0, 15))
         row += 1
 
         ttk.Separator(main_frame, orient="horizontal").grid(
@@ -179,7 +450,7 @@ class ConfigWindow:
         row += 1
 
         # === Server Connection ===
-        ttk.Label(main_frame, text="Server Connection", font=("Segoe UI", 11, "bold")).grid(
+        ttk.Label(main_frame, text="Server Connection", style="Section.TLabel").grid(
             row=row, column=0, columnspan=2, sticky="w", pady=(0, 5)
         )
         row += 1
@@ -187,23 +458,24 @@ class ConfigWindow:
         # Server URL
         url_label = ttk.Label(main_frame, text="Server URL:")
         url_label.grid(row=row, column=0, sticky="w", pady=2)
-        ToolTip(url_label, "The URL of your LogNog server (e.g., http://localhost:4000)")
+        tips.register(url_label, "The URL of your LogNog server (e.g., http://localhost:4000)")
 
         self.server_url = tk.StringVar(value=self.config.server_url)
         url_entry = ttk.Entry(main_frame, textvariable=self.server_url, width=50)
         url_entry.grid(row=row, column=1, sticky="ew", pady=2)
-        ToolTip(url_entry, "Enter your LogNog server URL\nExample: http://192.168.1.100:4000")
+        tips.register(url_entry, "Enter your LogNog server URL\nExample: http://192.168.1.100:4000")
         row += 1
 
         # API Key
         key_label = ttk.Label(main_frame, text="API Key:")
         key_label.grid(row=row, column=0, sticky="w", pady=2)
-        ToolTip(key_label, "API key for authenticating with the server")
+        tips.register(key_label, "API key for authenticating with the server")
 
         self.api_key = tk.StringVar(value=self.config.api_key)
         api_entry = ttk.Entry(main_frame, textvariable=self.api_key, width=50, show="*")
         api_entry.grid(row=row, column=1, sticky="ew", pady=2)
-        ToolTip(api_entry, "Enter your API key (starts with 'lnog_')")
+        self.api_entry = api_entry
+        tips.register(api_entry, "Enter your API key (starts with 'lnog_')")
         row += 1
 
         # API Key help text
@@ -221,18 +493,16 @@ class ConfigWindow:
         help_label = ttk.Label(
             help_frame,
             text="   Get your API key from LogNog → Settings → API Keys",
-            font=("Segoe UI", 8),
-            foreground="#0066cc",
+            style="Link.TLabel",
             cursor="hand2",
         )
         help_label.pack(side="left", padx=(10, 0))
-        ToolTip(help_label, "In your LogNog web interface:\n1. Go to Settings\n2. Click 'API Keys'\n3. Create a new key with 'write' permission\n4. Copy and paste it here")
+        tips.register(help_label, "In your LogNog web interface:\n1. Go to Settings\n2. Click 'API Keys'\n3. Create a new key with 'write' permission\n4. Copy and paste it here")
         row += 1
 
         # Test connection button
-        ttk.Button(main_frame, text="Test Connection", command=self._test_connection).grid(
-            row=row, column=1, sticky="w", pady=5
-        )
+        self.test_button = ttk.Button(main_frame, text="Test Connection", command=self._test_connection)
+        self.test_button.grid(row=row, column=1, sticky="w", pady=5)
         row += 1
 
         ttk.Separator(main_frame, orient="horizontal").grid(
@@ -241,17 +511,16 @@ class ConfigWindow:
         row += 1
 
         # === Watch Paths ===
-        watch_header = ttk.Label(main_frame, text="Log Watch Paths", font=("Segoe UI", 11, "bold"))
+        watch_header = ttk.Label(main_frame, text="Log Watch Paths", style="Section.TLabel")
         watch_header.grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 5))
-        ToolTip(watch_header, "Folders to monitor for log files.\nNew log entries will be shipped to your LogNog server.")
+        tips.register(watch_header, "Folders to monitor for log files.\nNew log entries will be shipped to your LogNog server.")
         row += 1
 
         # Watch paths help
         watch_help = ttk.Label(
             main_frame,
             text="Add folders containing log files. The agent will detect new log entries in real-time.",
-            font=("Segoe UI", 8),
-            foreground="#666666",
+            style="Help.TLabel",
         )
         watch_help.grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 5))
         row += 1
@@ -261,17 +530,17 @@ class ConfigWindow:
         watch_frame.grid(row=row, column=0, columnspan=2, sticky="nsew", pady=5)
         watch_frame.columnconfigure(0, weight=1)
 
-        self.watch_listbox = tk.Listbox(watch_frame, height=5, selectmode=tk.SINGLE, font=("Consolas", 9))
+        self.watch_listbox = tk.Listbox(watch_frame, height=5, selectmode=tk.SINGLE, font=_font("Consolas", 9))
         self.watch_listbox.grid(row=0, column=0, sticky="nsew")
 
         watch_scroll = ttk.Scrollbar(watch_frame, orient="vertical", command=self.watch_listbox.yview)
         watch_scroll.grid(row=0, column=1, sticky="ns")
         self.watch_listbox.configure(yscrollcommand=watch_scroll.set)
 
-        # Populate watch paths
-        for wp in self.config.watch_paths:
-            status = "✓" if wp.enabled else "✗"
-            self.watch_listbox.insert(tk.END, f"{status} {wp.path} ({wp.pattern})")
+        # Populate watch paths (one Tcl call for all rows)
+        watch_items = [_format_path_entry(wp) for wp in self.config.watch_paths]
+        if watch_items:
+            self.watch_listbox.insert(tk.END, *watch_items)
 
         row += 1
 
@@ -281,11 +550,11 @@ class ConfigWindow:
 
         add_watch_btn = ttk.Button(watch_btn_frame, text="Add Path...", command=self._add_watch_path)
         add_watch_btn.pack(side="left", padx=2)
-        ToolTip(add_watch_btn, "Browse to select a folder to watch for logs")
+        tips.register(add_watch_btn, "Browse to select a folder to watch for logs")
 
         remove_watch_btn = ttk.Button(watch_btn_frame, text="Remove", command=self._remove_watch_path)
         remove_watch_btn.pack(side="left", padx=2)
-        ToolTip(remove_watch_btn, "Remove the selected path from the list")
+        tips.register(remove_watch_btn, "Remove the selected path from the list")
         row += 1
 
         ttk.Separator(main_frame, orient="horizontal").grid(
@@ -294,17 +563,16 @@ class ConfigWindow:
         row += 1
 
         # === FIM Settings ===
-        fim_header = ttk.Label(main_frame, text="File Integrity Monitoring (FIM)", font=("Segoe UI", 11, "bold"))
+        fim_header = ttk.Label(main_frame, text="File Integrity Monitoring (FIM)", style="Section.TLabel")
         fim_header.grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 5))
-        ToolTip(fim_header, "Monitor files for unauthorized changes.\nDetects when files are created, modified, or deleted.")
+        tips.register(fim_header, "Monitor files for unauthorized changes.\nDetects when files are created, modified, or deleted.")
         row += 1
 
         # FIM help
         fim_help = ttk.Label(
             main_frame,
             text="Monitor critical files for changes. Great for security monitoring (/etc, config files, etc.)",
-            font=("Segoe UI", 8),
-            foreground="#666666",
+            style="Help.TLabel",
         )
         fim_help.grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 5))
         row += 1
@@ -313,7 +581,7 @@ class ConfigWindow:
         self.fim_enabled = tk.BooleanVar(value=self.config.fim_enabled)
         fim_check = ttk.Checkbutton(main_frame, text="Enable File Integrity Monitoring", variable=self.fim_enabled)
         fim_check.grid(row=row, column=0, columnspan=2, sticky="w")
-        ToolTip(fim_check, "When enabled, the agent will track file hashes\nand report any changes to your LogNog server.")
+        tips.register(fim_check, "When enabled, the agent will track file hashes\nand report any changes to your LogNog server.")
         row += 1
 
         # FIM paths listbox
@@ -321,17 +589,17 @@ class ConfigWindow:
         fim_frame.grid(row=row, column=0, columnspan=2, sticky="nsew", pady=5)
         fim_frame.columnconfigure(0, weight=1)
 
-        self.fim_listbox = tk.Listbox(fim_frame, height=4, selectmode=tk.SINGLE, font=("Consolas", 9))
+        self.fim_listbox = tk.Listbox(fim_frame, height=4, selectmode=tk.SINGLE, font=_font("Consolas", 9))
         self.fim_listbox.grid(row=0, column=0, sticky="nsew")
 
         fim_scroll = ttk.Scrollbar(fim_frame, orient="vertical", command=self.fim_listbox.yview)
         fim_scroll.grid(row=0, column=1, sticky="ns")
         self.fim_listbox.configure(yscrollcommand=fim_scroll.set)
 
-        # Populate FIM paths
-        for fp in self.config.fim_paths:
-            status = "✓" if fp.enabled else "✗"
-            self.fim_listbox.insert(tk.END, f"{status} {fp.path} ({fp.pattern})")
+        # Populate FIM paths (one Tcl call for all rows)
+        fim_items = [_format_path_entry(fp) for fp in self.config.fim_paths]
+        if fim_items:
+            self.fim_listbox.insert(tk.END, *fim_items)
 
         row += 1
 
@@ -341,11 +609,11 @@ class ConfigWindow:
 
         add_fim_btn = ttk.Button(fim_btn_frame, text="Add Path...", command=self._add_fim_path)
         add_fim_btn.pack(side="left", padx=2)
-        ToolTip(add_fim_btn, "Browse to select a folder to monitor for file changes")
+        tips.register(add_fim_btn, "Browse to select a folder to monitor for file changes")
 
         remove_fim_btn = ttk.Button(fim_btn_frame, text="Remove", command=self._remove_fim_path)
         remove_fim_btn.pack(side="left", padx=2)
-        ToolTip(remove_fim_btn, "Remove the selected path from the list")
+        tips.register(remove_fim_btn, "Remove the selected path from the list")
         row += 1
 
         ttk.Separator(main_frame, orient="horizontal").grid(
@@ -354,7 +622,7 @@ class ConfigWindow:
         row += 1
 
         # === Advanced Settings ===
-        ttk.Label(main_frame, text="Advanced", font=("Segoe UI", 11, "bold")).grid(
+        ttk.Label(main_frame, text="Advanced", style="Section.TLabel").grid(
             row=row, column=0, columnspan=2, sticky="w", pady=(0, 5)
         )
         row += 1
@@ -363,14 +631,14 @@ class ConfigWindow:
         self.debug_logging = tk.BooleanVar(value=self.config.debug_logging)
         debug_check = ttk.Checkbutton(main_frame, text="Enable debug logging", variable=self.debug_logging)
         debug_check.grid(row=row, column=0, columnspan=2, sticky="w")
-        ToolTip(debug_check, "Enable verbose logging for troubleshooting.\nLogs are stored in the agent's log directory.")
+        tips.register(debug_check, "Enable verbose logging for troubleshooting.\nLogs are stored in the agent's log directory.")
         row += 1
 
         # Start on boot
         self.start_on_boot = tk.BooleanVar(value=self.config.start_on_boot)
         startup_check = ttk.Checkbutton(main_frame, text="Start on Windows boot", variable=self.start_on_boot)
         startup_check.grid(row=row, column=0, columnspan=2, sticky="w")
-        ToolTip(startup_check, "Automatically start LogNog In when you log into Windows.\nThe agent will run in the system tray.")
+        tips.register(startup_check, "Automatically start LogNog In when you log into Windows.\nThe agent will run in the system tray.")
         row += 1
 
         # Spacer
@@ -390,17 +658,9 @@ class ConfigWindow:
         # Handle window close
         self.window.protocol("WM_DELETE_WINDOW", self._close)
 
-        # Center window
-        self.window.update_idletasks()
-        x = (self.window.winfo_screenwidth() - self.window.winfo_width()) // 2
-        y = (self.window.winfo_screenheight() - self.window.winfo_height()) // 2
-        self.window.geometry(f"+{x}+{y}")
-
-        # Run the window
-        self.window.mainloop()
-
     def _create_sound_tab(self, parent: ttk.Frame) -> None:
         """Create the sound alerts configuration tab."""
+        tips = _get_tooltips()
         parent.columnconfigure(1, weight=1)
         row = 0
 
@@ -411,14 +671,13 @@ class ConfigWindow:
         ttk.Label(
             header_frame,
             text="Sound Alerts",
-            font=("Segoe UI", 14, "bold"),
+            style="Heading.TLabel",
         ).pack(anchor="w")
 
         ttk.Label(
             header_frame,
             text="Configure sound notifications for alerts",
-            font=("Segoe UI", 9),
-            foreground="#666666",
+            style="Subtitle.TLabel",
         ).pack(anchor="w")
         row += 1
 
@@ -436,7 +695,7 @@ class ConfigWindow:
             command=self._on_sound_toggle,
         )
         enable_check.grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 10))
-        ToolTip(enable_check, "Play sounds when alert notifications are received from the server")
+        tips.register(enable_check, "Play sounds when alert notifications are received from the server")
         row += 1
 
         # === Volume control ===
@@ -459,9 +718,8 @@ class ConfigWindow:
         self.volume_label.pack(side="left")
 
         # Update label when slider moves
-        def update_volume_label(*args):
-            self.volume_label.configure(text=f"{self.sound_volume.get()}%")
-        self.sound_volume.trace_add("write", update_volume_label)
+        self._volume_label_pending = False
+        self.sound_volume.trace_add("write", self._schedule_volume_label)
 
         row += 1
 
@@ -474,21 +732,21 @@ class ConfigWindow:
         ttk.Label(
             parent,
             text="Sounds by Severity Level",
-            font=("Segoe UI", 11, "bold"),
+            style="Section.TLabel",
         ).grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 10))
         row += 1
 
         help_text = ttk.Label(
             parent,
             text='Select "Default Beep" for built-in system sounds, or choose custom .wav files',
-            font=("Segoe UI", 8),
-            foreground="#666666",
+            style="Help.TLabel",
         )
         help_text.grid(row=row, column=0, columnspan=2, sticky="w", pady=(0, 10))
         row += 1
 
-        # Store sound path variables
+        # Store sound path variables and the labels showing them
         self.sound_paths = {}
+        self.sound_labels = {}
 
         # Create config for each severity
         severities = [
@@ -506,27 +764,27 @@ class ConfigWindow:
             severity_label = ttk.Label(
                 severity_frame,
                 text=f"{label}:",
-                font=("Segoe UI", 10),
+                style="Severity.TLabel",
                 foreground=color,
             )
             severity_label.pack(side="left", padx=(0, 10))
-            ToolTip(severity_label, tooltip)
+            tips.register(severity_label, tooltip)
 
             # Sound selection
             sound_path = getattr(self.config, f"sound_{severity}", "default")
             self.sound_paths[severity] = tk.StringVar(value=sound_path)
 
-            # Display name for path
-            display_name = "Default Beep" if sound_path == "default" else Path(sound_path).name if sound_path else "None"
-
-            path_label = ttk.Label(severity_frame, text=display_name, width=30, anchor="w", relief="sunken")
+            path_label = ttk.Label(
+                severity_frame, text=_sound_display_name(sound_path), width=30, anchor="w", relief="sunken"
+            )
             path_label.pack(side="left", padx=5)
+            self.sound_labels[severity] = path_label
 
             # Browse button
             browse_btn = ttk.Button(
                 severity_frame,
                 text="Browse...",
-                command=lambda s=severity, pl=path_label: self._browse_sound(s, pl),
+                command=partial(self._browse_sound, severity),
                 width=10,
             )
             browse_btn.pack(side="left", padx=2)
@@ -535,7 +793,7 @@ class ConfigWindow:
             default_btn = ttk.Button(
                 severity_frame,
                 text="Default",
-                command=lambda s=severity, pl=path_label: self._set_default_sound(s, pl),
+                command=partial(self._set_default_sound, severity),
                 width=10,
             )
             default_btn.pack(side="left", padx=2)
@@ -544,7 +802,7 @@ class ConfigWindow:
             test_btn = ttk.Button(
                 severity_frame,
                 text="Test",
-                command=lambda s=severity: self._test_sound(s),
+                command=partial(self._test_sound, severity),
                 width=8,
             )
             test_btn.pack(side="left", padx=2)
@@ -554,24 +812,36 @@ class ConfigWindow:
         # Add spacer
         parent.rowconfigure(row, weight=1)
 
+    def _schedule_volume_label(self, *args) -> None:
+        """Refresh the volume label once per idle pass while the slider drags."""
+        if self._volume_label_pending:
+            return
+        self._volume_label_pending = True
+        self.window.after_idle(self._update_volume_label)
+
+    def _update_volume_label(self) -> None:
+        self._volume_label_pending = False
+        self.volume_label.configure(text=f"{self.sound_volume.get()}%")
+
     def _on_sound_toggle(self) -> None:
         """Handle sound alerts enable/disable toggle."""
         pass  # Just update the variable
 
-    def _browse_sound(self, severity: str, label: ttk.Label) -> None:
+    def _browse_sound(self, severity: str) -> None:
         """Browse for a custom sound file."""
         file_path = filedialog.askopenfilename(
             title=f"Select sound for {severity} alerts",
             filetypes=[("WAV files", "*.wav"), ("All files", "*.*")],
+            parent=self.window,
         )
         if file_path:
             self.sound_paths[severity].set(file_path)
-            label.configure(text=Path(file_path).name)
+            self.sound_labels[severity].configure(text=_sound_display_name(file_path))
 
-    def _set_default_sound(self, severity: str, label: ttk.Label) -> None:
+    def _set_default_sound(self, severity: str) -> None:
         """Set default beep for a severity."""
         self.sound_paths[severity].set("default")
-        label.configure(text="Default Beep")
+        self.sound_labels[severity].configure(text=_sound_display_name("default"))
 
     def _test_sound(self, severity: str) -> None:
         """Test the sound for a severity level."""
@@ -598,98 +868,161 @@ class ConfigWindow:
                 "Sound alerts require either:\n"
                 "- Windows (winsound built-in)\n"
                 "- pygame library installed",
+                parent=self.window,
             )
             return
 
         try:
             success = player.test_sound(sound_path, sev, volume)
             if not success:
-                messagebox.showerror("Test Failed", "Could not play sound.\n\nCheck the file path and format (.wav only).")
+                messagebox.showerror(
+                    "Test Failed",
+                    "Could not play sound.\n\nCheck the file path and format (.wav only).",
+                    parent=self.window,
+                )
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to test sound: {e}")
+            messagebox.showerror("Error", f"Failed to test sound: {e}", parent=self.window)
 
     def _test_connection(self) -> None:
-        """Test the server connection."""
-        import httpx
-
+        """Test the server connection without blocking the window."""
         server = self.server_url.get().strip()
         api_key = self.api_key.get().strip()
 
         if not server:
-            messagebox.showerror("Error", "Please enter a server URL")
+            messagebox.showerror("Error", "Please enter a server URL", parent=self.window)
             return
 
+        # The requests can take up to 20s; run them off the Tk thread
+        self.test_button.configure(state="disabled", text="Testing...")
+        threading.Thread(
+            target=self._run_connection_test, args=(server, api_key), daemon=True
+        ).start()
+
+    def _run_connection_test(self, server: str, api_key: str) -> None:
+        """Run the connection test requests (worker thread)."""
+        httpx = _get_httpx()
+        if self._http is None:
+            self._http = httpx.Client(timeout=10.0)
+        client = self._http
+
+        # (messagebox function, title, message) to show once the test is done
+        results = []
         try:
             # Test health endpoint
-            response = httpx.get(f"{server}/health", timeout=10.0)
+            response = client.get(f"{server}/health")
             if response.status_code != 200:
-                messagebox.showerror("Error", f"Server returned: {response.status_code}")
-                return
-
-            # Test auth if API key provided
-            if api_key:
-                response = httpx.get(
-                    f"{server}/auth/me",
-                    headers={"Authorization": f"ApiKey {api_key}"},
-                    timeout=10.0,
-                )
-                if response.status_code == 401:
-                    messagebox.showerror("Error", "Authentication failed - check API key")
-                    return
-                elif response.status_code != 200:
-                    messagebox.showwarning("Warning", f"Auth check returned: {response.status_code}")
-
-            messagebox.showinfo("Success", "Connection successful!")
+                results.append((messagebox.showerror, "Error", f"Server returned: {response.status_code}"))
+            else:
+                # Test auth if API key provided
+                if api_key:
+                    response = client.get(
+                        f"{server}/auth/me",
+                        headers={"Authorization": f"ApiKey {api_key}"},
+                    )
+                    if response.status_code == 401:
+                        results.append((messagebox.showerror, "Error", "Authentication failed - check API key"))
+                    elif response.status_code != 200:
+                        results.append((messagebox.showwarning, "Warning", f"Auth check returned: {response.status_code}"))
+
+                if not results or results[-1][0] is not messagebox.showerror:
+                    results.append((messagebox.showinfo, "Success", "Connection successful!"))
 
         except httpx.ConnectError:
-            messagebox.showerror("Error", f"Cannot connect to {server}")
+            results.append((messagebox.showerror, "Error", f"Cannot connect to {server}"))
         except Exception as e:
-            messagebox.showerror("Error", str(e))
+            results.append((messagebox.showerror, "Error", str(e)))
+
+        # Tk calls must happen on the window's own thread
+        window = self.window
+        if window is not None:
+            try:
+                window.after(0, self._finish_connection_test, results)
+            except (tk.TclError, RuntimeError):
+                pass
+
+    def _finish_connection_test(self, results: list) -> None:
+        """Report connection test results (Tk thread)."""
+        if self.window is None:
+            return
+        self.test_button.configure(state="normal", text="Test Connection")
+        if self.window.state() == "withdrawn":
+            # Closed while the test ran
+            return
+        for show, title, message in results:
+            show(title, message, parent=self.window)
+
+    def _queue_list_op(self, listbox: tk.Listbox, method: str, *args) -> None:
+        """Queue a listbox edit; queued edits are applied in one idle pass.
+
+        The config lists are updated immediately and stay the source of truth,
+        only the listbox redraw is deferred.
+        """
+        if not self._pending_list_ops:
+            self.window.after_idle(self._flush_list_ops)
+        self._pending_list_ops.append((listbox, method, args))
+
+    def _flush_list_ops(self) -> None:
+        """Apply queued listbox edits in order."""
+        ops, self._pending_list_ops = self._pending_list_ops, []
+        if self.window is None:
+            return
+        for listbox, method, args in ops:
+            try:
+                getattr(listbox, method)(*args)
+            except tk.TclError:
+                # Window was closed before the idle pass ran
+                return
 
     def _add_watch_path(self) -> None:
         """Add a new watch path."""
-        path = filedialog.askdirectory(title="Select folder to watch for logs")
+        path = filedialog.askdirectory(title="Select folder to watch for logs", parent=self.window)
         if path:
             # Ask for pattern
-            pattern = tk.simpledialog.askstring(
+            pattern = simpledialog.askstring(
                 "Pattern",
                 "File pattern (e.g., *.log, *.txt):",
                 initialvalue="*.log",
+                parent=self.window,
             )
             if pattern:
                 wp = WatchPath(path=path, pattern=pattern)
                 self.config.watch_paths.append(wp)
-                self.watch_listbox.insert(tk.END, f"✓ {path} ({pattern})")
+                self._queue_list_op(self.watch_listbox, "insert", tk.END, _format_path_entry(wp))
 
     def _remove_watch_path(self) -> None:
         """Remove selected watch path."""
         selection = self.watch_listbox.curselection()
         if selection:
             idx = selection[0]
-            self.watch_listbox.delete(idx)
+            # Drop the selection now so a repeat click can't remove it twice
+            self.watch_listbox.selection_clear(idx)
+            self._queue_list_op(self.watch_listbox, "delete", idx)
             if idx < len(self.config.watch_paths):
                 del self.config.watch_paths[idx]
 
     def _add_fim_path(self) -> None:
         """Add a new FIM path."""
-        path = filedialog.askdirectory(title="Select folder to monitor for integrity")
+        path = filedialog.askdirectory(title="Select folder to monitor for integrity", parent=self.window)
         if path:
-            pattern = tk.simpledialog.askstring(
+            pattern = simpledialog.askstring(
                 "Pattern",
                 "File pattern (e.g., *, *.conf, *.exe):",
                 initialvalue="*",
+                parent=self.window,
             )
             if pattern:
                 fp = FIMPath(path=path, pattern=pattern)
                 self.config.fim_paths.append(fp)
-                self.fim_listbox.insert(tk.END, f"✓ {path} ({pattern})")
+                self._queue_list_op(self.fim_listbox, "insert", tk.END, _format_path_entry(fp))
 
     def _remove_fim_path(self) -> None:
         """Remove selected FIM path."""
         selection = self.fim_listbox.curselection()
         if selection:
             idx = selection[0]
-            self.fim_listbox.delete(idx)
+            # Drop the selection now so a repeat click can't remove it twice
+            self.fim_listbox.selection_clear(idx)
+            self._queue_list_op(self.fim_listbox, "delete", idx)
             if idx < len(self.config.fim_paths):
                 del self.config.fim_paths[idx]
 
@@ -700,6 +1033,7 @@ class ConfigWindow:
         self.config.api_key = self.api_key.get().strip()
         self.config.fim_enabled = self.fim_enabled.get()
         self.config.debug_logging = self.debug_logging.get()
+        previous_start_on_boot = self.config.start_on_boot
         self.config.start_on_boot = self.start_on_boot.get()
 
         # Update sound settings
@@ -710,25 +1044,29 @@ class ConfigWindow:
         self.config.sound_warning = self.sound_paths.get("warning", tk.StringVar(value="default")).get()
         self.config.sound_info = self.sound_paths.get("info", tk.StringVar(value="default")).get()
 
-        # Handle start on boot
-        self._update_startup_registry()
+        # Handle start on boot (the Run key only changes when this setting does)
+        if self.config.start_on_boot != previous_start_on_boot:
+            self._update_startup_registry()
 
         # Save to file
         try:
             self.config.save()
-            messagebox.showinfo("Saved", "Configuration saved successfully!\n\nRestart the agent for changes to take effect.")
+            messagebox.showinfo(
+                "Saved",
+                "Configuration saved successfully!\n\nRestart the agent for changes to take effect.",
+                parent=self.window,
+            )
 
             if self.on_save:
                 self.on_save(self.config)
 
             self._close()
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to save: {e}")
+            messagebox.showerror("Error", f"Failed to save: {e}", parent=self.window)
 
     def _update_startup_registry(self) -> None:
         """Update Windows startup registry."""
-        import sys
-        import winreg
+        winreg = _get_winreg()
 
         key_path = r"Software\Microsoft\Windows\CurrentVersion\Run"
         app_name = "LogNogIn"
@@ -737,12 +1075,7 @@ class ConfigWindow:
             key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_SET_VALUE)
 
             if self.config.start_on_boot:
-                # Get the executable path
-                if getattr(sys, 'frozen', False):
-                    exe_path = sys.executable
-                else:
-                    exe_path = sys.argv[0]
-                winreg.SetValueEx(key, app_name, 0, winreg.REG_SZ, f'"{exe_path}"')
+                winreg.SetValueEx(key, app_name, 0, winreg.REG_SZ, _startup_command())
             else:
                 try:
                     winreg.DeleteValue(key, app_name)
@@ -754,25 +1087,50 @@ class ConfigWindow:
             logger.error(f"Failed to update startup registry: {e}")
 
     def _close(self) -> None:
-        """Close the window."""
+        """Close the window (hidden, to be reused by the next show())."""
         if self.window:
-            self.window.destroy()
-            self.window = None
+            self.window.withdraw()
 
         if self.on_close:
             self.on_close()
 
 
+@lru_cache(maxsize=1024)
+def _fmt_ts(timestamp: str) -> str:
+    """Format an ISO timestamp to be more readable, or return it unchanged."""
+    try:
+        return datetime.fromisoformat(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+    except Exception:
+        return timestamp
+
+
+def _alert_row(alert: dict) -> tuple[str, str, str, str]:
+    """Return the (time, severity, title, message) Treeview values for an alert."""
+    timestamp = alert.get("timestamp", "")
+    if timestamp:
+        timestamp = _fmt_ts(timestamp)
+
+    message = alert.get("message", "")
+    # Truncate long messages
+    if len(message) > 100:
+        message = message[:97] + "..."
+
+    return (timestamp, alert.get("severity", "medium").upper(), alert.get("title", ""), message)
+
+
 class AlertHistoryWindow:
     """Window to display alert notification history."""
 
     def __init__(self, alerts: list[dict]):
         self.alerts = alerts
-        self.window: Optional[tk.Tk] = None
-        self._thread: Optional[threading.Thread] = None
+        self.window: Optional[tk.Toplevel] = None
 
     def show(self) -> None:
-        """Show the alert history window."""
+        """Show the alert history window (callable from any thread)."""
+        run_on_ui_thread(self._show)
+
+    def _show(self) -> None:
+        """Raise the window, creating it if needed (UI thread)."""
         if self.window is not None:
             try:
                 self.window.lift()
@@ -781,14 +1139,13 @@ class AlertHistoryWindow:
             except tk.TclError:
                 pass
 
-        self._thread = threading.Thread(target=self._create_window, daemon=True)
-        self._thread.start()
+        self._create_window()
 
     def _create_window(self) -> None:
-        """Create and run the alert history window."""
-        self.window = tk.Tk()
+        """Create the alert history window."""
+        self.window = tk.Toplevel(get_ui_root())
         self.window.title("LogNog In - Alert History")
-        self.window.geometry("600x400")
+        self.window.geometry(_centered_geometry("600x400"))
         self.window.resizable(True, True)
         self.window.configure(bg="#f0f0f0")
 
@@ -811,14 +1168,13 @@ class AlertHistoryWindow:
         ttk.Label(
             header_frame,
             text="Alert History",
-            font=("Segoe UI", 14, "bold"),
+            style="Heading.TLabel",
         ).pack(side="left")
 
         ttk.Label(
             header_frame,
             text=f"({len(self.alerts)} alerts)",
-            font=("Segoe UI", 10),
-            foreground="#666666",
+            style="Count.TLabel",
         ).pack(side="left", padx=(10, 0))
 
         # Alerts list with treeview
@@ -842,27 +1198,10 @@ class AlertHistoryWindow:
         tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-        # Populate alerts
+        # The agent keeps at most 100 alerts, so every row goes in the tree:
+        # selection, keyboard navigation and see() keep working
         for alert in self.alerts:
-            timestamp = alert.get("timestamp", "")
-            if timestamp:
-                # Format timestamp to be more readable
-                try:
-                    from datetime import datetime
-                    dt = datetime.fromisoformat(timestamp)
-                    timestamp = dt.strftime("%Y-%m-%d %H:%M:%S")
-                except Exception:
-                    pass
-
-            severity = alert.get("severity", "medium").upper()
-            title = alert.get("title", "")
-            message = alert.get("message", "")
-
-            # Truncate long messages
-            if len(message) > 100:
-                message = message[:97] + "..."
-
-            tree.insert("", "end", values=(timestamp, severity, title, message))
+            tree.insert("", "end", values=_alert_row(alert))
 
         # Show message if no alerts
         if not self.alerts:
@@ -877,14 +1216,6 @@ class AlertHistoryWindow:
         # Handle window close
         self.window.protocol("WM_DELETE_WINDOW", self._close)
 
-        # Center window
-        self.window.update_idletasks()
-        x = (self.window.winfo_screenwidth() - self.window.winfo_width()) // 2
-        y = (self.window.winfo_screenheight() - self.window.winfo_height()) // 2
-        self.window.geometry(f"+{x}+{y}")
-
-        self.window.mainloop()
-
     def _close(self) -> None:
         """Close the window."""
         if self.window:
@@ -899,11 +1230,11 @@ except ImportError:
     # Fallback implementation
     class simpledialog:
         @staticmethod
-        def askstring(title, prompt, initialvalue=""):
-            dialog = tk.Toplevel()
+        def askstring(title, prompt, initialvalue="", parent=None):
+            dialog = tk.Toplevel(parent)
             dialog.title(title)
             dialog.geometry("300x100")
-            dialog.transient()
+            dialog.transient(parent)
             dialog.grab_set()
 
             result = [None]
@@ -913,13 +1244,21 @@ except ImportError:
             entry.insert(0, initialvalue)
             entry.pack(pady=5)
 
-            def on_ok():
+            done = tk.BooleanVar(dialog, False)
+
+            def on_ok(event=None):
                 result[0] = entry.get()
-                dialog.destroy()
+                done.set(True)
+
+            def on_cancel(event=None):
+                done.set(True)
 
             ttk.Button(dialog, text="OK", command=on_ok).pack(pady=5)
+            dialog.bind("<Return>", on_ok)
+            dialog.bind("<Escape>", on_cancel)
+            dialog.protocol("WM_DELETE_WINDOW", on_cancel)
+            entry.focus_set()
 
-            dialog.wait_window()
+            dialog.wait_variable(done)
+            dialog.destroy()
             return result[0]
-
-    tk.simpledialog = simpledialog
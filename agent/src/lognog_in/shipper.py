@@ -1,7 +1,9 @@
 """HTTP shipper module for sending events to LogNog server."""
 
 import asyncio
+import json
 import logging
+import os
 import threading
 import time
 import uuid
@@ -31,6 +33,14 @@ class SendResult(Enum):
     PERMANENT = "permanent"    # 4xx the server will never accept (drop batch)
 
 
+# Last-known-good server state, stored next to the buffer database. On startup
+# a fresh entry lets the shipper report CONNECTED immediately (stale) while the
+# first loop iteration re-checks the server in the background (revalidate).
+SERVER_CACHE_FILE = "server_cache.json"
+SERVER_CACHE_TTL_SECONDS = 3600.0
+SERVER_CACHE_WRITE_INTERVAL_SECONDS = 60.0
+
+
 # Notification callback type
 NotificationCallback = Callable[[str, str, str], None]  # (title, message, severity)
 
@@ -71,6 +81,11 @@ class HTTPShipper:
         self._last_error: Optional[str] = None
         self._last_notification_check: Optional[float] = None
 
+        # Stale-while-revalidate server state
+        self._server_cache_path = buffer.db_path.parent / SERVER_CACHE_FILE
+        self._server_cache_written: Optional[float] = None
+        self._revalidate = False
+
     @property
     def status(self) -> ConnectionStatus:
         return self._status
@@ -97,6 +112,12 @@ class HTTPShipper:
 
         self._stop_event.clear()
         self._running = True
+
+        # Serve the last-known-good state until the loop revalidates it
+        if self._load_server_cache():
+            self.status = ConnectionStatus.CONNECTED
+            self._revalidate = True
+
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
         logger.info("HTTP shipper started")
@@ -128,19 +149,20 @@ class HTTPShipper:
             limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
         ) as client:
             while not self._stop_event.is_set():
+                event_ids = []
                 try:
-                    # Get batch from buffer
-                    batch = self.buffer.get_batch(self.config.batch_size)
+                    # Claim batch from buffer
+                    event_ids, events_json = self.buffer.claim_batch_raw(self.config.batch_size)
 
-                    if batch:
-                        result = await self._send_batch(client, batch)
-                        if self._handle_batch_result(batch, result):
+                    if event_ids:
+                        result = await self._send_batch(client, event_ids, events_json)
+                        if self._handle_batch_result(event_ids, result):
                             retry_delay = self.config.retry_backoff_seconds
                         else:
                             retry_delay = min(retry_delay * 2, 60.0)
                     else:
                         # No events to send, still check connection
-                        if self._status != ConnectionStatus.CONNECTED:
+                        if self._status != ConnectionStatus.CONNECTED or self._revalidate:
                             await self._check_connection(client)
 
                     # Check for alert notifications (every 30 seconds)
@@ -148,11 +170,14 @@ class HTTPShipper:
                         await self._check_notifications(client)
 
                     # Wait before next batch
-                    wait_time = self.config.batch_interval_seconds if batch else 1.0
+                    wait_time = self.config.batch_interval_seconds if event_ids else 1.0
                     self._stop_event.wait(timeout=wait_time)
 
                 except Exception as e:
                     logger.error(f"Shipper loop error: {e}")
+                    # Put back a claimed batch that was never resolved
+                    if event_ids:
+                        self.buffer.reinsert(event_ids)
                     self.status = ConnectionStatus.ERROR
                     self._last_error = str(e)
                     self._stop_event.wait(timeout=retry_delay)
@@ -160,41 +185,40 @@ class HTTPShipper:
 
     def _handle_batch_result(
         self,
-        batch: list[tuple[int, str, dict]],
+        event_ids: list[int],
         result: SendResult,
     ) -> bool:
         """Apply a send result to the buffer.
 
-        Returns True when the send succeeded (caller can reset its backoff),
-        False otherwise. This is the single place that decides whether events
-        are removed (SUCCESS / PERMANENT) or retried (TRANSIENT), and where
-        poison events exceeding the retry limit are purged so a permanently
-        failing head batch can't block the queue forever.
+        ``event_ids`` must come from ``EventBuffer.claim_batch_raw``. Returns True when
+        the send succeeded (caller can reset its backoff), False otherwise.
+        This is the single place that decides whether claimed events are
+        acknowledged (SUCCESS / PERMANENT) or put back for retry (TRANSIENT),
+        and where poison events exceeding the retry limit are purged so a
+        permanently failing head batch can't block the queue forever.
         """
-        event_ids = [item[0] for item in batch]
-
         if result == SendResult.SUCCESS:
-            self.buffer.remove_events(event_ids)
-            self._events_sent += len(batch)
+            self.buffer.acknowledge(event_ids)
+            self._events_sent += len(event_ids)
             self.status = ConnectionStatus.CONNECTED
+            self._save_server_cache()
             return True
 
         if result == SendResult.PERMANENT:
             # Server will never accept this batch (e.g. 400/413/422); drop it so
             # the queue advances instead of retrying forever.
-            self.buffer.remove_events(event_ids)
-            self._events_failed += len(batch)
+            self.buffer.acknowledge(event_ids)
+            self._events_failed += len(event_ids)
             logger.warning(
-                f"Dropped {len(batch)} events after permanent send failure: "
+                f"Dropped {len(event_ids)} events after permanent send failure: "
                 f"{self._last_error}"
             )
             return False
 
-        # TRANSIENT - mark as failed and retry later.
-        self.buffer.increment_attempts(event_ids)
-        self._events_failed += len(batch)
-        # Purge poison events that have exceeded the retry limit.
-        dropped = self.buffer.remove_stale_events(self.config.retry_max_attempts)
+        # TRANSIENT - put back with one more attempt and retry later, purging
+        # poison events that have reached the retry limit.
+        self._events_failed += len(event_ids)
+        dropped = self.buffer.reinsert(event_ids, self.config.retry_max_attempts)
         if dropped:
             logger.warning(
                 f"Dropped {dropped} stale event(s) exceeding "
@@ -205,10 +229,14 @@ class HTTPShipper:
     async def _send_batch(
         self,
         client: httpx.AsyncClient,
-        batch: list[tuple[int, str, dict]],
+        event_ids: list[int],
+        events_json: bytes,
     ) -> SendResult:
         """Send a batch of events to the server.
 
+        ``events_json`` is the JSON array from ``EventBuffer.claim_batch_raw``;
+        it is framed into the request body without being decoded.
+
         Returns a SendResult classifying the outcome so the caller can decide
         whether to remove the events (SUCCESS / PERMANENT) or retry (TRANSIENT).
         """
@@ -224,19 +252,13 @@ class HTTPShipper:
         # the same id so the server can dedupe if the prior response was lost.
         batch_id = str(uuid.uuid4())
 
-        # Format events for API
-        events = []
-        for _, event_type, event_data in batch:
-            events.append({
-                "type": event_type,
-                **event_data,
-            })
+        body = b'{"events":' + events_json + b',"batch_id":"' + batch_id.encode("ascii") + b'"}'
 
         try:
             self.status = ConnectionStatus.CONNECTING
             response = await client.post(
                 url,
-                json={"events": events, "batch_id": batch_id},
+                content=body,
                 headers={
                     "Authorization": f"ApiKey {self.config.api_key}",
                     "Content-Type": "application/json",
@@ -249,7 +271,7 @@ class HTTPShipper:
 
             if status == 200:
                 self._last_send_time = time.time()
-                logger.debug(f"Sent {len(events)} events successfully")
+                logger.debug(f"Sent {len(event_ids)} events successfully")
                 return SendResult.SUCCESS
             elif status == 401:
                 logger.error("Authentication failed - check API key")
@@ -294,11 +316,13 @@ class HTTPShipper:
 
     async def _check_connection(self, client: httpx.AsyncClient) -> bool:
         """Check connection to server."""
+        self._revalidate = False
         try:
             url = f"{self.config.server_url}/health"
             response = await client.get(url, timeout=5.0)
             if response.status_code == 200:
                 self.status = ConnectionStatus.CONNECTED
+                self._save_server_cache()
                 return True
         except Exception:
             pass
@@ -306,6 +330,36 @@ class HTTPShipper:
         self.status = ConnectionStatus.DISCONNECTED
         return False
 
+    def _load_server_cache(self) -> bool:
+        """Return True if the server was reachable within SERVER_CACHE_TTL_SECONDS."""
+        try:
+            with open(self._server_cache_path, "r") as f:
+                data = json.load(f)
+            return (
+                data.get("server_url") == self.config.server_url
+                and time.time() - float(data.get("last_ok_ts", 0)) < SERVER_CACHE_TTL_SECONDS
+            )
+        except (OSError, ValueError, TypeError, AttributeError):
+            return False
+
+    def _save_server_cache(self) -> None:
+        """Record that the server is reachable (at most once per write interval)."""
+        now = time.time()
+        if (
+            self._server_cache_written
+            and now - self._server_cache_written < SERVER_CACHE_WRITE_INTERVAL_SECONDS
+        ):
+            return
+        self._server_cache_written = now
+        # Write to a temp file and swap it in so a crash can't leave it truncated
+        tmp_path = self._server_cache_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"server_url": self.config.server_url, "last_ok_ts": now}, f)
+            os.replace(tmp_path, self._server_cache_path)
+        except OSError as e:
+            logger.debug(f"Failed to write server cache: {e}")
+
     async def _check_notifications(self, client: httpx.AsyncClient) -> None:
         """Poll server for pending notifications."""
         if not self.on_notification or not self.config.api_key:
@@ -375,6 +429,7 @@ class HTTPShipper:
             "events_sent": self._events_sent,
             "events_failed": self._events_failed,
             "events_buffered": self.buffer.count(),
+            "events_dropped": self.buffer.dropped_events,
             "last_send_time": self._last_send_time,
             "last_error": self._last_error,
         }
@@ -134,7 +134,7 @@ class LogFileHandler(FileSystemEventHandler):
         timestamp = datetime.utcnow().isoformat() + "Z"
 
         for line in lines:
-            event = LogEvent(
+            event = LogEvent.acquire(
                 timestamp=timestamp,
                 hostname=self.hostname,
                 source="lognog-in",
@@ -2,7 +2,6 @@
 
 import logging
 import sys
-import threading
 import tkinter as tk
 from tkinter import ttk, filedialog
 from pathlib import Path
@@ -13,6 +12,7 @@ import urllib.error
 import json
 
 from .config import Config, WatchPath
+from .gui import get_ui_root, run_on_ui_thread
 
 logger = logging.getLogger(__name__)
 
@@ -51,8 +51,7 @@ class SetupWizard:
         self.config = config
         self.on_complete = on_complete
         self.on_skip = on_skip
-        self.window: Optional[tk.Tk] = None
-        self._thread: Optional[threading.Thread] = None
+        self.window: Optional[tk.Toplevel] = None
         self.current_step = 0
 
         # Collected data
@@ -69,21 +68,24 @@ class SetupWizard:
         }
 
     def show(self) -> None:
-        """Show the setup wizard."""
+        """Show the setup wizard (callable from any thread)."""
+        run_on_ui_thread(self._show)
+
+    def _show(self) -> None:
+        """Raise the wizard, creating it if needed (UI thread)."""
         if self.window is not None:
             try:
                 self.window.lift()
                 self.window.focus_force()
                 return
             except tk.TclError:
-                pass
+                self.window = None
 
-        self._thread = threading.Thread(target=self._create_window, daemon=True)
-        self._thread.start()
+        self._create_window()
 
     def _create_window(self) -> None:
-        """Create and run the wizard window."""
-        self.window = tk.Tk()
+        """Create the wizard window on the shared UI root."""
+        self.window = tk.Toplevel(get_ui_root())
         self.window.title("LogNog In Setup")
         self.window.geometry("550x480")
         self.window.resizable(False, False)
@@ -118,7 +120,6 @@ class SetupWizard:
         self._render_step()
 
         self.window.protocol("WM_DELETE_WINDOW", self._on_close)
-        self.window.mainloop()
 
     def _on_close(self) -> None:
         """Handle window close."""
@@ -313,7 +314,7 @@ class SetupWizard:
         """Test server connection."""
         url = self.server_var.get().strip().rstrip("/")
         self.server_status.configure(text="Testing connection...", foreground="#666666")
-        self.window.update()
+        self.window.update_idletasks()
 
         try:
             req = urllib.request.Request(f"{url}/health", method="GET")
@@ -647,7 +648,7 @@ class SetupWizard:
             self.verify_result.configure(text=f"Cannot reach server: {e}", foreground="#cc0000")
             return
 
-        self.window.update()
+        self.window.update_idletasks()
 
         # Check 2: API key valid
         try:
@@ -673,7 +674,7 @@ class SetupWizard:
             self.verify_result.configure(text=f"Auth check error: {e}", foreground="#cc0000")
             return
 
-        self.window.update()
+        self.window.update_idletasks()
 
         # Check 3: Send test log
         try:
@@ -1,12 +1,24 @@
 """Tests for event buffer module."""
 
 import json
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
 import pytest
 
-from lognog_in.buffer import EventBuffer, LogEvent, FIMEvent
+from lognog_in.buffer import EventBuffer, LogEvent, FIMEvent, utc_now_iso
+
+
+def test_utc_now_iso_matches_datetime_format():
+    """utc_now_iso produces the same shape and time as datetime.utcnow()."""
+    before = datetime.utcnow()
+    value = utc_now_iso()
+    after = datetime.utcnow()
+
+    parsed = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f")
+    assert before.replace(microsecond=0) <= parsed <= after
 
 
 class TestLogEvent:
@@ -32,6 +44,60 @@ class TestLogEvent:
         assert result["message"] == "Test log message"
         assert result["metadata"] == {"key": "value"}
 
+    def test_to_json_round_trip(self):
+        """Test that to_json serializes every field."""
+        event = LogEvent(
+            timestamp="2024-01-15T10:30:00Z",
+            hostname="testhost",
+            source="app.log",
+            source_type="file",
+            file_path="/var/log/app.log",
+            message="Test log message",
+            metadata={"key": "value"},
+        )
+
+        assert json.loads(event.to_json()) == event.to_dict()
+
+    def test_acquire_reuses_released_instance(self):
+        """Test that a released event is handed back out by acquire."""
+        event = LogEvent.acquire(
+            timestamp="2024-01-15T10:30:00Z",
+            hostname="testhost",
+            source="app.log",
+            source_type="file",
+            file_path="/var/log/app.log",
+            message="First",
+            metadata={"key": "value"},
+        )
+        event.release()
+        event.release()  # Double release must not pool the instance twice
+
+        reused = LogEvent.acquire(
+            timestamp="2024-01-15T10:31:00Z",
+            hostname="otherhost",
+            source="app.log",
+            source_type="file",
+            file_path="/var/log/other.log",
+            message="Second",
+            metadata={},
+        )
+
+        assert reused is event
+        assert reused.message == "Second"
+        assert reused.hostname == "otherhost"
+        assert reused.metadata == {}
+
+        another = LogEvent.acquire(
+            timestamp="2024-01-15T10:32:00Z",
+            hostname="testhost",
+            source="app.log",
+            source_type="file",
+            file_path="/var/log/app.log",
+            message="Third",
+            metadata={},
+        )
+        assert another is not reused
+
     def test_from_dict(self):
         """Test creating from dictionary."""
         data = {
@@ -124,6 +190,13 @@ class TestEventBuffer:
         assert event_id > 0
         assert buffer.count() == 1
 
+    def test_uses_wal_journal(self, tmp_path: Path):
+        """The buffer database is switched to WAL mode on init."""
+        buffer = EventBuffer(tmp_path / "buffer.db")
+
+        mode = buffer._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
     def test_add_multiple_events(self, tmp_path: Path):
         """Test adding multiple events."""
         db_path = tmp_path / "buffer.db"
@@ -284,14 +357,14 @@ class TestEventBuffer:
 
         # Insert rows directly with descending created_at timestamps so that an
         # ORDER BY created_at would reverse them relative to id order.
-        with buffer._get_connection() as conn:
-            for i in range(5):
-                # i=0 -> "2024-...09", i=4 -> "2024-...05" (descending)
-                conn.execute(
-                    "INSERT INTO events (event_type, data, created_at) VALUES (?, ?, ?)",
-                    ("log", json.dumps({"message": f"Message {i}"}), f"2024-01-15T10:30:0{9 - i}Z"),
-                )
-            conn.commit()
+        conn = buffer._conn
+        for i in range(5):
+            # i=0 -> "2024-...09", i=4 -> "2024-...05" (descending)
+            conn.execute(
+                "INSERT INTO events (event_type, data, created_at) VALUES (?, ?, ?)",
+                ("log", json.dumps({"message": f"Message {i}"}), f"2024-01-15T10:30:0{9 - i}Z"),
+            )
+        conn.commit()
 
         batch = buffer.get_batch(batch_size=5)
 
@@ -299,6 +372,237 @@ class TestEventBuffer:
         messages = [item[2]["message"] for item in batch]
         assert messages == [f"Message {i}" for i in range(5)]
 
+    def test_claim_batch_removes_and_reinsert_restores(self, tmp_path: Path):
+        """Claimed events leave the table and come back on reinsert."""
+        db_path = tmp_path / "buffer.db"
+        buffer = EventBuffer(db_path)
+
+        for i in range(5):
+            event = LogEvent(
+                timestamp=f"2024-01-15T10:30:0{i}Z",
+                hostname="testhost",
+                source="app.log",
+                source_type="file",
+                file_path="/var/log/app.log",
+                message=f"Message {i}",
+                metadata={},
+            )
+            buffer.add_log_event(event)
+
+        batch = buffer.claim_batch(batch_size=3)
+        assert [item[2]["message"] for item in batch] == ["Message 0", "Message 1", "Message 2"]
+        # Claimed events are no longer handed out but still counted
+        assert buffer.get_batch(batch_size=5)[0][2]["message"] == "Message 3"
+        assert buffer.count() == 5
+
+        dropped = buffer.reinsert([item[0] for item in batch], max_attempts=5)
+        assert dropped == 0
+        assert [item[2]["message"] for item in buffer.get_batch(batch_size=5)] == [
+            f"Message {i}" for i in range(5)
+        ]
+
+        batch = buffer.claim_batch(batch_size=2)
+        buffer.acknowledge([item[0] for item in batch])
+        assert buffer.count() == 3
+
+    def test_claim_batch_raw_frames_events_with_type(self, tmp_path: Path):
+        """The raw claim is a JSON array carrying each event's type."""
+        buffer = EventBuffer(tmp_path / "buffer.db")
+        log_id = buffer.add_log_event(LogEvent(
+            timestamp="2024-01-15T10:30:00Z",
+            hostname="testhost",
+            source="app.log",
+            source_type="file",
+            file_path="/var/log/app.log",
+            message="Hello",
+            metadata={},
+        ))
+        fim_id = buffer.add_fim_event(FIMEvent(
+            timestamp="2024-01-15T10:30:00Z",
+            hostname="testhost",
+            source="fim",
+            source_type="fim",
+            event_type="modified",
+            file_path="/etc/passwd",
+            previous_hash="abc",
+            current_hash="def",
+            file_owner="root",
+            file_permissions="644",
+            metadata={},
+        ))
+
+        event_ids, events_json = buffer.claim_batch_raw(batch_size=10)
+        events = json.loads(events_json)
+        assert event_ids == [log_id, fim_id]
+        assert [event["type"] for event in events] == ["log", "fim"]
+        assert events[0]["message"] == "Hello"
+        assert events[1]["event_type"] == "modified"
+        assert buffer.claim_batch_raw(batch_size=10) == ([], b"[]")
+
+    def test_close_restores_unacknowledged_claims(self, tmp_path: Path):
+        """A claim still outstanding at close is written back to disk."""
+        db_path = tmp_path / "buffer.db"
+        buffer = EventBuffer(db_path)
+        event = LogEvent(
+            timestamp="2024-01-15T10:30:00Z",
+            hostname="testhost",
+            source="app.log",
+            source_type="file",
+            file_path="/var/log/app.log",
+            message="In flight",
+            metadata={},
+        )
+        buffer.add_log_event(event)
+        buffer.claim_batch(batch_size=1)
+        buffer.close()
+
+        reopened = EventBuffer(db_path)
+        assert reopened.count() == 1
+        assert reopened.get_batch(1)[0][2]["message"] == "In flight"
+
+    def test_max_events_drops_oldest(self, tmp_path: Path):
+        """Writes beyond max_events evict the oldest events."""
+        db_path = tmp_path / "buffer.db"
+        buffer = EventBuffer(db_path, max_events=3)
+
+        for i in range(5):
+            event = LogEvent(
+                timestamp=f"2024-01-15T10:30:0{i}Z",
+                hostname="testhost",
+                source="app.log",
+                source_type="file",
+                file_path="/var/log/app.log",
+                message=f"Message {i}",
+                metadata={},
+            )
+            buffer.add_log_event(event)
+
+        assert buffer.count() == 3
+        assert buffer.dropped_events == 2
+        messages = [item[2]["message"] for item in buffer.get_batch(batch_size=5)]
+        assert messages == ["Message 2", "Message 3", "Message 4"]
+
+    def test_failed_write_is_rolled_back(self, tmp_path: Path):
+        """A batch that fails part-way leaves nothing behind for the next commit."""
+        db_path = tmp_path / "buffer.db"
+        buffer = EventBuffer(db_path)
+        existing = buffer.add_log_event(LogEvent(
+            timestamp="2024-01-15T10:30:00Z",
+            hostname="testhost",
+            source="app.log",
+            source_type="file",
+            file_path="/var/log/app.log",
+            message="Existing",
+            metadata={},
+        ))
+        buffer.flush()
+
+        # The second row collides with the stored event after the first inserted
+        rows = [
+            (existing + 1, "log", b"{}", "2024-01-15T10:30:01Z"),
+            (existing, "log", b"{}", "2024-01-15T10:30:02Z"),
+        ]
+        with pytest.raises(Exception):
+            buffer._write_rows(rows)
+
+        # A later successful batch must not commit the failed batch's first row
+        buffer.add_log_event(LogEvent(
+            timestamp="2024-01-15T10:30:03Z",
+            hostname="testhost",
+            source="app.log",
+            source_type="file",
+            file_path="/var/log/app.log",
+            message="Later",
+            metadata={},
+        ))
+        assert buffer.count() == 2
+        buffer.close()
+
+        reopened = EventBuffer(db_path)
+        assert reopened.count() == 2
+        reopened.close()
+
+    def test_failed_batch_keeps_good_rows(self, tmp_path: Path):
+        """One bad row in a queued batch drops only that row, and counts it."""
+        buffer = EventBuffer(tmp_path / "buffer.db")
+        existing = buffer.add_log_event(LogEvent(
+            timestamp="2024-01-15T10:30:00Z",
+            hostname="testhost",
+            source="app.log",
+            source_type="file",
+            file_path="/var/log/app.log",
+            message="Existing",
+            metadata={},
+        ))
+        buffer.flush()
+
+        # Queued together, so the writer commits them as one batch
+        with buffer._id_lock:
+            for row in [
+                (existing + 100, "log", b"{}", "2024-01-15T10:30:01Z"),
+                (existing, "log", b"{}", "2024-01-15T10:30:02Z"),
+                (existing + 101, "log", b"{}", "2024-01-15T10:30:03Z"),
+            ]:
+                buffer._write_queue.put(row)
+        buffer.flush()
+
+        assert buffer.count() == 3
+        assert buffer.dropped_events == 1
+        buffer.close()
+
+    def test_flush_waits_only_for_earlier_events(self, tmp_path: Path):
+        """A steady producer cannot hold flush() up past its own events."""
+        db_path = tmp_path / "buffer.db"
+        buffer = EventBuffer(db_path)
+
+        # Slow the writer down so the producer keeps the queue non-empty
+        write_rows = buffer._write_rows
+
+        def slow_write_rows(rows):
+            time.sleep(0.01)
+            write_rows(rows)
+
+        buffer._write_rows = slow_write_rows
+
+        def make_event() -> LogEvent:
+            return LogEvent(
+                timestamp="2024-01-15T10:30:00Z",
+                hostname="testhost",
+                source="app.log",
+                source_type="file",
+                file_path="/var/log/app.log",
+                message="Message",
+                metadata={},
+            )
+
+        stop = threading.Event()
+
+        def produce():
+            while not stop.is_set():
+                buffer.add_log_event(make_event())
+                time.sleep(0.001)
+
+        buffer.add_log_event(make_event())
+        producer = threading.Thread(target=produce)
+        producer.start()
+        time.sleep(0.05)
+        flusher = threading.Thread(target=buffer.flush)
+        flusher.start()
+        flusher.join(timeout=2.0)
+        flushed = not flusher.is_alive()
+
+        stop.set()
+        producer.join()
+        flusher.join()
+        buffer.close()
+
+        assert flushed
+
+    def test_flush_after_close_returns(self, tmp_path: Path):
+        buffer = EventBuffer(tmp_path / "buffer.db")
+        buffer.close()
+        buffer.flush()
+
     def test_clear(self, tmp_path: Path):
         """Test clearing all events."""
         db_path = tmp_path / "buffer.db"
@@ -338,6 +642,7 @@ class TestEventBuffer:
             metadata={},
         )
         buffer1.add_log_event(event)
+        buffer1.close()
 
         # Create new buffer instance
         buffer2 = EventBuffer(db_path)
@@ -345,3 +650,49 @@ class TestEventBuffer:
 
         batch = buffer2.get_batch(1)
         assert batch[0][2]["message"] == "Persistent message"
+
+    def test_close_flushes_pending_events(self, tmp_path: Path):
+        """Events queued for the writer thread are committed on close."""
+        db_path = tmp_path / "buffer.db"
+        buffer = EventBuffer(db_path)
+
+        for i in range(50):
+            event = LogEvent(
+                timestamp="2024-01-15T10:30:00Z",
+                hostname="testhost",
+                source="app.log",
+                source_type="file",
+                file_path="/var/log/app.log",
+                message=f"Message {i}",
+                metadata={},
+            )
+            buffer.add_log_event(event)
+        buffer.close()
+
+        reopened = EventBuffer(db_path)
+        assert reopened.count() == 50
+        batch = reopened.get_batch(batch_size=50)
+        assert [item[2]["message"] for item in batch] == [f"Message {i}" for i in range(50)]
+
+    def test_ids_not_reused_after_removal(self, tmp_path: Path):
+        """Ids allocated by the buffer keep increasing across instances."""
+        db_path = tmp_path / "buffer.db"
+
+        def make_event() -> LogEvent:
+            return LogEvent(
+                timestamp="2024-01-15T10:30:00Z",
+                hostname="testhost",
+                source="app.log",
+                source_type="file",
+                file_path="/var/log/app.log",
+                message="Test",
+                metadata={},
+            )
+
+        buffer1 = EventBuffer(db_path)
+        first_id = buffer1.add_log_event(make_event())
+        buffer1.remove_events([first_id])
+        buffer1.close()
+
+        buffer2 = EventBuffer(db_path)
+        assert buffer2.add_log_event(make_event()) > first_id
@@ -1,11 +1,12 @@
 """Tests for configuration module."""
 
+import os
 import tempfile
 from pathlib import Path
 
 import pytest
 
-from lognog_in.config import Config, WatchPath, FIMPath
+from lognog_in.config import Config, WatchPath, FIMPath, ensure_dir
 
 
 class TestConfig:
@@ -118,3 +119,38 @@ class TestFIMPath:
         assert fp.pattern == "*"
         assert fp.recursive is True
         assert fp.enabled is True
+
+
+def test_load_uses_cache_until_yaml_changes(tmp_path: Path):
+    """The JSON cache written by save is used until the YAML is edited."""
+    config_path = tmp_path / "config.yaml"
+    Config(server_url="http://cached:4000", api_key="key").save(config_path)
+    assert (tmp_path / "config.cache.json").exists()
+    assert Config.load(config_path).server_url == "http://cached:4000"
+
+    text = config_path.read_text().replace("http://cached:4000", "http://edited:4000")
+    config_path.write_text(text + "\n")
+    assert Config.load(config_path).server_url == "http://edited:4000"
+
+
+def test_load_ignores_cache_after_same_size_edit(tmp_path: Path):
+    """An edit that keeps the size and mtime still invalidates the cache."""
+    config_path = tmp_path / "config.yaml"
+    Config(server_url="http://cached:4000", api_key="key").save(config_path)
+    stat = config_path.stat()
+
+    text = config_path.read_text().replace("http://cached:4000", "http://edited:4000")
+    config_path.write_text(text)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert config_path.stat().st_size == stat.st_size
+    assert Config.load(config_path).server_url == "http://edited:4000"
+
+
+def test_ensure_dir_creates_nested_directory(tmp_path: Path):
+    """ensure_dir creates missing parents and tolerates repeat calls."""
+    target = tmp_path / "a" / "b"
+
+    ensure_dir(target)
+    ensure_dir(target)
+
+    assert target.is_dir()
@@ -1,7 +1,11 @@
 """Tests for File Integrity Monitoring module."""
 
+import gc
 import os
+import sqlite3
 import tempfile
+import threading
+import time
 from pathlib import Path
 
 import pytest
@@ -9,9 +13,17 @@ import pytest
 from lognog_in.config import Config, FIMPath
 from lognog_in.buffer import FIMEvent
 from lognog_in.fim import (
+    _iter_matching_files,
+    baseline_still_matches,
+    compile_pattern,
     compute_file_hash,
     get_file_metadata,
+    hash_backend,
+    hash_file_with_stat,
+    metadata_from_stat,
+    stat_matches_baseline,
     BaselineDatabase,
+    FIMHandler,
     FileIntegrityMonitor,
 )
 
@@ -31,6 +43,17 @@ class TestComputeFileHash:
         # SHA-256 hash is 64 hex characters
         assert len(hash_result) == len("sha256:") + 64
 
+    def test_hash_large_file_matches_hashlib(self, tmp_path: Path):
+        """Files hashed through mmap give the same digest as hashlib."""
+        import hashlib
+
+        data = os.urandom(1024) * 1100  # just over the 1 MiB mmap threshold
+        test_file = tmp_path / "large.bin"
+        test_file.write_bytes(data)
+
+        result = compute_file_hash(str(test_file))
+        assert result == f"sha256:{hashlib.sha256(data).hexdigest()}"
+
     def test_hash_nonexistent_file(self):
         """Test hashing a nonexistent file."""
         result = compute_file_hash("/nonexistent/file/path")
@@ -63,6 +86,47 @@ class TestComputeFileHash:
         assert hash1 == hash2
 
 
+def test_hash_backend_reports_implementation():
+    """hash_backend names OpenSSL or the builtin fallback."""
+    backend = hash_backend("sha256")
+    assert backend == "builtin" or backend.startswith(("OpenSSL", "LibreSSL"))
+    assert hash_backend("not-a-real-digest") == "unavailable"
+
+
+def test_blake3_hash_is_prefixed(tmp_path: Path):
+    """BLAKE3 hashes carry their own prefix when the package is installed."""
+    pytest.importorskip("blake3")
+    test_file = tmp_path / "test.txt"
+    test_file.write_text("Hello, World!")
+
+    result = compute_file_hash(str(test_file), "blake3")
+    assert result.startswith("blake3:")
+    assert len(result) == len("blake3:") + 64
+
+
+def test_blake3_baseline_without_package(tmp_path: Path, monkeypatch):
+    """Without the blake3 package, blake3 baselines are migrated, not reported."""
+    monkeypatch.setattr("lognog_in.fim.HAS_BLAKE3", False)
+    test_file = tmp_path / "test.txt"
+    test_file.write_text("Hello, World!")
+    current_hash = compute_file_hash(str(test_file))
+
+    assert hash_file_with_stat(str(test_file), "blake3") == (None, None)
+    assert baseline_still_matches(str(test_file), "blake3:" + "0" * 64, current_hash)
+
+
+def test_hash_file_with_stat(tmp_path: Path):
+    """Hashing also returns the file's stat result."""
+    test_file = tmp_path / "test.txt"
+    test_file.write_text("Hello, World!")
+
+    file_hash, stat_info = hash_file_with_stat(str(test_file))
+    assert file_hash == compute_file_hash(str(test_file))
+    assert stat_info.st_size == 13
+
+    assert hash_file_with_stat("/nonexistent/file") == (None, None)
+
+
 class TestGetFileMetadata:
     """Tests for get_file_metadata function."""
 
@@ -84,6 +148,70 @@ class TestGetFileMetadata:
         metadata = get_file_metadata("/nonexistent/file")
         assert metadata == {}
 
+    def test_metadata_from_stat_matches(self, tmp_path: Path):
+        """Metadata built from a stat result matches a fresh lookup."""
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("Test content")
+
+        assert metadata_from_stat(os.stat(test_file)) == get_file_metadata(str(test_file))
+
+
+def test_stat_matches_baseline_skips_racy_files(tmp_path: Path):
+    """Only files with an mtime safely in the past get the fast path."""
+    test_file = tmp_path / "test.txt"
+    test_file.write_text("Test content")
+
+    racy = metadata_from_stat(os.stat(test_file))
+    assert "mtime_ns" not in racy
+    assert not stat_matches_baseline(os.stat(test_file), racy)
+
+    os.utime(test_file, ns=(1_000_000_000, 1_000_000_000))
+    settled = metadata_from_stat(os.stat(test_file))
+    assert settled["mtime_ns"] == 1_000_000_000
+    assert stat_matches_baseline(os.stat(test_file), settled)
+
+    test_file.write_text("Other content")
+    assert not stat_matches_baseline(os.stat(test_file), settled)
+
+
+def test_stat_matches_baseline_catches_restored_mtime(tmp_path: Path):
+    """A same-size edit that sets the mtime back still changes the ctime."""
+    test_file = tmp_path / "test.txt"
+    test_file.write_text("Test content")
+    os.utime(test_file, ns=(1_000_000_000, 1_000_000_000))
+    settled = metadata_from_stat(os.stat(test_file))
+    assert "ctime_ns" in settled
+
+    time.sleep(0.01)
+    test_file.write_text("Tost content")
+    os.utime(test_file, ns=(1_000_000_000, 1_000_000_000))
+    assert not stat_matches_baseline(os.stat(test_file), settled)
+
+
+def test_compile_pattern_matches_like_fnmatch():
+    """Compiled patterns agree with fnmatch.fnmatch."""
+    import fnmatch
+
+    for pattern in ("*.conf", "hosts", "[!.]*.ini", "log?.txt"):
+        compiled = compile_pattern(pattern)
+        for name in ("app.conf", "hosts", ".hidden.ini", "x.ini", "log1.txt", "log10.txt"):
+            assert (compiled.match(name) is not None) == fnmatch.fnmatch(name, pattern)
+
+
+def test_iter_matching_files(tmp_path: Path):
+    """The scandir walk finds the same files as Path.glob/rglob."""
+    (tmp_path / "sub" / "deeper").mkdir(parents=True)
+    for name in ("a.conf", "b.txt", "sub/c.conf", "sub/deeper/d.conf"):
+        (tmp_path / name).write_text("x")
+    (tmp_path / "dir.conf").mkdir()
+
+    pattern = compile_pattern("*.conf")
+    recursive = set(_iter_matching_files(str(tmp_path), pattern, recursive=True))
+    flat = set(_iter_matching_files(str(tmp_path), pattern, recursive=False))
+
+    assert recursive == {str(p) for p in tmp_path.rglob("*.conf") if p.is_file()}
+    assert flat == {str(tmp_path / "a.conf")}
+
 
 class TestBaselineDatabase:
     """Tests for BaselineDatabase class."""
@@ -119,6 +247,137 @@ class TestBaselineDatabase:
         assert hash_val == "sha256:def456"
         assert metadata["size"] == 200
 
+    def test_set_baselines_bulk(self, tmp_path: Path):
+        """Test setting many baselines at once, updating existing rows."""
+        db = BaselineDatabase(tmp_path / "baseline.db")
+
+        db.set_baseline("/etc/a.conf", "sha256:old", {"size": 1})
+        db.set_baselines_bulk([
+            ("/etc/a.conf", "sha256:aaa", {"size": 10}),
+            ("/etc/b.conf", "sha256:bbb", {"size": 20}),
+        ])
+
+        baselines = {path: (h, meta) for path, h, meta in db.get_all_baselines()}
+        assert baselines == {
+            "/etc/a.conf": ("sha256:aaa", {"size": 10}),
+            "/etc/b.conf": ("sha256:bbb", {"size": 20}),
+        }
+
+    def test_database_uses_wal(self, tmp_path: Path):
+        """The baseline database runs in WAL mode."""
+        db_path = tmp_path / "baseline.db"
+        BaselineDatabase(db_path)
+
+        conn = sqlite3.connect(str(db_path))
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        finally:
+            conn.close()
+
+    def test_get_all_baselines_by_fim_path(self, tmp_path: Path):
+        """Baselines can be listed for a single watched path."""
+        db = BaselineDatabase(tmp_path / "baseline.db")
+
+        db.set_baselines_bulk([("/etc/a.conf", "sha256:aaa", {})], "/etc")
+        db.set_baseline("/srv/b.conf", "sha256:bbb", {}, "/srv")
+        db.set_baseline("/etc/a.conf", "sha256:ccc", {})  # keeps its owner
+
+        assert [path for path, _, _ in db.get_all_baselines("/etc")] == ["/etc/a.conf"]
+        assert [path for path, _, _ in db.get_all_baselines("/srv")] == ["/srv/b.conf"]
+        assert len(db.get_all_baselines()) == 2
+
+    def test_remove_baselines_bulk(self, tmp_path: Path):
+        """Test removing many baselines at once."""
+        db = BaselineDatabase(tmp_path / "baseline.db")
+
+        db.set_baselines_bulk([
+            ("/etc/a.conf", "sha256:aaa", {}),
+            ("/etc/b.conf", "sha256:bbb", {}),
+            ("/etc/c.conf", "sha256:ccc", {}),
+        ])
+        db.remove_baselines_bulk(["/etc/a.conf", "/etc/c.conf"])
+
+        assert [path for path, _, _ in db.get_all_baselines()] == ["/etc/b.conf"]
+
+    def test_connection_reused_until_close(self, tmp_path: Path):
+        """Each thread keeps one connection until close() drops it."""
+        db = BaselineDatabase(tmp_path / "baseline.db")
+
+        with db._get_connection() as first, db._get_connection() as second:
+            assert first is second
+
+        db.set_baseline("/etc/test.conf", "sha256:abc123", {})
+        db.close()
+        assert db.get_baseline("/etc/test.conf")[0] == "sha256:abc123"
+
+    def test_thread_connections_closed_on_exit(self, tmp_path: Path):
+        """Connections opened by short-lived threads are closed when they exit."""
+        db = BaselineDatabase(tmp_path / "baseline.db")
+        db.set_baseline("/etc/test.conf", "sha256:abc123", {})
+        db.flush()
+
+        for _ in range(40):
+            thread = threading.Thread(target=db.get_baseline, args=("/etc/test.conf",))
+            thread.start()
+            thread.join()
+        gc.collect()
+
+        # The main thread's and the writer thread's connections remain
+        assert len(db._connections) <= 2
+        db.close()
+
+    def test_migrates_rowid_table(self, tmp_path: Path):
+        """Databases from older versions are rebuilt WITHOUT ROWID, keeping rows."""
+        db_path = tmp_path / "baseline.db"
+        conn = sqlite3.connect(str(db_path))
+        try:
+            conn.execute("""
+                CREATE TABLE baselines (
+                    file_path TEXT PRIMARY KEY,
+                    hash TEXT NOT NULL,
+                    metadata TEXT,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+            conn.execute(
+                "INSERT INTO baselines VALUES (?, ?, ?, ?, ?)",
+                ("/etc/old.conf", "sha256:abc", "{}", "2024-01-01", "2024-01-01"),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        db = BaselineDatabase(db_path)
+        assert db.get_baseline("/etc/old.conf") == ("sha256:abc", {})
+
+        conn = sqlite3.connect(str(db_path))
+        try:
+            sql = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE name = 'baselines'"
+            ).fetchone()[0]
+        finally:
+            conn.close()
+        assert "WITHOUT ROWID" in sql
+
+    def test_reads_json_text_metadata(self, tmp_path: Path):
+        """Rows written as JSON text by older versions still load."""
+        db_path = tmp_path / "baseline.db"
+        db = BaselineDatabase(db_path)
+
+        conn = sqlite3.connect(str(db_path))
+        try:
+            conn.execute(
+                "INSERT INTO baselines (file_path, hash, metadata, created_at, updated_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                ("/etc/old.conf", "sha256:abc", '{"size": 5}', "2024-01-01", "2024-01-01"),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        assert db.get_baseline("/etc/old.conf") == ("sha256:abc", {"size": 5})
+
     def test_remove_baseline(self, tmp_path: Path):
         """Test removing a baseline."""
         db = BaselineDatabase(tmp_path / "baseline.db")
@@ -157,12 +416,26 @@ class TestBaselineDatabase:
         baselines = db.get_all_baselines()
         assert len(baselines) == 0
 
+    def test_queued_writes_visible_before_commit(self, tmp_path: Path):
+        """Single-file writes are readable at once and committed in order."""
+        db = BaselineDatabase(tmp_path / "baseline.db")
+
+        db.set_baseline("/etc/a.conf", "sha256:aaa", {})
+        db.remove_baseline("/etc/a.conf")
+        db.set_baseline("/etc/b.conf", "sha256:bbb", {"size": 1})
+        assert db.get_baseline("/etc/a.conf") is None
+        assert db.get_baseline("/etc/b.conf") == ("sha256:bbb", {"size": 1})
+
+        db.flush()
+        assert [path for path, _, _ in db.get_all_baselines()] == ["/etc/b.conf"]
+
     def test_persistence(self, tmp_path: Path):
         """Test that baselines persist across instances."""
         db_path = tmp_path / "baseline.db"
 
         db1 = BaselineDatabase(db_path)
         db1.set_baseline("/etc/test.conf", "sha256:abc123", {"key": "value"})
+        db1.close()
 
         db2 = BaselineDatabase(db_path)
         result = db2.get_baseline("/etc/test.conf")
@@ -171,6 +444,112 @@ class TestBaselineDatabase:
         assert result[0] == "sha256:abc123"
 
 
+class TestFIMHandler:
+    """Tests for FIMHandler class."""
+
+    def test_modify_burst_is_coalesced(self, tmp_path: Path, monkeypatch):
+        """A burst of modify events produces a single hash and event."""
+        import time
+
+        from watchdog.events import FileModifiedEvent
+
+        monkeypatch.setattr("lognog_in.fim.MODIFY_DEBOUNCE_SECONDS", 0.05)
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("before")
+
+        db = BaselineDatabase(tmp_path / "baseline.db")
+        db.set_baseline(str(test_file), compute_file_hash(str(test_file)), {})
+        events = []
+        handler = FIMHandler(
+            fim_path=FIMPath(path=str(tmp_path), pattern="*.txt"),
+            hostname="testhost",
+            baseline_db=db,
+            on_event=events.append,
+        )
+
+        test_file.write_text("after")
+        for _ in range(5):
+            handler.on_modified(FileModifiedEvent(str(test_file)))
+
+        deadline = time.monotonic() + 2.0
+        while not events and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.1)
+
+        assert len(events) == 1
+        assert events[0].event_type == "modified"
+        assert events[0].current_hash == compute_file_hash(str(test_file))
+
+    def test_modify_check_waits_for_burst_to_end(self, tmp_path: Path, monkeypatch):
+        """Events during the quiet period push the check back, so a slow write is hashed once."""
+        from watchdog.events import FileModifiedEvent
+
+        monkeypatch.setattr("lognog_in.fim.MODIFY_DEBOUNCE_SECONDS", 0.1)
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("before")
+
+        db = BaselineDatabase(tmp_path / "baseline.db")
+        db.set_baseline(str(test_file), compute_file_hash(str(test_file)), {})
+        events = []
+        handler = FIMHandler(
+            fim_path=FIMPath(path=str(tmp_path), pattern="*.txt"),
+            hostname="testhost",
+            baseline_db=db,
+            on_event=events.append,
+        )
+
+        # A write spread over several debounce periods
+        for i in range(8):
+            test_file.write_text(f"part {i}")
+            handler.on_modified(FileModifiedEvent(str(test_file)))
+            time.sleep(0.04)
+
+        deadline = time.monotonic() + 2.0
+        while not events and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.2)
+        handler.cancel_pending()
+
+        assert len(events) == 1
+        assert events[0].current_hash == compute_file_hash(str(test_file))
+
+    def test_modify_checks_reuse_one_connection(self, tmp_path: Path, monkeypatch):
+        """Successive modify checks run on one scheduler thread and its connection."""
+        from watchdog.events import FileModifiedEvent
+
+        monkeypatch.setattr("lognog_in.fim.MODIFY_DEBOUNCE_SECONDS", 0.01)
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("before")
+
+        db = BaselineDatabase(tmp_path / "baseline.db")
+        connecting_threads = []
+        connect = db._connect
+
+        def counting_connect():
+            connecting_threads.append(threading.current_thread().name)
+            return connect()
+
+        monkeypatch.setattr(db, "_connect", counting_connect)
+        events = []
+        handler = FIMHandler(
+            fim_path=FIMPath(path=str(tmp_path), pattern="*.txt"),
+            hostname="testhost",
+            baseline_db=db,
+            on_event=events.append,
+        )
+
+        for i in range(5):
+            test_file.write_text(f"version {i}")
+            handler.on_modified(FileModifiedEvent(str(test_file)))
+            deadline = time.monotonic() + 2.0
+            while len(events) <= i and time.monotonic() < deadline:
+                time.sleep(0.01)
+        handler.cancel_pending()
+
+        assert len(events) == 5
+        assert connecting_threads.count("lognog-fim-modify") == 1
+
+
 class TestFileIntegrityMonitor:
     """Tests for FileIntegrityMonitor class."""
 
@@ -257,6 +636,62 @@ class TestFileIntegrityMonitor:
         finally:
             Config.get_data_dir = original_get_data_dir
 
+    def test_verify_baseline_migrates_algorithm_without_events(self, tmp_path: Path):
+        """Switching the hash algorithm re-baselines unchanged files silently."""
+        monitored_dir = tmp_path / "monitored"
+        monitored_dir.mkdir()
+        test_file = monitored_dir / "test.txt"
+        test_file.write_text("Content")
+
+        config = Config(
+            hostname="testhost",
+            fim_enabled=True,
+            fim_paths=[
+                FIMPath(path=str(monitored_dir), pattern="*.txt", recursive=False),
+            ],
+        )
+
+        original_get_data_dir = Config.get_data_dir
+        Config.get_data_dir = staticmethod(lambda: tmp_path / "data")
+
+        try:
+            monitor = FileIntegrityMonitor(config, on_event=lambda e: None)
+            monitor.build_baseline()
+
+            monitor.hash_algorithm = "sha512"
+            assert monitor.verify_baseline() == []
+
+            baseline_hash, _ = monitor.baseline_db.get_baseline(str(test_file))
+            assert baseline_hash.startswith("sha512:")
+        finally:
+            Config.get_data_dir = original_get_data_dir
+
+    def test_verify_baseline_skips_hash_for_unchanged_stat(self, tmp_path: Path, monkeypatch):
+        """Files whose size and mtime match the baseline are not re-hashed."""
+        monitored_dir = tmp_path / "monitored"
+        monitored_dir.mkdir()
+        test_file = monitored_dir / "test.txt"
+        test_file.write_text("Content")
+        os.utime(test_file, ns=(1_000_000_000, 1_000_000_000))
+
+        config = Config(
+            hostname="testhost",
+            fim_enabled=True,
+            fim_paths=[
+                FIMPath(path=str(monitored_dir), pattern="*.txt", recursive=False),
+            ],
+        )
+        monkeypatch.setattr(Config, "get_data_dir", staticmethod(lambda: tmp_path / "data"))
+
+        monitor = FileIntegrityMonitor(config, on_event=lambda e: None)
+        monitor.build_baseline()
+
+        def fail_hash(*args, **kwargs):
+            raise AssertionError("unchanged file was re-hashed")
+
+        monkeypatch.setattr("lognog_in.fim.hash_file_with_stat", fail_hash)
+        assert monitor.verify_baseline() == []
+
     def test_verify_baseline_detects_deletion(self, tmp_path: Path):
         """Test that verify_baseline detects file deletion."""
         monitored_dir = tmp_path / "monitored"
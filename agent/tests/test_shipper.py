@@ -1,6 +1,7 @@
 """Tests for the HTTP shipper retry / data-loss behavior (issue #42)."""
 
 import asyncio
+import json
 from pathlib import Path
 
 import pytest
@@ -37,14 +38,22 @@ class FakeClient:
         self.status_code = status_code
         self.calls = 0
         self.batch_ids: list[str] = []
+        self.bodies: list[bytes] = []
 
-    async def post(self, url, json=None, headers=None, **kwargs):
+    async def post(self, url, json=None, headers=None, content=None, **kwargs):
         self.calls += 1
+        if content is not None:
+            self.bodies.append(content)
         if headers and "X-Batch-Id" in headers:
             self.batch_ids.append(headers["X-Batch-Id"])
         return FakeResponse(self.status_code)
 
 
+def _raw_batch() -> tuple[list[int], bytes]:
+    events = [{"type": "log", **_make_event(0).to_dict()}]
+    return [1], json.dumps(events).encode("utf-8")
+
+
 def _shipper(tmp_path: Path, **config_kwargs) -> tuple[HTTPShipper, EventBuffer]:
     buffer = EventBuffer(tmp_path / "buffer.db")
     config = Config(api_key="test-key", server_url="http://localhost:4000", **config_kwargs)
@@ -58,42 +67,49 @@ class TestSendBatchClassification:
     def test_200_is_success(self, tmp_path: Path):
         shipper, buffer = _shipper(tmp_path)
         client = FakeClient(200)
-        batch = [(1, "log", _make_event(0).to_dict())]
-        result = asyncio.run(shipper._send_batch(client, batch))
+        result = asyncio.run(shipper._send_batch(client, *_raw_batch()))
         assert result == SendResult.SUCCESS
 
     @pytest.mark.parametrize("status", [400, 413, 422, 404])
     def test_4xx_is_permanent(self, tmp_path: Path, status: int):
         shipper, buffer = _shipper(tmp_path)
         client = FakeClient(status)
-        batch = [(1, "log", _make_event(0).to_dict())]
-        result = asyncio.run(shipper._send_batch(client, batch))
+        result = asyncio.run(shipper._send_batch(client, *_raw_batch()))
         assert result == SendResult.PERMANENT
 
     @pytest.mark.parametrize("status", [408, 429, 500, 502, 503])
     def test_retryable_is_transient(self, tmp_path: Path, status: int):
         shipper, buffer = _shipper(tmp_path)
         client = FakeClient(status)
-        batch = [(1, "log", _make_event(0).to_dict())]
-        result = asyncio.run(shipper._send_batch(client, batch))
+        result = asyncio.run(shipper._send_batch(client, *_raw_batch()))
         assert result == SendResult.TRANSIENT
 
     def test_401_is_transient(self, tmp_path: Path):
         shipper, buffer = _shipper(tmp_path)
         client = FakeClient(401)
-        batch = [(1, "log", _make_event(0).to_dict())]
-        result = asyncio.run(shipper._send_batch(client, batch))
+        result = asyncio.run(shipper._send_batch(client, *_raw_batch()))
         assert result == SendResult.TRANSIENT
 
     def test_batch_id_header_sent_and_stable_within_attempt(self, tmp_path: Path):
         """Each send carries an X-Batch-Id idempotency header."""
         shipper, buffer = _shipper(tmp_path)
         client = FakeClient(200)
-        batch = [(1, "log", _make_event(0).to_dict())]
-        asyncio.run(shipper._send_batch(client, batch))
+        asyncio.run(shipper._send_batch(client, *_raw_batch()))
         assert len(client.batch_ids) == 1
         assert client.batch_ids[0]  # non-empty UUID string
 
+    def test_body_frames_buffered_events(self, tmp_path: Path):
+        """The request body wraps the claimed events with the batch id."""
+        shipper, buffer = _shipper(tmp_path)
+        buffer.add_log_event(_make_event(0))
+        client = FakeClient(200)
+        asyncio.run(shipper._send_batch(client, *buffer.claim_batch_raw(10)))
+
+        body = json.loads(client.bodies[0])
+        assert body["batch_id"] == client.batch_ids[0]
+        assert body["events"][0]["type"] == "log"
+        assert body["events"][0]["message"] == "Message 0"
+
 
 class TestPoisonBatchPurge:
     """A permanently-failing (transient) head batch must eventually be purged."""
@@ -112,27 +128,26 @@ class TestPoisonBatchPurge:
         # failing repeatedly. After retry_max_attempts transient failures the
         # stale-purge should drop it so the queue can advance.
         for _ in range(5):
-            batch = buffer.get_batch(shipper.config.batch_size)
-            assert batch, "buffer should not be empty while poison event remains"
-            head_id = batch[0][0]
+            event_ids, events_json = buffer.claim_batch_raw(shipper.config.batch_size)
+            assert event_ids, "buffer should not be empty while poison event remains"
+            head_id = event_ids[0]
             if head_id != poison_id:
                 # Poison event was purged; the head is now the good event.
                 break
-            result = asyncio.run(shipper._send_batch(failing_client, batch))
+            result = asyncio.run(shipper._send_batch(failing_client, event_ids, events_json))
             assert result == SendResult.TRANSIENT
-            shipper._handle_batch_result(batch, result)
+            shipper._handle_batch_result(event_ids, result)
         else:
             pytest.fail("poison event was never purged")
 
         # Poison event is gone; the good event survives and is next in line.
-        batch = buffer.get_batch(shipper.config.batch_size)
-        assert batch[0][0] == good_id
+        assert event_ids[0] == good_id
 
         # Now the server recovers; the good event ships successfully.
         ok_client = FakeClient(200)
-        result = asyncio.run(shipper._send_batch(ok_client, batch))
+        result = asyncio.run(shipper._send_batch(ok_client, event_ids, events_json))
         assert result == SendResult.SUCCESS
-        shipper._handle_batch_result(batch, result)
+        shipper._handle_batch_result(event_ids, result)
         assert buffer.count() == 0
 
 
@@ -147,12 +162,12 @@ class TestPermanentFailureDrops:
         assert buffer.count() == 3
 
         bad_client = FakeClient(422)  # permanent
-        batch = buffer.get_batch(shipper.config.batch_size)
-        result = asyncio.run(shipper._send_batch(bad_client, batch))
+        event_ids, events_json = buffer.claim_batch_raw(shipper.config.batch_size)
+        result = asyncio.run(shipper._send_batch(bad_client, event_ids, events_json))
         assert result == SendResult.PERMANENT
 
         # Handling a permanent result drops the batch outright.
-        shipper._handle_batch_result(batch, result)
+        shipper._handle_batch_result(event_ids, result)
         assert buffer.count() == 0
 
     def test_handle_transient_keeps_events_until_max(self, tmp_path: Path):
@@ -160,13 +175,37 @@ class TestPermanentFailureDrops:
         shipper, buffer = _shipper(tmp_path, retry_max_attempts=2, batch_size=10)
         buffer.add_log_event(_make_event(0))
 
-        batch = buffer.get_batch(shipper.config.batch_size)
+        event_ids, _ = buffer.claim_batch_raw(shipper.config.batch_size)
 
         # First transient failure: attempts -> 1, still buffered.
-        shipper._handle_batch_result(batch, SendResult.TRANSIENT)
+        shipper._handle_batch_result(event_ids, SendResult.TRANSIENT)
         assert buffer.count() == 1
 
         # Second transient failure: attempts -> 2 (>= max), purged.
-        batch = buffer.get_batch(shipper.config.batch_size)
-        shipper._handle_batch_result(batch, SendResult.TRANSIENT)
+        event_ids, _ = buffer.claim_batch_raw(shipper.config.batch_size)
+        shipper._handle_batch_result(event_ids, SendResult.TRANSIENT)
         assert buffer.count() == 0
+
+
+class TestServerCache:
+    """Last-known-good server state is persisted for the next startup."""
+
+    def test_success_writes_cache_for_next_start(self, tmp_path: Path):
+        shipper, buffer = _shipper(tmp_path)
+        assert shipper._load_server_cache() is False
+
+        buffer.add_log_event(_make_event(0))
+        event_ids, _ = buffer.claim_batch_raw(10)
+        shipper._handle_batch_result(event_ids, SendResult.SUCCESS)
+
+        restarted, _ = _shipper(tmp_path)
+        assert restarted._load_server_cache() is True
+
+    def test_cache_ignored_for_different_server(self, tmp_path: Path):
+        shipper, buffer = _shipper(tmp_path)
+        shipper._save_server_cache()
+
+        other = HTTPShipper(
+            Config(api_key="test-key", server_url="http://elsewhere:4000"), buffer
+        )
+        assert other._load_server_cache() is False
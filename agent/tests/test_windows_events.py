@@ -2,11 +2,17 @@
 
 import sys
 import pytest
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 # detect_record_reset is a pure function with no pywin32 dependency, so it can
 # be tested on any platform.
-from lognog_in.collectors.windows_events import detect_record_reset
+from lognog_in.collectors.windows_events import (
+    bookmark_xml,
+    build_event_id_query,
+    detect_record_reset,
+    event_timestamp,
+)
 
 
 class TestDetectRecordReset:
@@ -37,6 +43,48 @@ class TestDetectRecordReset:
         assert detect_record_reset(1000, oldest=1, total=1000) == 1000
 
 
+class TestBuildEventIdQuery:
+    """Tests for the XPath event-ID filter handed to EvtSubscribe."""
+
+    def test_no_filter_matches_everything(self):
+        assert build_event_id_query(None) == "*"
+
+    def test_single_id(self):
+        assert build_event_id_query({4624}) == "*[System[EventID=4624]]"
+
+    def test_consecutive_ids_become_ranges(self):
+        query = build_event_id_query({4625, 4624, 4626, 7045})
+        assert query == "*[System[(EventID>=4624 and EventID<=4626) or EventID=7045]]"
+
+
+class TestEventTimestamp:
+    """Tests for formatting event creation times."""
+
+    def test_naive_datetime_is_treated_as_utc(self):
+        value = datetime(2024, 1, 15, 10, 30, 0)
+        assert event_timestamp(value) == "2024-01-15T10:30:00.000000Z"
+
+    def test_aware_datetime_is_converted_to_utc(self):
+        value = datetime(2024, 1, 15, 12, 30, 0, tzinfo=timezone(timedelta(hours=2)))
+        assert event_timestamp(value) == "2024-01-15T10:30:00.000000Z"
+
+    def test_missing_time_uses_now(self):
+        assert event_timestamp(None).endswith("Z")
+
+
+class TestBookmarkXml:
+    """Tests for rebuilding Evt bookmarks from stored record numbers."""
+
+    def test_points_at_channel_record(self):
+        xml = bookmark_xml("Security", 12345)
+        assert "Channel='Security'" in xml or 'Channel="Security"' in xml
+        assert "RecordId='12345'" in xml
+
+    def test_channel_is_escaped(self):
+        xml = bookmark_xml("Odd'Channel&", 1)
+        assert "Channel=\"Odd'Channel&amp;\"" in xml
+
+
 class TestWindowsEventCollector:
     """Tests for WindowsEventCollector."""
 
@@ -112,6 +160,34 @@ class TestWindowsEventCollector:
             bookmarks.set_bookmark("Security", 67890)
             assert bookmarks.get_bookmark("Security") == 67890
 
+    def test_bookmark_batch_set(self, tmp_path: Path):
+        """batch_set stores every channel's bookmark at once."""
+        from lognog_in.collectors.windows_events import EventBookmark
+
+        bookmarks = EventBookmark(tmp_path / "test_bookmarks.db")
+        bookmarks.set_bookmark("Security", 1)
+        bookmarks.batch_set({"Security": 10, "System": 20})
+
+        assert bookmarks.get_bookmark("Security") == 10
+        assert bookmarks.get_bookmark("System") == 20
+
+    def test_bookmark_database_uses_wal(self, tmp_path: Path):
+        """The bookmark database runs in WAL mode and survives close()."""
+        import sqlite3
+        from lognog_in.collectors.windows_events import EventBookmark
+
+        db_path = tmp_path / "test_bookmarks.db"
+        bookmarks = EventBookmark(db_path)
+        bookmarks.set_bookmark("System", 42)
+        bookmarks.close()
+
+        conn = sqlite3.connect(str(db_path))
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        finally:
+            conn.close()
+        assert EventBookmark(db_path).get_bookmark("System") == 42
+
 
 class TestWindowsEventsConfig:
     """Tests for Windows Events configuration."""